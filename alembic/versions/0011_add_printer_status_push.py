@@ -0,0 +1,31 @@
+"""add status_push to printers
+
+Revision ID: 0011_add_printer_status_push
+Revises: 0010_add_print_jobs_print_via
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+from sqlalchemy import inspect
+import sqlalchemy as sa
+
+
+revision = "0011_add_printer_status_push"
+down_revision = "0010_add_print_jobs_print_via"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    connection = op.get_bind()
+    inspector = inspect(connection)
+    columns = {column["name"] for column in inspector.get_columns("printers")}
+    if "status_push" not in columns:
+        op.add_column(
+            "printers",
+            sa.Column("status_push", sa.Boolean(), nullable=False, server_default="0"),
+        )
+
+
+def downgrade() -> None:
+    op.drop_column("printers", "status_push")
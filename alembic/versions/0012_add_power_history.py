@@ -0,0 +1,68 @@
+"""add power history tables and print job energy
+
+Revision ID: 0012_add_power_history
+Revises: 0011_add_printer_status_push
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+from sqlalchemy import inspect
+import sqlalchemy as sa
+
+
+revision = "0012_add_power_history"
+down_revision = "0011_add_printer_status_push"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    connection = op.get_bind()
+    inspector = inspect(connection)
+    tables = set(inspector.get_table_names())
+
+    if "power_chunks" not in tables:
+        op.create_table(
+            "power_chunks",
+            sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column("printer_id", sa.Integer(), nullable=False),
+            sa.Column("start_ts", sa.Float(), nullable=False),
+            sa.Column("end_ts", sa.Float(), nullable=False),
+            sa.Column("sample_count", sa.Integer(), nullable=False),
+            sa.Column("samples", sa.LargeBinary(), nullable=False),
+        )
+        op.create_index("ix_power_chunks_printer_id", "power_chunks", ["printer_id"])
+        op.create_index("ix_power_chunks_start_ts", "power_chunks", ["start_ts"])
+
+    if "power_rollups" not in tables:
+        op.create_table(
+            "power_rollups",
+            sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column("printer_id", sa.Integer(), nullable=False),
+            sa.Column("bucket_start", sa.Integer(), nullable=False),
+            sa.Column("energy_wh", sa.Float(), nullable=False, server_default="0"),
+            sa.Column("sample_count", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("power_sum_w", sa.Float(), nullable=False, server_default="0"),
+            sa.Column("power_max_w", sa.Float(), nullable=True),
+            sa.UniqueConstraint("printer_id", "bucket_start", name="uq_power_rollups_printer_id"),
+        )
+        op.create_index("ix_power_rollups_bucket_start", "power_rollups", ["bucket_start"])
+
+    columns = {column["name"] for column in inspector.get_columns("print_jobs")}
+    if "printer_id" not in columns:
+        op.add_column("print_jobs", sa.Column("printer_id", sa.Integer(), nullable=True))
+    if "finished_at" not in columns:
+        op.add_column("print_jobs", sa.Column("finished_at", sa.String(), nullable=True))
+    if "energy_kwh" not in columns:
+        op.add_column("print_jobs", sa.Column("energy_kwh", sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("print_jobs", "energy_kwh")
+    op.drop_column("print_jobs", "finished_at")
+    op.drop_column("print_jobs", "printer_id")
+    op.drop_index("ix_power_rollups_bucket_start", table_name="power_rollups")
+    op.drop_table("power_rollups")
+    op.drop_index("ix_power_chunks_start_ts", table_name="power_chunks")
+    op.drop_index("ix_power_chunks_printer_id", table_name="power_chunks")
+    op.drop_table("power_chunks")
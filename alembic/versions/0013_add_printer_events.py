@@ -0,0 +1,41 @@
+"""add printer events table
+
+Revision ID: 0013_add_printer_events
+Revises: 0012_add_power_history
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+from sqlalchemy import inspect
+import sqlalchemy as sa
+
+
+revision = "0013_add_printer_events"
+down_revision = "0012_add_power_history"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    connection = op.get_bind()
+    inspector = inspect(connection)
+    if "printer_events" in inspector.get_table_names():
+        return
+    op.create_table(
+        "printer_events",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("ts", sa.Float(), nullable=False),
+        sa.Column("printer_id", sa.Integer(), nullable=False),
+        sa.Column("event_type", sa.String(), nullable=False),
+        sa.Column("job_name", sa.String(), nullable=True),
+        sa.Column("progress", sa.Float(), nullable=True),
+        sa.Column("message", sa.Text(), nullable=True),
+    )
+    op.create_index("ix_printer_events_ts", "printer_events", ["ts"])
+    op.create_index("ix_printer_events_printer_id", "printer_events", ["printer_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_printer_events_printer_id", table_name="printer_events")
+    op.drop_index("ix_printer_events_ts", table_name="printer_events")
+    op.drop_table("printer_events")
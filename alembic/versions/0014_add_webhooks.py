@@ -0,0 +1,58 @@
+"""add webhooks and delivery outbox
+
+Revision ID: 0014_add_webhooks
+Revises: 0013_add_printer_events
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+from sqlalchemy import inspect
+import sqlalchemy as sa
+
+
+revision = "0014_add_webhooks"
+down_revision = "0013_add_printer_events"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    connection = op.get_bind()
+    inspector = inspect(connection)
+    tables = set(inspector.get_table_names())
+
+    if "webhooks" not in tables:
+        op.create_table(
+            "webhooks",
+            sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column("name", sa.String(), nullable=False),
+            sa.Column("url", sa.String(), nullable=False),
+            sa.Column("secret", sa.String(), nullable=True),
+            sa.Column("event_types", sa.String(), nullable=False, server_default="*"),
+            sa.Column("enabled", sa.Boolean(), nullable=False, server_default=sa.text("1")),
+        )
+
+    if "webhook_deliveries" not in tables:
+        op.create_table(
+            "webhook_deliveries",
+            sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column("webhook_id", sa.Integer(), nullable=False),
+            sa.Column("event_type", sa.String(), nullable=False),
+            sa.Column("payload", sa.Text(), nullable=False),
+            sa.Column("status", sa.String(), nullable=False, server_default="pending"),
+            sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("created_at", sa.Float(), nullable=False),
+            sa.Column("next_attempt_at", sa.Float(), nullable=False),
+            sa.Column("delivered_at", sa.Float(), nullable=True),
+            sa.Column("last_status", sa.Integer(), nullable=True),
+            sa.Column("last_error", sa.Text(), nullable=True),
+        )
+        op.create_index("ix_webhook_deliveries_webhook_id", "webhook_deliveries", ["webhook_id"])
+        op.create_index("ix_webhook_deliveries_next_attempt_at", "webhook_deliveries", ["next_attempt_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_webhook_deliveries_next_attempt_at", table_name="webhook_deliveries")
+    op.drop_index("ix_webhook_deliveries_webhook_id", table_name="webhook_deliveries")
+    op.drop_table("webhook_deliveries")
+    op.drop_table("webhooks")
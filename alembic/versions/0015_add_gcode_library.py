@@ -0,0 +1,45 @@
+"""add gcode library and print job file hash
+
+Revision ID: 0015_add_gcode_library
+Revises: 0014_add_webhooks
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+from sqlalchemy import inspect
+import sqlalchemy as sa
+
+
+revision = "0015_add_gcode_library"
+down_revision = "0014_add_webhooks"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    connection = op.get_bind()
+    inspector = inspect(connection)
+    tables = set(inspector.get_table_names())
+
+    if "gcode_files" not in tables:
+        op.create_table(
+            "gcode_files",
+            sa.Column("sha256", sa.String(length=64), primary_key=True),
+            sa.Column("filename", sa.String(), nullable=False),
+            sa.Column("size_bytes", sa.Integer(), nullable=False),
+            sa.Column("created_at", sa.Float(), nullable=False),
+            sa.Column("last_used_at", sa.Float(), nullable=False),
+            sa.Column("use_count", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("uploaded_by", sa.String(), nullable=True),
+        )
+        op.create_index("ix_gcode_files_last_used_at", "gcode_files", ["last_used_at"])
+
+    columns = {column["name"] for column in inspector.get_columns("print_jobs")}
+    if "gcode_sha256" not in columns:
+        op.add_column("print_jobs", sa.Column("gcode_sha256", sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("print_jobs", "gcode_sha256")
+    op.drop_index("ix_gcode_files_last_used_at", table_name="gcode_files")
+    op.drop_table("gcode_files")
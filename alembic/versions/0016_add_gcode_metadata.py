@@ -0,0 +1,34 @@
+"""add gcode metadata cache
+
+Revision ID: 0016_add_gcode_metadata
+Revises: 0015_add_gcode_library
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+from sqlalchemy import inspect
+import sqlalchemy as sa
+
+
+revision = "0016_add_gcode_metadata"
+down_revision = "0015_add_gcode_library"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    connection = op.get_bind()
+    inspector = inspect(connection)
+    if "gcode_metadata" in inspector.get_table_names():
+        return
+    op.create_table(
+        "gcode_metadata",
+        sa.Column("sha256", sa.String(length=64), primary_key=True),
+        sa.Column("analyzer_version", sa.Integer(), nullable=False),
+        sa.Column("analyzed_at", sa.Float(), nullable=False),
+        sa.Column("data", sa.Text(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("gcode_metadata")
@@ -0,0 +1,93 @@
+import argparse
+import base64
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from printfleet2.services.gcode_analysis_service import (  # noqa: E402
+    GcodeAnalyzer,
+    analyze_gcode,
+    parse_gcode_comments,
+)
+
+
+def thumbnail_block(width: int, height: int) -> str:
+    data = base64.b64encode(os.urandom(width * height // 8)).decode("ascii")
+    lines = [f"; {data[index : index + 78]}" for index in range(0, len(data), 78)]
+    return "\n".join([f"; thumbnail begin {width}x{height} {len(data)}", *lines, "; thumbnail end", ""])
+
+
+def write_prusa_file(path: Path, size_mb: int, with_layer_count: bool) -> None:
+    layer = "".join(f"G1 X{index % 200}.{index % 10} Y{index % 180}.5 E0.0421\n" for index in range(400))
+    layers = max(1, size_mb * 1024 * 1024 // len(layer))
+    with open(path, "w") as handle:
+        handle.write("; generated by PrusaSlicer 2.7.1+linux-x64 on 2026-10-17 at 08:00:00 UTC\n;\n")
+        handle.write(thumbnail_block(16, 16))
+        handle.write(thumbnail_block(220, 124))
+        for index in range(layers):
+            handle.write(f";LAYER_CHANGE\n;Z:{0.2 * (index + 1):.2f}\n;HEIGHT:0.2\n{layer}")
+        handle.write("; filament used [mm] = 12345.67\n; filament used [g] = 36.82\n")
+        handle.write("; estimated printing time (normal mode) = 5h 12m 7s\n")
+        if with_layer_count:
+            handle.write(f"; total layers count = {layers}\n")
+        handle.write("\n; prusaslicer_config = begin\n; filament_type = PETG\n; layer_height = 0.2\n")
+        handle.write("; prusaslicer_config = end\n")
+
+
+def full_read(path: Path) -> dict:
+    with open(path, encoding="utf-8", errors="replace") as handle:
+        content = handle.read()
+    metadata = parse_gcode_comments(content, {})
+    metadata["layer_count"] = content.count("\n;LAYER_CHANGE")
+    return metadata
+
+
+def timed(func, *args) -> tuple[float, object]:
+    started = time.perf_counter()
+    result = func(*args)
+    return (time.perf_counter() - started) * 1000, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark for the G-code metadata analyzer.")
+    parser.add_argument("--size-mb", type=int, default=100)
+    parser.add_argument("--files", type=int, default=16, help="files in the batch run")
+    parser.add_argument("--batch-size-mb", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="printfleet2-gcode-"))
+    counted = workdir / "counted.gcode"
+    uncounted = workdir / "uncounted.gcode"
+    write_prusa_file(counted, args.size_mb, True)
+    write_prusa_file(uncounted, args.size_mb, False)
+
+    read_ms, expected = timed(full_read, counted)
+    mmap_ms, metadata = timed(analyze_gcode, str(counted))
+    scan_ms, scanned = timed(analyze_gcode, str(uncounted))
+    assert metadata["layer_count"] == scanned["layer_count"] == expected["layer_count"]
+    print(f"file={args.size_mb} MiB layers={metadata['layer_count']} slicer={metadata['slicer']}")
+    print(f"full_read_ms={read_ms:.1f} header_footer_ms={mmap_ms:.1f} layer_scan_ms={scan_ms:.1f}")
+
+    items = []
+    for index in range(args.files):
+        path = workdir / f"batch-{index}.gcode"
+        write_prusa_file(path, args.batch_size_mb, False)
+        items.append((f"{index:064x}", str(path)))
+    inline_ms, _ = timed(GcodeAnalyzer(1).analyze_many, items)
+    analyzer = GcodeAnalyzer(args.workers)
+    analyzer.analyze_many(items[:4])
+    pool_ms, results = timed(analyzer.analyze_many, items)
+    analyzer.shutdown()
+    print(f"batch files={args.files} x {args.batch_size_mb} MiB workers={args.workers}")
+    print(f"inline_ms={inline_ms:.1f} pool_ms={pool_ms:.1f} analyzed={len(results)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+import argparse
+import asyncio
+import json
+import math
+import sys
+import threading
+import time
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from printfleet2.services.async_http_service import configure_http_engine, get_pool_stats  # noqa: E402
+from printfleet2.services.printer_status_service import (  # noqa: E402
+    PrinterSnapshot,
+    collect_printer_statuses,
+)
+
+
+LEGACY_WORKERS = 16
+LEGACY_REQUESTS_PER_PRINTER = 2
+
+INFO_PAYLOAD = {"result": {"state": "ready", "state_message": "Printer is ready"}}
+OBJECTS_PAYLOAD = {
+    "result": {
+        "status": {
+            "print_stats": {"state": "printing", "filename": "bench.gcode", "print_duration": 120.0},
+            "virtual_sdcard": {"progress": 0.25},
+            "extruder": {"temperature": 215.0, "target": 215.0},
+            "heater_bed": {"temperature": 60.0, "target": 60.0},
+        }
+    }
+}
+
+
+def start_fake_moonraker(latency: float) -> tuple[int, asyncio.AbstractEventLoop]:
+    loop = asyncio.new_event_loop()
+    ready = threading.Event()
+    port_holder: list[int] = []
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                path = head.split(b" ", 2)[1].decode()
+                await asyncio.sleep(latency)
+                payload = INFO_PAYLOAD if path.startswith("/printer/info") else OBJECTS_PAYLOAD
+                body = json.dumps(payload).encode()
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    + f"Content-Length: {len(body)}\r\n\r\n".encode()
+                    + body
+                )
+                await writer.drain()
+        except Exception:
+            pass
+        finally:
+            writer.close()
+
+    async def serve() -> None:
+        server = await asyncio.start_server(handle, "127.0.0.1", 0, backlog=4096)
+        port_holder.append(server.sockets[0].getsockname()[1])
+        ready.set()
+        await server.serve_forever()
+
+    thread = threading.Thread(target=lambda: loop.run_until_complete(serve()), daemon=True)
+    thread.start()
+    ready.wait()
+    return port_holder[0], loop
+
+
+def build_printers(count: int, port: int) -> list[PrinterSnapshot]:
+    return [
+        PrinterSnapshot(
+            id=index + 1,
+            backend="moonraker",
+            host="127.0.0.1",
+            port=port,
+            https=False,
+            scanning=True,
+            token=None,
+            api_key=None,
+            tasmota_host=None,
+        )
+        for index in range(count)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Wall-clock benchmark for the printer status engine.")
+    parser.add_argument("--sizes", default="50,300,1000")
+    parser.add_argument("--latency", type=float, default=0.2, help="simulated printer latency in seconds")
+    parser.add_argument("--concurrency", type=int, default=256)
+    args = parser.parse_args()
+
+    configure_http_engine(args.concurrency, max_per_host=args.concurrency)
+    port, _ = start_fake_moonraker(args.latency)
+    print(f"latency={args.latency:.3f}s concurrency={args.concurrency}")
+    print(f"{'printers':>8}  {'engine_s':>9}  {'legacy_est_s':>12}  {'ok':>5}")
+    for size in (int(value) for value in args.sizes.split(",") if value.strip()):
+        printers = build_printers(size, port)
+        started = time.perf_counter()
+        status_map = collect_printer_statuses(printers, include_plug=False)
+        elapsed = time.perf_counter() - started
+        ok = sum(1 for status in status_map.values() if status.get("state") == "ok")
+        legacy = math.ceil(size / LEGACY_WORKERS) * LEGACY_REQUESTS_PER_PRINTER * args.latency
+        print(f"{size:>8}  {elapsed:>9.3f}  {legacy:>12.3f}  {ok:>5}")
+    for item in get_pool_stats():
+        print(f"pool {item['host']}:{item['port']} opened={item['opened']} reused={item['reused']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+import argparse
+import asyncio
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+import printfleet2.models  # noqa: E402,F401
+from printfleet2.db.base import Base  # noqa: E402
+from printfleet2.db.session import init_engine, session_scope  # noqa: E402
+from printfleet2.services.async_http_service import configure_http_engine  # noqa: E402
+from printfleet2.services.webhook_service import (  # noqa: E402
+    WebhookDispatcher,
+    count_webhook_deliveries,
+    create_webhook,
+)
+
+
+def start_receiver(latency: float, fail_every: int) -> tuple[int, list[int]]:
+    loop = asyncio.new_event_loop()
+    ready = threading.Event()
+    port_holder: list[int] = []
+    received: list[int] = [0]
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in head.split(b"\r\n"):
+                    if line.lower().startswith(b"content-length:"):
+                        length = int(line.split(b":", 1)[1])
+                await reader.readexactly(length)
+                await asyncio.sleep(latency)
+                received[0] += 1
+                status = b"503 Service Unavailable" if fail_every and received[0] % fail_every == 0 else b"204 No Content"
+                writer.write(b"HTTP/1.1 " + status + b"\r\nContent-Length: 0\r\n\r\n")
+                await writer.drain()
+        except Exception:
+            pass
+        finally:
+            writer.close()
+
+    async def serve() -> None:
+        server = await asyncio.start_server(handle, "127.0.0.1", 0, backlog=4096)
+        port_holder.append(server.sockets[0].getsockname()[1])
+        ready.set()
+        await server.serve_forever()
+
+    thread = threading.Thread(target=lambda: loop.run_until_complete(serve()), daemon=True)
+    thread.start()
+    ready.wait()
+    return port_holder[0], received
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Delivery benchmark for the webhook outbox.")
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05, help="simulated receiver latency in seconds")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--max-per-host", type=int, default=8)
+    parser.add_argument("--fail-every", type=int, default=0, help="answer every n-th request with HTTP 503")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="printfleet2-webhooks-")
+    Base.metadata.create_all(init_engine(f"sqlite:///{workdir}/bench.sqlite3"))
+    configure_http_engine(max_per_host=args.max_per_host)
+    port, received = start_receiver(args.latency, args.fail_every)
+    with session_scope() as session:
+        create_webhook(session, "bench", f"http://127.0.0.1:{port}/hook", secret="bench")
+
+    dispatcher = WebhookDispatcher(args.workers)
+    events = [
+        {"ts": time.time(), "printer_id": index + 1, "type": "job_completed", "job_name": f"part-{index}.gcode"}
+        for index in range(args.events)
+    ]
+    started = time.perf_counter()
+    dispatcher.enqueue(events)
+    enqueue_ms = (time.perf_counter() - started) * 1000
+    dispatcher.start()
+    while True:
+        with session_scope() as session:
+            counts = count_webhook_deliveries(session)
+        if counts["delivered"] + counts["dead"] >= args.events:
+            break
+        time.sleep(0.05)
+    elapsed = time.perf_counter() - started
+    stats = dispatcher.to_dict()
+    print(f"events={args.events} workers={args.workers} latency={args.latency:.3f}s fail_every={args.fail_every}")
+    print(f"enqueue_ms={enqueue_ms:.1f} delivered_s={elapsed:.3f} throughput={args.events / elapsed:.1f}/s")
+    print(
+        f"latency_ms p50={stats['latency_ms_p50']} p95={stats['latency_ms_p95']} "
+        f"lag_ms p50={stats['lag_ms_p50']} p95={stats['lag_ms_p95']}"
+    )
+    print(f"requests={received[0]} retries={stats['failed_attempts']} dead={counts['dead']}")
+    dispatcher.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,26 @@
+import os
 import time
 
 from flask import Flask, g, jsonify, redirect, request, session as flask_session, url_for
 
 from printfleet2.config import load_config
 from printfleet2.db.session import init_engine, session_scope
+from printfleet2.services.anomaly_service import start_anomaly_detector
+from printfleet2.services.async_http_service import configure_http_engine
+from printfleet2.services.gcode_analysis_service import start_gcode_analyzer
+from printfleet2.services.gcode_library_service import configure_gcode_library
+from printfleet2.services.mqtt_service import start_mqtt_subscriber
+from printfleet2.services.printer_push_service import start_push_manager
+from printfleet2.services.printer_upload_service import configure_upload_spool
+from printfleet2.services.power_history_service import start_power_recorder
+from printfleet2.services.print_accounting_service import start_print_accounting
+from printfleet2.services.printer_status_service import start_plug_sampler, start_status_poller
 from printfleet2.services.settings_service import ensure_settings_row, settings_to_dict
+from printfleet2.services.status_event_service import start_status_events
+from printfleet2.services.status_history_service import start_status_history
+from printfleet2.services.telegram_service import parse_event_types, start_telegram_notifier
+from printfleet2.services.upload_queue_service import start_upload_queue
+from printfleet2.services.webhook_service import start_webhook_dispatcher
 from printfleet2.web.routes import bp as web_bp
 from printfleet2.services.user_service import get_user, has_users
 from printfleet2.version import VERSION
@@ -20,6 +36,15 @@ def create_app() -> Flask:
 
     app.logger.info("Database URL: %s", cfg.database_url)
     init_engine(cfg.database_url)
+    configure_http_engine(
+        cfg.http_concurrency,
+        cfg.http_max_per_host,
+        cfg.http_idle_timeout,
+        cfg.breaker_threshold,
+        cfg.breaker_reset_timeout,
+    )
+    configure_upload_spool(cfg.upload_spool_dir)
+    configure_gcode_library(cfg.gcode_library_dir, cfg.gcode_library_max_mb * 1024 * 1024)
     try:
         with session_scope() as session:
             settings = ensure_settings_row(session)
@@ -27,6 +52,32 @@ def create_app() -> Flask:
     except Exception as exc:
         app.logger.warning("Settings initialization skipped: %s", exc)
 
+    reloader_parent = cfg.debug and os.environ.get("WERKZEUG_RUN_MAIN") != "true"
+    if not reloader_parent:
+        start_upload_queue(cfg.upload_workers)
+        start_gcode_analyzer(cfg.gcode_analyzer_workers)
+    if cfg.status_poller and not reloader_parent:
+        start_push_manager()
+        start_status_poller()
+        start_plug_sampler()
+        start_status_events()
+        start_print_accounting()
+        start_power_recorder()
+        start_status_history(cfg.history_slots)
+        start_anomaly_detector()
+        start_webhook_dispatcher(cfg.webhook_workers)
+        if cfg.mqtt_url:
+            start_mqtt_subscriber(cfg.mqtt_url, cfg.mqtt_max_age)
+        if cfg.telegram_bot_token and cfg.telegram_bot_token != "CHANGE_ME":
+            start_telegram_notifier(
+                cfg.telegram_bot_token,
+                cfg.telegram_chat_id,
+                cfg.telegram_api_url,
+                parse_event_types(cfg.telegram_events),
+            )
+    elif not cfg.status_poller:
+        app.logger.warning("Status poller disabled; print accounting only runs on live-wall status requests.")
+
     @app.before_request
     def require_login():
         if request.endpoint is None or request.endpoint.startswith("static"):
@@ -39,6 +90,7 @@ def create_app() -> Flask:
             "web.logout_page",
             "web.live_wall_page",
             "web.live_wall_status",
+            "web.live_wall_events",
             "web.live_wall_plug_status",
             "web.printers_plug_energy",
         }
@@ -17,12 +17,64 @@ class Config:
     database_url: str
     env: str
     debug: bool
+    status_poller: bool
+    http_concurrency: int
+    http_max_per_host: int
+    http_idle_timeout: float
+    breaker_threshold: int
+    breaker_reset_timeout: float
+    mqtt_url: str | None
+    mqtt_max_age: float
+    history_slots: int
+    telegram_bot_token: str | None
+    telegram_chat_id: str | None
+    telegram_api_url: str
+    telegram_events: str | None
+    webhook_workers: int
+    upload_spool_dir: str
+    upload_workers: int
+    gcode_library_dir: str
+    gcode_library_max_mb: int
+    gcode_analyzer_workers: int
+
+
+def _int_env(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _float_env(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
 
 
 def load_config() -> Config:
     env = os.environ.get("FLASK_ENV", os.environ.get("PRINTFLEET2_ENV", "production"))
     debug = os.environ.get("PRINTFLEET2_DEBUG", "").lower() in ("1", "true", "yes", "on")
     secret_key = os.environ.get("PRINTFLEET2_SECRET_KEY", "change-me")
+    status_poller = os.environ.get("PRINTFLEET2_STATUS_POLLER", "1").lower() not in ("0", "false", "no", "off")
+    http_concurrency = _int_env("PRINTFLEET2_HTTP_CONCURRENCY", 64)
+    http_max_per_host = _int_env("PRINTFLEET2_HTTP_MAX_PER_HOST", 4)
+    http_idle_timeout = _float_env("PRINTFLEET2_HTTP_IDLE_TIMEOUT", 30.0)
+    breaker_threshold = _int_env("PRINTFLEET2_BREAKER_THRESHOLD", 3)
+    breaker_reset_timeout = _float_env("PRINTFLEET2_BREAKER_RESET_TIMEOUT", 30.0)
+    mqtt_url = os.environ.get("PRINTFLEET2_MQTT_URL", "").strip() or None
+    mqtt_max_age = _float_env("PRINTFLEET2_MQTT_MAX_AGE", 600.0)
+    history_slots = _int_env("PRINTFLEET2_HISTORY_SLOTS", 17280)
+    telegram_bot_token = os.environ.get("PRINTFLEET2_TELEGRAM_BOT_TOKEN", "").strip() or None
+    telegram_chat_id = os.environ.get("PRINTFLEET2_TELEGRAM_CHAT_ID", "").strip() or None
+    telegram_api_url = os.environ.get("PRINTFLEET2_TELEGRAM_API_URL", "").strip() or "https://api.telegram.org"
+    telegram_events = os.environ.get("PRINTFLEET2_TELEGRAM_EVENTS", "").strip() or None
+    webhook_workers = _int_env("PRINTFLEET2_WEBHOOK_WORKERS", 8)
+    upload_workers = _int_env("PRINTFLEET2_UPLOAD_WORKERS", 20)
+    upload_spool_dir = os.environ.get("PRINTFLEET2_UPLOAD_SPOOL_DIR", "").strip() or str(DEFAULT_DATA_DIR / "spool")
+    gcode_library_dir = os.environ.get("PRINTFLEET2_GCODE_LIBRARY_DIR", "").strip() or str(DEFAULT_DATA_DIR / "gcode")
+    gcode_library_max_mb = _int_env("PRINTFLEET2_GCODE_LIBRARY_MAX_MB", 10240)
+    gcode_analyzer_workers = _int_env("PRINTFLEET2_GCODE_ANALYZER_WORKERS", 4)
     database_url = os.environ.get("DATABASE_URL", "")
 
     if not database_url:
@@ -35,4 +87,23 @@ def load_config() -> Config:
         database_url=database_url,
         env=env,
         debug=debug,
+        status_poller=status_poller,
+        http_concurrency=http_concurrency,
+        http_max_per_host=http_max_per_host,
+        http_idle_timeout=http_idle_timeout,
+        breaker_threshold=breaker_threshold,
+        breaker_reset_timeout=breaker_reset_timeout,
+        mqtt_url=mqtt_url,
+        mqtt_max_age=mqtt_max_age,
+        history_slots=history_slots,
+        telegram_bot_token=telegram_bot_token,
+        telegram_chat_id=telegram_chat_id,
+        telegram_api_url=telegram_api_url,
+        telegram_events=telegram_events,
+        webhook_workers=webhook_workers,
+        upload_spool_dir=upload_spool_dir,
+        upload_workers=upload_workers,
+        gcode_library_dir=gcode_library_dir,
+        gcode_library_max_mb=gcode_library_max_mb,
+        gcode_analyzer_workers=gcode_analyzer_workers,
     )
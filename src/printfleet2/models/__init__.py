@@ -1,8 +1,12 @@
+from printfleet2.models.gcode_file import GcodeFile, GcodeMetadata
+from printfleet2.models.power import PowerChunk, PowerRollup
 from printfleet2.models.printer import Printer
+from printfleet2.models.printer_event import PrinterEvent
 from printfleet2.models.printer_group import PrinterGroup
 from printfleet2.models.printer_type import PrinterType
 from printfleet2.models.print_job import PrintJob
 from printfleet2.models.settings import Settings
 from printfleet2.models.user import User
+from printfleet2.models.webhook import Webhook, WebhookDelivery
 
-__all__ = ["Printer", "PrinterGroup", "PrinterType", "PrintJob", "Settings", "User"]
+__all__ = ["GcodeFile", "GcodeMetadata", "PowerChunk", "PowerRollup", "Printer", "PrinterEvent", "PrinterGroup", "PrinterType", "PrintJob", "Settings", "User", "Webhook", "WebhookDelivery"]
@@ -0,0 +1,25 @@
+from sqlalchemy import Float, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from printfleet2.db.base import Base
+
+
+class GcodeFile(Base):
+    __tablename__ = "gcode_files"
+
+    sha256: Mapped[str] = mapped_column(String(64), primary_key=True)
+    filename: Mapped[str] = mapped_column(String, nullable=False)
+    size_bytes: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_at: Mapped[float] = mapped_column(Float, nullable=False)
+    last_used_at: Mapped[float] = mapped_column(Float, nullable=False, index=True)
+    use_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    uploaded_by: Mapped[str | None] = mapped_column(String, nullable=True)
+
+
+class GcodeMetadata(Base):
+    __tablename__ = "gcode_metadata"
+
+    sha256: Mapped[str] = mapped_column(String(64), primary_key=True)
+    analyzer_version: Mapped[int] = mapped_column(Integer, nullable=False)
+    analyzed_at: Mapped[float] = mapped_column(Float, nullable=False)
+    data: Mapped[str] = mapped_column(Text, nullable=False)
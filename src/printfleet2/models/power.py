@@ -0,0 +1,28 @@
+from sqlalchemy import Float, Integer, LargeBinary, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from printfleet2.db.base import Base
+
+
+class PowerChunk(Base):
+    __tablename__ = "power_chunks"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    printer_id: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+    start_ts: Mapped[float] = mapped_column(Float, nullable=False, index=True)
+    end_ts: Mapped[float] = mapped_column(Float, nullable=False)
+    sample_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    samples: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+
+
+class PowerRollup(Base):
+    __tablename__ = "power_rollups"
+    __table_args__ = (UniqueConstraint("printer_id", "bucket_start"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    printer_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    bucket_start: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+    energy_wh: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    sample_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    power_sum_w: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    power_max_w: Mapped[float | None] = mapped_column(Float, nullable=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Integer, String
+from sqlalchemy import Float, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import text
 
@@ -22,3 +22,7 @@ class PrintJob(Base):
         nullable=False,
         server_default=text("'unknown'"),
     )
+    printer_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    finished_at: Mapped[str | None] = mapped_column(String, nullable=True)
+    energy_kwh: Mapped[float | None] = mapped_column(Float, nullable=True)
+    gcode_sha256: Mapped[str | None] = mapped_column(String(64), nullable=True)
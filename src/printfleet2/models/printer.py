@@ -14,6 +14,7 @@ class Printer(Base):
     port: Mapped[int] = mapped_column(Integer, nullable=False)
     https: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default="0")
     scanning: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default="1")
+    status_push: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default="0")
     token: Mapped[str | None] = mapped_column(String, nullable=True)
     api_key: Mapped[str | None] = mapped_column(String, nullable=True)
     error_report_interval: Mapped[float] = mapped_column(Float, nullable=False, server_default="30.0")
@@ -0,0 +1,16 @@
+from sqlalchemy import Float, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from printfleet2.db.base import Base
+
+
+class PrinterEvent(Base):
+    __tablename__ = "printer_events"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    ts: Mapped[float] = mapped_column(Float, nullable=False, index=True)
+    printer_id: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+    event_type: Mapped[str] = mapped_column(String, nullable=False)
+    job_name: Mapped[str | None] = mapped_column(String, nullable=True)
+    progress: Mapped[float | None] = mapped_column(Float, nullable=True)
+    message: Mapped[str | None] = mapped_column(Text, nullable=True)
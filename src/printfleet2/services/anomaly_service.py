@@ -0,0 +1,215 @@
+import math
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from printfleet2.services.printer_status_service import get_status_poller, get_status_snapshot
+
+
+HEATER_TOLERANCE = 10.0
+HEATUP_TIMEOUT_SECONDS = 900.0
+DRIFT_TOLERANCE = 15.0
+BED_DROP_TOLERANCE = 10.0
+STALL_SECONDS = 900.0
+MAX_ANOMALY_EVENTS = 1000
+PRUNE_INTERVAL = 60.0
+SAMPLE_FIELDS = ("temp_hotend", "temp_bed", "target_hotend", "target_bed", "progress", "elapsed")
+STATE_FIELDS = (
+    "target_hotend",
+    "target_bed",
+    "hotend_below_since",
+    "bed_below_since",
+    "hotend_reached",
+    "bed_reached",
+    "progress",
+    "progress_elapsed",
+)
+EMPTY_STATE = (math.nan,) * len(STATE_FIELDS)
+ANOMALY_MESSAGES = {
+    "heater_not_reaching_target": "Heater not reaching target",
+    "temperature_drift": "Hotend temperature drifting from target",
+    "bed_temperature_drop": "Bed temperature dropped during print",
+    "progress_stalled": "Progress stalled while print time keeps growing",
+}
+
+
+def _number(value: object) -> float:
+    try:
+        return math.nan if value is None else float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _is_printing(status: dict) -> bool:
+    label = status.get("label")
+    return isinstance(label, str) and "printing" in label.lower()
+
+
+def _heater(now, actual, target, previous_target, below_since, reached):
+    heating = target > 0
+    same_target = target == previous_target
+    below = np.logical_and(heating, actual < target - HEATER_TOLERANCE)
+    keep_since = np.logical_and(same_target, np.logical_not(np.isnan(below_since)))
+    since = np.where(below, np.where(keep_since, below_since, now), math.nan)
+    within = np.abs(actual - target) <= HEATER_TOLERANCE
+    was_reached = np.logical_and(same_target, reached > 0)
+    now_reached = np.logical_and(heating, np.logical_or(was_reached, within))
+    timed_out = np.logical_and(
+        np.logical_and(below, np.logical_not(was_reached)),
+        now - since >= HEATUP_TIMEOUT_SECONDS,
+    )
+    return since, np.where(now_reached, 1.0, 0.0), was_reached, timed_out
+
+
+def evaluate_rules(now: float, sample: dict, state: dict) -> tuple[dict, dict]:
+    printing = sample["printing"] > 0
+    hotend_since, hotend_reached, hotend_was_reached, hotend_timeout = _heater(
+        now,
+        sample["temp_hotend"],
+        sample["target_hotend"],
+        state["target_hotend"],
+        state["hotend_below_since"],
+        state["hotend_reached"],
+    )
+    bed_since, bed_reached, bed_was_reached, bed_timeout = _heater(
+        now,
+        sample["temp_bed"],
+        sample["target_bed"],
+        state["target_bed"],
+        state["bed_below_since"],
+        state["bed_reached"],
+    )
+    progress_changed = np.logical_or(
+        np.logical_not(sample["progress"] == state["progress"]),
+        np.logical_not(printing),
+    )
+    progress_elapsed = np.where(progress_changed, sample["elapsed"], state["progress_elapsed"])
+    flags = {
+        "heater_not_reaching_target": np.logical_or(hotend_timeout, bed_timeout),
+        "temperature_drift": np.logical_and(
+            np.logical_and(printing, hotend_was_reached),
+            np.abs(sample["temp_hotend"] - sample["target_hotend"]) > DRIFT_TOLERANCE,
+        ),
+        "bed_temperature_drop": np.logical_and(
+            np.logical_and(printing, bed_was_reached),
+            sample["temp_bed"] < sample["target_bed"] - BED_DROP_TOLERANCE,
+        ),
+        "progress_stalled": np.logical_and(printing, sample["elapsed"] - progress_elapsed >= STALL_SECONDS),
+    }
+    next_state = {
+        "target_hotend": sample["target_hotend"],
+        "target_bed": sample["target_bed"],
+        "hotend_below_since": hotend_since,
+        "bed_below_since": bed_since,
+        "hotend_reached": hotend_reached,
+        "bed_reached": bed_reached,
+        "progress": sample["progress"],
+        "progress_elapsed": progress_elapsed,
+    }
+    return flags, next_state
+
+
+class AnomalyDetector:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._state: dict[int, tuple] = {}
+        self._active: dict[int, dict[str, dict]] = {}
+        self._events: deque[dict] = deque(maxlen=MAX_ANOMALY_EVENTS)
+        self._event_id = 0
+        self._pruned_at = time.monotonic()
+
+    def _evaluate(self, now: float, columns: dict[str, list], previous: dict[str, list]) -> tuple[dict, dict]:
+        flags, state = evaluate_rules(
+            now,
+            {name: np.asarray(values, dtype=float) for name, values in columns.items()},
+            {name: np.asarray(values, dtype=float) for name, values in previous.items()},
+        )
+        size = len(columns["printing"])
+        return (
+            {name: np.broadcast_to(values, size).tolist() for name, values in flags.items()},
+            {name: np.broadcast_to(values, size).tolist() for name, values in state.items()},
+        )
+
+    def record(self, samples: dict[int, dict], now: float | None = None) -> None:
+        now = time.time() if now is None else now
+        printer_ids = [printer_id for printer_id, status in samples.items() if not status.get("stale")]
+        if printer_ids:
+            columns = {
+                name: [_number(samples[printer_id].get(name)) for printer_id in printer_ids] for name in SAMPLE_FIELDS
+            }
+            columns["printing"] = [1.0 if _is_printing(samples[printer_id]) else 0.0 for printer_id in printer_ids]
+            with self._lock:
+                rows = [self._state.get(printer_id, EMPTY_STATE) for printer_id in printer_ids]
+            previous = {name: [row[index] for row in rows] for index, name in enumerate(STATE_FIELDS)}
+            flags, state = self._evaluate(now, columns, previous)
+            with self._lock:
+                for index, printer_id in enumerate(printer_ids):
+                    self._state[printer_id] = tuple(float(state[name][index]) for name in STATE_FIELDS)
+                    raised = {name for name, values in flags.items() if values[index]}
+                    self._update_active(printer_id, raised, samples[printer_id], now)
+        if time.monotonic() - self._pruned_at >= PRUNE_INTERVAL:
+            self.prune(set(get_status_snapshot().statuses))
+
+    def _update_active(self, printer_id: int, raised: set[str], status: dict, now: float) -> None:
+        active = self._active.get(printer_id, {})
+        for kind in raised - set(active):
+            active[kind] = {
+                "printer_id": printer_id,
+                "type": kind,
+                "message": ANOMALY_MESSAGES[kind],
+                "since": now,
+                "temp_hotend": status.get("temp_hotend"),
+                "target_hotend": status.get("target_hotend"),
+                "temp_bed": status.get("temp_bed"),
+                "target_bed": status.get("target_bed"),
+                "progress": status.get("progress"),
+            }
+            self._add_event("raised", active[kind], now)
+        for kind in set(active) - raised:
+            self._add_event("cleared", active.pop(kind), now)
+        if active:
+            self._active[printer_id] = active
+        else:
+            self._active.pop(printer_id, None)
+
+    def _add_event(self, state: str, anomaly: dict, now: float) -> None:
+        self._event_id += 1
+        self._events.append({"id": self._event_id, "state": state, "ts": now, **anomaly})
+
+    def prune(self, printer_ids: set[int]) -> None:
+        with self._lock:
+            self._pruned_at = time.monotonic()
+            for printer_id in list(self._state):
+                if printer_id not in printer_ids:
+                    self._state.pop(printer_id, None)
+                    self._active.pop(printer_id, None)
+
+    def active(self) -> list[dict]:
+        with self._lock:
+            return [
+                dict(anomaly)
+                for printer_id in sorted(self._active)
+                for anomaly in sorted(self._active[printer_id].values(), key=lambda item: item["type"])
+            ]
+
+    def events(self, since: int = 0) -> tuple[list[dict], int]:
+        with self._lock:
+            return [dict(event) for event in self._events if event["id"] > since], self._event_id
+
+
+_DETECTOR = AnomalyDetector()
+_STARTED = False
+
+
+def get_anomaly_detector() -> AnomalyDetector:
+    return _DETECTOR
+
+
+def start_anomaly_detector() -> AnomalyDetector:
+    global _STARTED
+    if not _STARTED:
+        _STARTED = True
+        get_status_poller().add_sample_sink(_DETECTOR.record)
+    return _DETECTOR
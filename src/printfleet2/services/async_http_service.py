@@ -0,0 +1,743 @@
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import ssl
+import struct
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Coroutine
+from urllib.parse import urlsplit
+
+
+DEFAULT_MAX_CONCURRENCY = 64
+DEFAULT_MAX_PER_HOST = 4
+DEFAULT_IDLE_TIMEOUT = 30.0
+DEFAULT_BREAKER_THRESHOLD = 3
+DEFAULT_BREAKER_RESET_TIMEOUT = 30.0
+MAX_HEADER_BYTES = 65536
+MAX_DRAIN_BYTES = 65536
+MAX_WEBSOCKET_MESSAGE = 4 * 1024 * 1024
+UPLOAD_CHUNK_SIZE = 256 * 1024
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+_LOOP: asyncio.AbstractEventLoop | None = None
+_LOOP_THREAD: threading.Thread | None = None
+_LOOP_LOCK = threading.Lock()
+_MAX_CONCURRENCY = DEFAULT_MAX_CONCURRENCY
+_SEMAPHORE: asyncio.Semaphore | None = None
+_MAX_PER_HOST = DEFAULT_MAX_PER_HOST
+_IDLE_TIMEOUT = DEFAULT_IDLE_TIMEOUT
+_POOL: "ConnectionPool | None" = None
+_BREAKERS: "CircuitBreakerRegistry | None" = None
+_BREAKER_THRESHOLD = DEFAULT_BREAKER_THRESHOLD
+_BREAKER_RESET_TIMEOUT = DEFAULT_BREAKER_RESET_TIMEOUT
+_SSL_CONTEXTS: dict[str, ssl.SSLContext] = {}
+
+PoolKey = tuple[str, str, int]
+
+
+@dataclass
+class FileBody:
+    path: str
+    prefix: bytes = b""
+    suffix: bytes = b""
+    chunk_size: int = UPLOAD_CHUNK_SIZE
+    progress: Callable[[int], object] | None = None
+
+    @property
+    def length(self) -> int:
+        return len(self.prefix) + os.path.getsize(self.path) + len(self.suffix)
+
+
+RequestBody = bytes | FileBody
+
+
+class HttpError(Exception):
+    pass
+
+
+class CircuitOpenError(HttpError):
+    pass
+
+
+class WebSocketClosed(Exception):
+    pass
+
+
+def configure_http_engine(
+    max_concurrency: int | None = None,
+    max_per_host: int | None = None,
+    idle_timeout: float | None = None,
+    breaker_threshold: int | None = None,
+    breaker_reset_timeout: float | None = None,
+) -> None:
+    global _MAX_CONCURRENCY, _SEMAPHORE, _MAX_PER_HOST, _IDLE_TIMEOUT, _BREAKER_THRESHOLD, _BREAKER_RESET_TIMEOUT
+    if max_concurrency is not None and max_concurrency > 0:
+        _MAX_CONCURRENCY = int(max_concurrency)
+        _SEMAPHORE = None
+    if max_per_host is not None and max_per_host > 0:
+        _MAX_PER_HOST = int(max_per_host)
+    if idle_timeout is not None and idle_timeout > 0:
+        _IDLE_TIMEOUT = float(idle_timeout)
+    if breaker_threshold is not None and breaker_threshold > 0:
+        _BREAKER_THRESHOLD = int(breaker_threshold)
+    if breaker_reset_timeout is not None and breaker_reset_timeout > 0:
+        _BREAKER_RESET_TIMEOUT = float(breaker_reset_timeout)
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    global _LOOP, _LOOP_THREAD
+    with _LOOP_LOCK:
+        if _LOOP is not None and _LOOP_THREAD is not None and _LOOP_THREAD.is_alive():
+            return _LOOP
+        loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        def run() -> None:
+            asyncio.set_event_loop(loop)
+            loop.call_soon(ready.set)
+            loop.run_forever()
+
+        thread = threading.Thread(target=run, name="printfleet2-http-engine", daemon=True)
+        thread.start()
+        ready.wait()
+        _LOOP = loop
+        _LOOP_THREAD = thread
+        return loop
+
+
+def submit_coroutine(coro: Coroutine[Any, Any, Any]) -> Future:
+    return asyncio.run_coroutine_threadsafe(coro, get_event_loop())
+
+
+def run_coroutine(coro: Coroutine[Any, Any, Any], timeout: float | None = None) -> Any:
+    return submit_coroutine(coro).result(timeout)
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    global _SEMAPHORE
+    if _SEMAPHORE is None:
+        _SEMAPHORE = asyncio.Semaphore(_MAX_CONCURRENCY)
+    return _SEMAPHORE
+
+
+def _ssl_context(scheme: str) -> ssl.SSLContext | None:
+    if scheme != "https":
+        return None
+    context = _SSL_CONTEXTS.get(scheme)
+    if context is None:
+        context = ssl._create_unverified_context()
+        _SSL_CONTEXTS[scheme] = context
+    return context
+
+
+@dataclass
+class _Connection:
+    key: PoolKey
+    reader: asyncio.StreamReader
+    writer: asyncio.StreamWriter
+    last_used: float = field(default_factory=time.monotonic)
+    reused: bool = False
+
+    def is_usable(self, idle_timeout: float) -> bool:
+        if self.writer.is_closing() or self.reader.at_eof():
+            return False
+        return time.monotonic() - self.last_used < idle_timeout
+
+    def close(self) -> None:
+        try:
+            self.writer.close()
+        except Exception:
+            pass
+
+
+@dataclass
+class _HostStats:
+    opened: int = 0
+    reused: int = 0
+    evicted: int = 0
+    active: int = 0
+
+
+class ConnectionPool:
+    def __init__(self, max_per_host: int, idle_timeout: float) -> None:
+        self.max_per_host = max_per_host
+        self.idle_timeout = idle_timeout
+        self._idle: dict[PoolKey, list[_Connection]] = {}
+        self._limits: dict[PoolKey, asyncio.Semaphore] = {}
+        self._stats: dict[PoolKey, _HostStats] = {}
+        self._sweeper: asyncio.Task | None = None
+
+    async def acquire(self, key: PoolKey) -> _Connection:
+        self._ensure_sweeper()
+        limit = self._limits.setdefault(key, asyncio.Semaphore(self.max_per_host))
+        stats = self._stats.setdefault(key, _HostStats())
+        await limit.acquire()
+        try:
+            idle = self._idle.get(key) or []
+            while idle:
+                connection = idle.pop()
+                if connection.is_usable(self.idle_timeout):
+                    connection.reused = True
+                    stats.reused += 1
+                    stats.active += 1
+                    return connection
+                connection.close()
+                stats.evicted += 1
+            scheme, host, port = key
+            reader, writer = await asyncio.open_connection(host, port, ssl=_ssl_context(scheme))
+            stats.opened += 1
+            stats.active += 1
+            return _Connection(key, reader, writer)
+        except BaseException:
+            limit.release()
+            raise
+
+    def release(self, connection: _Connection, reusable: bool) -> None:
+        stats = self._stats.setdefault(connection.key, _HostStats())
+        stats.active = max(0, stats.active - 1)
+        if reusable and not connection.writer.is_closing():
+            connection.last_used = time.monotonic()
+            self._idle.setdefault(connection.key, []).append(connection)
+        else:
+            connection.close()
+        limit = self._limits.get(connection.key)
+        if limit is not None:
+            limit.release()
+
+    def evict_idle(self) -> int:
+        evicted = 0
+        for key, idle in list(self._idle.items()):
+            keep = []
+            for connection in idle:
+                if connection.is_usable(self.idle_timeout):
+                    keep.append(connection)
+                else:
+                    connection.close()
+                    evicted += 1
+                    self._stats.setdefault(key, _HostStats()).evicted += 1
+            if keep:
+                self._idle[key] = keep
+            else:
+                self._idle.pop(key, None)
+        return evicted
+
+    def close_all(self) -> None:
+        for idle in self._idle.values():
+            for connection in idle:
+                connection.close()
+        self._idle.clear()
+
+    def stats(self) -> list[dict]:
+        items = []
+        for key, stats in self._stats.items():
+            scheme, host, port = key
+            items.append(
+                {
+                    "scheme": scheme,
+                    "host": host,
+                    "port": port,
+                    "idle": len(self._idle.get(key) or []),
+                    "active": stats.active,
+                    "opened": stats.opened,
+                    "reused": stats.reused,
+                    "evicted": stats.evicted,
+                }
+            )
+        return items
+
+    def _ensure_sweeper(self) -> None:
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.get_running_loop().create_task(self._sweep())
+
+    async def _sweep(self) -> None:
+        while True:
+            await asyncio.sleep(max(1.0, self.idle_timeout / 2))
+            self.evict_idle()
+
+
+def _get_pool() -> ConnectionPool:
+    global _POOL
+    if _POOL is None:
+        _POOL = ConnectionPool(_MAX_PER_HOST, _IDLE_TIMEOUT)
+    return _POOL
+
+
+def get_pool_stats() -> list[dict]:
+    if _POOL is None:
+        return []
+    return run_coroutine(_pool_stats())
+
+
+async def _pool_stats() -> list[dict]:
+    return _get_pool().stats()
+
+
+def _split_url(url: str) -> tuple[str, str, int, str]:
+    parts = urlsplit(url)
+    scheme = (parts.scheme or "http").lower()
+    if scheme not in {"http", "https"}:
+        raise HttpError(f"unsupported scheme: {scheme}")
+    host = parts.hostname or ""
+    if not host:
+        raise HttpError("missing host")
+    port = parts.port or (443 if scheme == "https" else 80)
+    path = parts.path or "/"
+    if parts.query:
+        path = f"{path}?{parts.query}"
+    return scheme, host, port, path
+
+
+def _host_header(host: str, port: int, scheme: str) -> str:
+    default_port = 443 if scheme == "https" else 80
+    name = f"[{host}]" if ":" in host else host
+    return name if port == default_port else f"{name}:{port}"
+
+
+async def _read_headers(reader: asyncio.StreamReader) -> tuple[str, int, dict[str, str]]:
+    raw = await reader.readuntil(b"\r\n\r\n")
+    if len(raw) > MAX_HEADER_BYTES:
+        raise HttpError("headers too large")
+    lines = raw.decode("iso-8859-1").split("\r\n")
+    status_line = lines[0].split(" ", 2)
+    if len(status_line) < 2 or not status_line[0].startswith("HTTP/"):
+        raise HttpError("invalid status line")
+    status = int(status_line[1])
+    headers: dict[str, str] = {}
+    for line in lines[1:]:
+        if not line or ":" not in line:
+            continue
+        name, value = line.split(":", 1)
+        headers[name.strip().lower()] = value.strip()
+    return status_line[0], status, headers
+
+
+async def _read_body(
+    reader: asyncio.StreamReader,
+    headers: dict[str, str],
+    max_bytes: int,
+) -> tuple[bytes, bool]:
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        chunks: list[bytes] = []
+        size = 0
+        while True:
+            line = await reader.readuntil(b"\r\n")
+            chunk_size = int(line.split(b";", 1)[0].strip() or b"0", 16)
+            if chunk_size == 0:
+                await reader.readuntil(b"\r\n")
+                break
+            data = await reader.readexactly(chunk_size)
+            await reader.readexactly(2)
+            if size < max_bytes:
+                chunks.append(data[: max_bytes - size])
+                size += len(chunks[-1])
+        return b"".join(chunks), True
+    length = headers.get("content-length")
+    if length is not None:
+        remaining = int(length)
+        data = await reader.readexactly(min(remaining, max_bytes))
+        overflow = remaining - len(data)
+        if overflow <= 0:
+            return data, True
+        if overflow > MAX_DRAIN_BYTES:
+            return data, False
+        await reader.readexactly(overflow)
+        return data, True
+    return await reader.read(max_bytes), False
+
+
+def _keep_alive(version: str, headers: dict[str, str]) -> bool:
+    connection = headers.get("connection", "").lower()
+    if "close" in connection:
+        return False
+    if version == "HTTP/1.0":
+        return "keep-alive" in connection
+    return True
+
+
+@dataclass
+class CircuitBreaker:
+    threshold: int
+    reset_timeout: float
+    state: str = "closed"
+    failures: int = 0
+    trips: int = 0
+    rejected: int = 0
+    opened_at: float | None = None
+    last_failure: str | None = None
+    probing: bool = False
+
+    def allow(self, now: float) -> bool:
+        if self.state == "open" and self.opened_at is not None and now - self.opened_at >= self.reset_timeout:
+            self.state = "half_open"
+            self.probing = False
+        if self.state == "open" or (self.state == "half_open" and self.probing):
+            self.rejected += 1
+            return False
+        if self.state == "half_open":
+            self.probing = True
+        return True
+
+    def record_success(self) -> None:
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+
+    def record_failure(self, reason: str, now: float) -> None:
+        self.failures += 1
+        self.last_failure = reason
+        self.probing = False
+        if self.state == "half_open" or self.failures >= self.threshold:
+            self.state = "open"
+            self.opened_at = now
+            self.trips += 1
+
+    def release_probe(self) -> None:
+        self.probing = False
+
+
+class CircuitBreakerRegistry:
+    def __init__(self, threshold: int, reset_timeout: float) -> None:
+        self._threshold = threshold
+        self._reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._breakers: dict[PoolKey, CircuitBreaker] = {}
+
+    def _breaker(self, key: PoolKey) -> CircuitBreaker:
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            breaker = CircuitBreaker(self._threshold, self._reset_timeout)
+            self._breakers[key] = breaker
+        return breaker
+
+    def allow(self, key: PoolKey) -> bool:
+        with self._lock:
+            return self._breaker(key).allow(time.monotonic())
+
+    def record_success(self, key: PoolKey) -> None:
+        with self._lock:
+            self._breaker(key).record_success()
+
+    def record_failure(self, key: PoolKey, reason: str) -> None:
+        with self._lock:
+            self._breaker(key).record_failure(reason, time.monotonic())
+
+    def release_probe(self, key: PoolKey) -> None:
+        with self._lock:
+            self._breaker(key).release_probe()
+
+    def reset(self, host: str | None = None, port: int | None = None) -> int:
+        with self._lock:
+            keys = [
+                key
+                for key in self._breakers
+                if (host is None or key[1] == host) and (port is None or key[2] == port)
+            ]
+            for key in keys:
+                del self._breakers[key]
+            return len(keys)
+
+    def stats(self) -> list[dict]:
+        now = time.monotonic()
+        with self._lock:
+            items = []
+            for (scheme, host, port), breaker in sorted(self._breakers.items()):
+                retry_in = None
+                if breaker.state == "open" and breaker.opened_at is not None:
+                    retry_in = round(max(0.0, breaker.reset_timeout - (now - breaker.opened_at)), 3)
+                items.append(
+                    {
+                        "scheme": scheme,
+                        "host": host,
+                        "port": port,
+                        "state": breaker.state,
+                        "failures": breaker.failures,
+                        "trips": breaker.trips,
+                        "rejected": breaker.rejected,
+                        "retry_in_s": retry_in,
+                        "last_failure": breaker.last_failure,
+                    }
+                )
+            return items
+
+
+def _get_breakers() -> CircuitBreakerRegistry:
+    global _BREAKERS
+    if _BREAKERS is None:
+        _BREAKERS = CircuitBreakerRegistry(_BREAKER_THRESHOLD, _BREAKER_RESET_TIMEOUT)
+    return _BREAKERS
+
+
+def get_circuit_breaker_stats() -> list[dict]:
+    return _get_breakers().stats()
+
+
+def reset_circuit_breakers(host: str | None = None, port: int | None = None) -> int:
+    return _get_breakers().reset(host, port)
+
+
+async def _within(awaitable, timeout: float | None):
+    if timeout is None:
+        return await awaitable
+    return await asyncio.wait_for(awaitable, timeout)
+
+
+async def _write_body(writer: asyncio.StreamWriter, body: RequestBody | None, timeout: float | None = None) -> None:
+    if isinstance(body, FileBody):
+        writer.write(body.prefix)
+        sent = 0
+        with open(body.path, "rb") as handle:
+            while True:
+                chunk = await asyncio.to_thread(handle.read, body.chunk_size)
+                if not chunk:
+                    break
+                writer.write(chunk)
+                await _within(writer.drain(), timeout)
+                sent += len(chunk)
+                if body.progress is not None:
+                    body.progress(sent)
+        writer.write(body.suffix)
+    elif body:
+        writer.write(body)
+    await _within(writer.drain(), timeout)
+
+
+async def _exchange(
+    connection: _Connection,
+    method: str,
+    head: bytes,
+    body: RequestBody | None,
+    max_bytes: int,
+    timeout: float | None = None,
+) -> tuple[int, bytes, bool]:
+    connection.writer.write(head)
+    await _write_body(connection.writer, body, timeout)
+    version, status, response_headers = await _within(_read_headers(connection.reader), timeout)
+    if method == "HEAD" or status in {204, 304} or 100 <= status < 200:
+        return status, b"", _keep_alive(version, response_headers)
+    payload, complete = await _within(_read_body(connection.reader, response_headers, max_bytes), timeout)
+    return status, payload, complete and _keep_alive(version, response_headers)
+
+
+async def _request(
+    method: str,
+    url: str,
+    headers: dict,
+    body: RequestBody | None,
+    max_bytes: int,
+    timeout: float | None = None,
+) -> tuple[int, bytes]:
+    scheme, host, port, path = _split_url(url)
+    request_headers = {
+        "Host": _host_header(host, port, scheme),
+        "Accept": "*/*",
+        "Connection": "keep-alive",
+        **headers,
+    }
+    if body is not None:
+        request_headers["Content-Length"] = str(body.length if isinstance(body, FileBody) else len(body))
+    head = f"{method} {path} HTTP/1.1\r\n"
+    head += "".join(f"{name}: {value}\r\n" for name, value in request_headers.items())
+    encoded_head = head.encode("iso-8859-1") + b"\r\n"
+    pool = _get_pool()
+    key = (scheme, host, port)
+    for attempt in range(2):
+        connection = await _within(pool.acquire(key), timeout)
+        try:
+            status, payload, reusable = await _exchange(connection, method, encoded_head, body, max_bytes, timeout)
+        except (ConnectionError, asyncio.IncompleteReadError) as exc:
+            pool.release(connection, False)
+            if connection.reused and attempt == 0 and method in {"GET", "HEAD"}:
+                continue
+            raise HttpError(str(exc) or exc.__class__.__name__) from exc
+        except BaseException:
+            pool.release(connection, False)
+            raise
+        pool.release(connection, reusable)
+        return status, payload
+    raise HttpError("connection failed")
+
+
+async def http_request(
+    method: str,
+    url: str,
+    headers: dict | None = None,
+    body: RequestBody | None = None,
+    timeout: float = 10.0,
+    max_bytes: int = 1024 * 1024,
+) -> tuple[int, bytes]:
+    scheme, host, port, _ = _split_url(url)
+    key = (scheme, host, port)
+    breakers = _get_breakers()
+    if not breakers.allow(key):
+        raise CircuitOpenError(f"circuit open for {host}:{port}")
+    try:
+        async with _get_semaphore():
+            if isinstance(body, FileBody):
+                result = await _request(method, url, headers or {}, body, max_bytes, timeout)
+            else:
+                result = await asyncio.wait_for(_request(method, url, headers or {}, body, max_bytes), timeout)
+    except asyncio.TimeoutError:
+        if isinstance(body, FileBody):
+            breakers.release_probe(key)
+        else:
+            breakers.record_failure(key, "TimeoutError")
+        raise
+    except (HttpError, OSError) as exc:
+        breakers.record_failure(key, str(exc) or exc.__class__.__name__)
+        raise
+    except BaseException:
+        breakers.release_probe(key)
+        raise
+    breakers.record_success(key)
+    return result
+
+
+async def fetch_json(url: str, headers: dict, timeout: float, max_bytes: int = 8192) -> tuple[int | None, Any]:
+    try:
+        status, data = await http_request("GET", url, headers, timeout=timeout, max_bytes=max_bytes)
+    except CircuitOpenError:
+        raise
+    except Exception:
+        return None, None
+    if status >= 400:
+        return status, None
+    try:
+        return status, json.loads(data.decode("utf-8", errors="ignore"))
+    except Exception:
+        return None, None
+
+
+class WebSocket:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._reader = reader
+        self._writer = writer
+        self.closed = False
+
+    async def send_text(self, text: str) -> None:
+        await self._send_frame(0x1, text.encode("utf-8"))
+
+    async def send_json(self, payload: Any) -> None:
+        await self.send_text(json.dumps(payload))
+
+    async def receive_text(self) -> str:
+        fragments: list[bytes] = []
+        size = 0
+        while True:
+            fin, opcode, payload = await self._read_frame()
+            if opcode == 0x8:
+                await self.close()
+                raise WebSocketClosed("closed by peer")
+            if opcode == 0x9:
+                await self._send_frame(0xA, payload)
+                continue
+            if opcode == 0xA:
+                continue
+            size += len(payload)
+            if size > MAX_WEBSOCKET_MESSAGE:
+                await self.close()
+                raise WebSocketClosed("message too large")
+            fragments.append(payload)
+            if fin:
+                return b"".join(fragments).decode("utf-8", errors="ignore")
+
+    async def receive_json(self) -> Any:
+        return json.loads(await self.receive_text())
+
+    async def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            await self._send_frame(0x8, struct.pack("!H", 1000), force=True)
+        except Exception:
+            pass
+        try:
+            self._writer.close()
+            await self._writer.wait_closed()
+        except Exception:
+            pass
+
+    async def _send_frame(self, opcode: int, payload: bytes, force: bool = False) -> None:
+        if self.closed and not force:
+            raise WebSocketClosed("socket closed")
+        length = len(payload)
+        if length < 126:
+            header = struct.pack("!BB", 0x80 | opcode, 0x80 | length)
+        elif length < 65536:
+            header = struct.pack("!BBH", 0x80 | opcode, 0x80 | 126, length)
+        else:
+            header = struct.pack("!BBQ", 0x80 | opcode, 0x80 | 127, length)
+        mask = os.urandom(4)
+        masked = bytes(byte ^ mask[index % 4] for index, byte in enumerate(payload))
+        self._writer.write(header + mask + masked)
+        await self._writer.drain()
+
+    async def _read_frame(self) -> tuple[bool, int, bytes]:
+        try:
+            first, second = await self._reader.readexactly(2)
+            length = second & 0x7F
+            if length == 126:
+                (length,) = struct.unpack("!H", await self._reader.readexactly(2))
+            elif length == 127:
+                (length,) = struct.unpack("!Q", await self._reader.readexactly(8))
+            if length > MAX_WEBSOCKET_MESSAGE:
+                raise WebSocketClosed("frame too large")
+            mask = await self._reader.readexactly(4) if second & 0x80 else None
+            payload = await self._reader.readexactly(length)
+        except (asyncio.IncompleteReadError, ConnectionError) as exc:
+            self.closed = True
+            raise WebSocketClosed("connection lost") from exc
+        if mask:
+            payload = bytes(byte ^ mask[index % 4] for index, byte in enumerate(payload))
+        return bool(first & 0x80), first & 0x0F, payload
+
+
+def _http_url(url: str) -> str:
+    if url.startswith("wss://"):
+        return "https://" + url[6:]
+    if url.startswith("ws://"):
+        return "http://" + url[5:]
+    return url
+
+
+async def open_websocket(url: str, headers: dict | None = None, timeout: float = 10.0) -> WebSocket:
+    scheme, host, port, path = _split_url(_http_url(url))
+    key = base64.b64encode(os.urandom(16)).decode("ascii")
+    request_headers = {
+        "Host": _host_header(host, port, scheme),
+        "Upgrade": "websocket",
+        "Connection": "Upgrade",
+        "Sec-WebSocket-Key": key,
+        "Sec-WebSocket-Version": "13",
+        **(headers or {}),
+    }
+    head = f"GET {path} HTTP/1.1\r\n"
+    head += "".join(f"{name}: {value}\r\n" for name, value in request_headers.items())
+
+    async def handshake() -> WebSocket:
+        reader, writer = await asyncio.open_connection(
+            host, port, ssl=_ssl_context(scheme), limit=MAX_WEBSOCKET_MESSAGE
+        )
+        try:
+            writer.write(head.encode("iso-8859-1") + b"\r\n")
+            await writer.drain()
+            _, status, response_headers = await _read_headers(reader)
+            if status != 101:
+                raise HttpError(f"websocket upgrade failed: {status}")
+            expected = base64.b64encode(
+                hashlib.sha1((key + WEBSOCKET_GUID).encode("ascii")).digest()
+            ).decode("ascii")
+            if response_headers.get("sec-websocket-accept") != expected:
+                raise HttpError("websocket accept mismatch")
+        except BaseException:
+            writer.close()
+            raise
+        return WebSocket(reader, writer)
+
+    return await asyncio.wait_for(handshake(), timeout)
@@ -0,0 +1,408 @@
+import json
+import logging
+import math
+import mmap
+import multiprocessing
+import os
+import re
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+from sqlalchemy import inspect, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from printfleet2.db.session import session_scope
+from printfleet2.models.gcode_file import GcodeMetadata
+from printfleet2.services.gcode_library_service import gcode_file_path
+
+
+ANALYZER_VERSION = 2
+DEFAULT_ANALYZER_WORKERS = 4
+DEFAULT_ANALYSIS_TIMEOUT = 30.0
+HEAD_BYTES = 1024 * 1024
+TAIL_BYTES = 512 * 1024
+SCAN_CHUNK_BYTES = 8 * 1024 * 1024
+POOL_MIN_BATCH = 4
+MAX_BATCH_SIZE = 500
+PREVIEW_MAX_WIDTH = 320
+LAYER_MARKERS = (b"\n;LAYER_CHANGE", b"\n;LAYER:", b"\n; CHANGE_LAYER")
+SLICER_ALIASES = {"Cura_SteamEngine": "Cura"}
+THUMBNAIL_FORMATS = {"thumbnail": "png", "thumbnail_PNG": "png", "thumbnail_JPG": "jpg", "thumbnail_QOI": "qoi"}
+PREVIEW_MIME_TYPES = {"png": "image/png", "jpg": "image/jpeg"}
+UPSERT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+TIME_KEYS = (
+    "estimated printing time (normal mode)",
+    "total estimated time",
+    "estimated printing time",
+    "time",
+    "print.time",
+)
+LENGTH_MM_KEYS = ("filament used [mm]", "total filament length [mm]")
+LENGTH_M_KEYS = ("filament used",)
+WEIGHT_KEYS = ("total filament used [g]", "total filament weight [g]", "filament used [g]")
+LAYER_COUNT_KEYS = ("layer_count", "total layer number", "total layers count")
+LAYER_HEIGHT_KEYS = ("layer_height", "layer height")
+
+_SLICER_PATTERNS = (
+    re.compile(r";\s*generated (?:by|with) ([A-Za-z][\w .-]*?)[ _]v?(\d[\w.+-]*)", re.I),
+    re.compile(r";\s*(BambuStudio|OrcaSlicer|PrusaSlicer|SuperSlicer) v?(\d[\w.+-]*)"),
+)
+_THUMBNAIL_PATTERN = re.compile(r";\s*(thumbnail(?:_PNG|_JPG|_QOI)?) begin (\d+)x(\d+) (\d+)")
+_SEPARATOR_PATTERN = re.compile(r"[=:]")
+_NUMBER_PATTERN = re.compile(r"-?\d+(?:\.\d+)?")
+_DURATION_PATTERN = re.compile(r"(\d+(?:\.\d+)?)\s*([dhms])")
+_DURATION_UNITS = {"d": 86400, "h": 3600, "m": 60, "s": 1}
+
+logger = logging.getLogger(__name__)
+
+
+def parse_duration(value: str | None) -> int | None:
+    if not value:
+        return None
+    value = value.strip().lower()
+    if _NUMBER_PATTERN.fullmatch(value):
+        return int(float(value))
+    parts = _DURATION_PATTERN.findall(value)
+    if not parts:
+        return None
+    return int(sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts))
+
+
+def _first(values: dict[str, str], keys: tuple[str, ...]) -> str | None:
+    for key in keys:
+        if values.get(key):
+            return values[key]
+    return None
+
+
+def _numbers(value: str | None) -> list[float]:
+    if not value:
+        return []
+    return [float(number) for number in _NUMBER_PATTERN.findall(value)]
+
+
+def _total(value: str | None) -> float | None:
+    numbers = _numbers(value)
+    return round(sum(numbers), 2) if numbers else None
+
+
+def _add_thumbnail(metadata: dict, thumbnail: dict, lines: list[str]) -> None:
+    image_format = THUMBNAIL_FORMATS[thumbnail.pop("kind")]
+    length = thumbnail.pop("length")
+    metadata["thumbnails"].append({**thumbnail, "format": image_format})
+    mime_type = PREVIEW_MIME_TYPES.get(image_format)
+    if mime_type is None or thumbnail["width"] > PREVIEW_MAX_WIDTH or thumbnail["width"] <= metadata["_preview_width"]:
+        return
+    data = "".join(line.lstrip(";").strip() for line in lines)
+    if len(data) != length:
+        return
+    metadata["preview"] = f"data:{mime_type};base64,{data}"
+    metadata["_preview_width"] = thumbnail["width"]
+
+
+def _comment_values(content: str, metadata: dict) -> dict[str, str]:
+    values: dict[str, str] = {}
+    thumbnail = None
+    thumbnail_lines: list[str] = []
+    for line in content.splitlines():
+        if not line.startswith(";"):
+            continue
+        if thumbnail is not None:
+            if line.lstrip("; ").startswith(f"{thumbnail['kind']} end"):
+                _add_thumbnail(metadata, thumbnail, thumbnail_lines)
+                thumbnail = None
+            else:
+                thumbnail_lines.append(line)
+            continue
+        match = _THUMBNAIL_PATTERN.match(line)
+        if match:
+            kind, width, height, length = match.groups()
+            thumbnail = {"kind": kind, "width": int(width), "height": int(height), "length": int(length)}
+            thumbnail_lines = []
+            continue
+        if metadata["slicer"] is None:
+            for pattern in _SLICER_PATTERNS:
+                match = pattern.match(line)
+                if match:
+                    name = match.group(1).strip()
+                    metadata["slicer"] = SLICER_ALIASES.get(name, name)
+                    metadata["slicer_version"] = match.group(2)
+                    break
+        for segment in line.split(";"):
+            separator = _SEPARATOR_PATTERN.search(segment)
+            if separator is None:
+                continue
+            key = segment[: separator.start()].strip().lower()
+            if key and key not in values:
+                values[key] = segment[separator.end() :].strip()
+    return values
+
+
+def parse_gcode_comments(content: str, metadata: dict) -> dict:
+    metadata.setdefault("slicer", None)
+    metadata.setdefault("slicer_version", None)
+    metadata.update(thumbnails=[], preview=None, _preview_width=0)
+    values = _comment_values(content, metadata)
+    del metadata["_preview_width"]
+    metadata["estimated_time_s"] = parse_duration(_first(values, TIME_KEYS))
+    length = _total(_first(values, LENGTH_MM_KEYS))
+    if length is None:
+        meters = _numbers(_first(values, LENGTH_M_KEYS))
+        length = round(sum(meters) * 1000, 2) if meters else None
+    metadata["filament_length_mm"] = length
+    weight = _total(_first(values, WEIGHT_KEYS))
+    if weight is None and length:
+        diameters = _numbers(values.get("filament_diameter"))
+        densities = _numbers(values.get("filament_density"))
+        if diameters and densities and densities[0] > 0:
+            weight = round(length * math.pi * (diameters[0] / 2) ** 2 * densities[0] / 1000, 2)
+    metadata["filament_weight_g"] = weight
+    metadata["filament_type"] = values.get("filament_type") or None
+    layer_count = _numbers(_first(values, LAYER_COUNT_KEYS))
+    metadata["layer_count"] = int(layer_count[0]) if layer_count else None
+    layer_height = _numbers(_first(values, LAYER_HEIGHT_KEYS))
+    metadata["layer_height_mm"] = layer_height[0] if layer_height else None
+    return metadata
+
+
+def _scan_layers(view: mmap.mmap, size: int) -> int:
+    if hasattr(mmap, "MADV_SEQUENTIAL"):
+        view.madvise(mmap.MADV_SEQUENTIAL)
+    overlap = max(len(marker) for marker in LAYER_MARKERS) - 1
+    counts = [int(view[: len(marker) - 1] == marker[1:]) for marker in LAYER_MARKERS]
+    for offset in range(0, size, SCAN_CHUNK_BYTES):
+        chunk = view[offset : offset + SCAN_CHUNK_BYTES + overlap]
+        for index, marker in enumerate(LAYER_MARKERS):
+            counts[index] += chunk.count(marker, 0, SCAN_CHUNK_BYTES + len(marker) - 1)
+    return max(counts)
+
+
+def analyze_gcode(path: str) -> dict:
+    size = os.path.getsize(path)
+    metadata = {
+        "analyzer_version": ANALYZER_VERSION,
+        "size_bytes": size,
+        "scanned": False,
+    }
+    if not size:
+        return parse_gcode_comments("", metadata)
+    with open(path, "rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as view:
+        if size <= HEAD_BYTES + TAIL_BYTES:
+            content = view[:].decode("utf-8", errors="replace")
+        else:
+            head = view[:HEAD_BYTES].decode("utf-8", errors="replace")
+            tail = view[size - TAIL_BYTES :].decode("utf-8", errors="replace")
+            content = f"{head}\n{tail}"
+        parse_gcode_comments(content, metadata)
+        if metadata["layer_count"] is None:
+            metadata["layer_count"] = _scan_layers(view, size) or None
+            metadata["scanned"] = True
+    return metadata
+
+
+def _analyze_safely(path: str) -> dict | None:
+    try:
+        return analyze_gcode(path)
+    except (OSError, ValueError):
+        return None
+
+
+def ensure_gcode_metadata_schema(session: Session) -> None:
+    engine = session.get_bind()
+    inspector = inspect(engine)
+    try:
+        if "gcode_metadata" in inspector.get_table_names():
+            return
+    except Exception:
+        return
+    try:
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    "CREATE TABLE gcode_metadata ("
+                    "sha256 VARCHAR(64) PRIMARY KEY, "
+                    "analyzer_version INTEGER NOT NULL, "
+                    "analyzed_at REAL NOT NULL, "
+                    "data TEXT NOT NULL"
+                    ")"
+                )
+            )
+    except Exception:
+        return
+
+
+def get_cached_gcode_metadata(session: Session, sha256s: list[str]) -> dict[str, dict]:
+    if not sha256s:
+        return {}
+    ensure_gcode_metadata_schema(session)
+    rows = (
+        session.query(GcodeMetadata)
+        .filter(GcodeMetadata.sha256.in_(sha256s), GcodeMetadata.analyzer_version == ANALYZER_VERSION)
+        .all()
+    )
+    return {row.sha256: json.loads(row.data) for row in rows}
+
+
+def store_gcode_metadata(session: Session, sha256: str, metadata: dict) -> None:
+    ensure_gcode_metadata_schema(session)
+    values = {
+        "analyzer_version": int(metadata.get("analyzer_version") or ANALYZER_VERSION),
+        "analyzed_at": time.time(),
+        "data": json.dumps(metadata),
+    }
+    insert = UPSERT_INSERTS.get(session.get_bind().dialect.name)
+    if insert is not None:
+        statement = insert(GcodeMetadata).values(sha256=sha256, **values)
+        session.execute(statement.on_conflict_do_update(index_elements=["sha256"], set_=values))
+        return
+    row = session.get(GcodeMetadata, sha256)
+    if row is None:
+        row = GcodeMetadata(sha256=sha256)
+        session.add(row)
+    for key, value in values.items():
+        setattr(row, key, value)
+
+
+def gcode_metadata_summary(metadata: dict | None) -> dict | None:
+    if metadata is None:
+        return None
+    return {key: value for key, value in metadata.items() if key not in {"preview", "thumbnails"}}
+
+
+def get_gcode_metadata(session: Session, sha256s: list[str]) -> tuple[dict[str, dict], list[str]]:
+    result = get_cached_gcode_metadata(session, sha256s)
+    pending = []
+    for sha256 in sha256s:
+        path = gcode_file_path(sha256)
+        if sha256 not in result and path is not None and path.is_file():
+            pending.append(sha256)
+    return result, pending
+
+
+class GcodeAnalyzer:
+    def __init__(self, workers: int = DEFAULT_ANALYZER_WORKERS) -> None:
+        self.workers = max(1, int(workers))
+        self._lock = threading.Lock()
+        self._pool: ProcessPoolExecutor | None = None
+        self._background: ThreadPoolExecutor | None = None
+        self._pending: dict[str, Future] = {}
+
+    def analyze_many(self, items: list[tuple[str, str]]) -> dict[str, dict]:
+        paths = [path for _, path in items]
+        if len(items) < POOL_MIN_BATCH or self.workers == 1:
+            results = map(_analyze_safely, paths)
+        else:
+            chunksize = max(1, len(paths) // (self.workers * 4))
+            results = self._process_pool().map(_analyze_safely, paths, chunksize=chunksize)
+        return {sha256: metadata for (sha256, _), metadata in zip(items, results) if metadata is not None}
+
+    def submit(self, sha256: str) -> Future | None:
+        path = gcode_file_path(sha256)
+        if path is None:
+            return None
+        with self._lock:
+            future = self._pending.get(sha256)
+            if future is not None:
+                return future
+            future = self._background_executor().submit(self._analyze_and_store, sha256, str(path))
+            self._pending[sha256] = future
+        future.add_done_callback(lambda _: self._forget(sha256))
+        return future
+
+    def submit_many(self, sha256s: list[str]) -> dict[str, Future]:
+        futures: dict[str, Future] = {}
+        items: list[tuple[str, str, Future]] = []
+        with self._lock:
+            for sha256 in sha256s:
+                path = gcode_file_path(sha256)
+                if path is None:
+                    continue
+                future = self._pending.get(sha256)
+                if future is None:
+                    future = Future()
+                    self._pending[sha256] = future
+                    items.append((sha256, str(path), future))
+                futures[sha256] = future
+            if items:
+                self._background_executor().submit(self._analyze_batch, items)
+        for sha256, _, future in items:
+            future.add_done_callback(lambda _, sha256=sha256: self._forget(sha256))
+        return futures
+
+    def analyze(self, sha256: str, timeout: float = DEFAULT_ANALYSIS_TIMEOUT) -> dict | None:
+        future = self.submit(sha256)
+        if future is None:
+            return None
+        return future.result(timeout=timeout)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+            background, self._background = self._background, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+        if background is not None:
+            background.shutdown(wait=False, cancel_futures=True)
+
+    def _background_executor(self) -> ThreadPoolExecutor:
+        if self._background is None:
+            self._background = ThreadPoolExecutor(max_workers=1, thread_name_prefix="printfleet2-gcode-analyzer")
+        return self._background
+
+    def _process_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._pool
+
+    def _forget(self, sha256: str) -> None:
+        with self._lock:
+            self._pending.pop(sha256, None)
+
+    def _analyze_and_store(self, sha256: str, path: str) -> dict | None:
+        try:
+            with session_scope() as session:
+                cached = get_cached_gcode_metadata(session, [sha256])
+            if sha256 in cached:
+                return cached[sha256]
+            metadata = _analyze_safely(path)
+            if metadata is None:
+                return None
+            with session_scope() as session:
+                store_gcode_metadata(session, sha256, metadata)
+            return metadata
+        except Exception:
+            logger.exception("G-code analysis of %s failed", sha256)
+            return None
+
+    def _analyze_batch(self, items: list[tuple[str, str, Future]]) -> None:
+        results: dict[str, dict] = {}
+        try:
+            results = self.analyze_many([(sha256, path) for sha256, path, _ in items])
+            with session_scope() as session:
+                for sha256, metadata in results.items():
+                    store_gcode_metadata(session, sha256, metadata)
+        except Exception:
+            logger.exception("G-code batch analysis of %d files failed", len(items))
+        for sha256, _, future in items:
+            future.set_result(results.get(sha256))
+
+
+_ANALYZER: GcodeAnalyzer | None = None
+
+
+def start_gcode_analyzer(workers: int = DEFAULT_ANALYZER_WORKERS) -> GcodeAnalyzer:
+    global _ANALYZER
+    if _ANALYZER is None:
+        _ANALYZER = GcodeAnalyzer(min(max(1, workers), os.cpu_count() or 1))
+    return _ANALYZER
+
+
+def get_gcode_analyzer() -> GcodeAnalyzer:
+    return start_gcode_analyzer()
@@ -0,0 +1,188 @@
+import os
+import re
+import shutil
+import threading
+import time
+from pathlib import Path
+
+from sqlalchemy import event, func, inspect, text
+from sqlalchemy.orm import Session
+
+from printfleet2.models.gcode_file import GcodeFile
+
+
+DEFAULT_LIBRARY_MAX_BYTES = 10 * 1024 * 1024 * 1024
+SHA256_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+_LIBRARY_DIR: Path | None = None
+_LIBRARY_MAX_BYTES = DEFAULT_LIBRARY_MAX_BYTES
+_LIBRARY_LOCK = threading.Lock()
+_UNLINK_KEY = "gcode_library_unlink"
+
+
+def configure_gcode_library(path: str | Path | None, max_bytes: int | None = None) -> None:
+    global _LIBRARY_DIR, _LIBRARY_MAX_BYTES
+    _LIBRARY_DIR = Path(path) if path else None
+    if max_bytes is not None and max_bytes >= 0:
+        _LIBRARY_MAX_BYTES = int(max_bytes)
+
+
+def ensure_gcode_library_schema(session: Session) -> None:
+    engine = session.get_bind()
+    inspector = inspect(engine)
+    try:
+        if "gcode_files" in inspector.get_table_names():
+            return
+    except Exception:
+        return
+    try:
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    "CREATE TABLE gcode_files ("
+                    "sha256 VARCHAR(64) PRIMARY KEY, "
+                    "filename VARCHAR NOT NULL, "
+                    "size_bytes INTEGER NOT NULL, "
+                    "created_at REAL NOT NULL, "
+                    "last_used_at REAL NOT NULL, "
+                    "use_count INTEGER NOT NULL DEFAULT 0, "
+                    "uploaded_by VARCHAR"
+                    ")"
+                )
+            )
+            conn.execute(text("CREATE INDEX ix_gcode_files_last_used_at ON gcode_files (last_used_at)"))
+    except Exception:
+        return
+
+
+def normalize_sha256(value: object | None) -> str | None:
+    if not isinstance(value, str):
+        return None
+    cleaned = value.strip().lower()
+    return cleaned if SHA256_PATTERN.match(cleaned) else None
+
+
+def gcode_file_path(sha256: str) -> Path | None:
+    if _LIBRARY_DIR is None:
+        return None
+    return _LIBRARY_DIR / sha256[:2] / f"{sha256}.gcode"
+
+
+def get_gcode_file(session: Session, sha256: str) -> GcodeFile | None:
+    ensure_gcode_library_schema(session)
+    gcode_file = session.get(GcodeFile, sha256)
+    if gcode_file is None:
+        return None
+    path = gcode_file_path(sha256)
+    if path is None or not path.is_file():
+        session.delete(gcode_file)
+        return None
+    return gcode_file
+
+
+def list_gcode_files(session: Session, limit: int = 200) -> list[GcodeFile]:
+    ensure_gcode_library_schema(session)
+    return session.query(GcodeFile).order_by(GcodeFile.last_used_at.desc()).limit(limit).all()
+
+
+def gcode_library_usage(session: Session) -> dict:
+    ensure_gcode_library_schema(session)
+    count, total = session.query(func.count(GcodeFile.sha256), func.coalesce(func.sum(GcodeFile.size_bytes), 0)).one()
+    return {"files": int(count), "size_bytes": int(total), "max_bytes": _LIBRARY_MAX_BYTES}
+
+
+def store_gcode_file(
+    session: Session,
+    path: str,
+    sha256: str,
+    filename: str,
+    size: int,
+    username: str | None = None,
+) -> GcodeFile | None:
+    target = gcode_file_path(sha256)
+    if target is None or size > _LIBRARY_MAX_BYTES:
+        return None
+    ensure_gcode_library_schema(session)
+    now = time.time()
+    with _LIBRARY_LOCK:
+        if not target.is_file():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            partial = target.with_suffix(".part")
+            partial.unlink(missing_ok=True)
+            try:
+                os.link(path, partial)
+            except OSError:
+                shutil.copyfile(path, partial)
+            os.replace(partial, target)
+    gcode_file = session.get(GcodeFile, sha256)
+    if gcode_file is None:
+        gcode_file = GcodeFile(
+            sha256=sha256,
+            filename=os.path.basename(filename),
+            size_bytes=size,
+            created_at=now,
+            last_used_at=now,
+            use_count=0,
+            uploaded_by=username,
+        )
+        session.add(gcode_file)
+    else:
+        gcode_file.last_used_at = now
+    session.flush()
+    evict_gcode_files(session, keep={sha256})
+    return gcode_file
+
+
+def touch_gcode_file(gcode_file: GcodeFile, uses: int = 1) -> None:
+    gcode_file.last_used_at = time.time()
+    gcode_file.use_count = (gcode_file.use_count or 0) + uses
+
+
+def delete_gcode_file(session: Session, gcode_file: GcodeFile) -> None:
+    path = gcode_file_path(gcode_file.sha256)
+    session.delete(gcode_file)
+    if path is not None:
+        session.info.setdefault(_UNLINK_KEY, []).append(path)
+
+
+@event.listens_for(Session, "after_commit")
+def _unlink_deleted_files(session: Session) -> None:
+    for path in session.info.pop(_UNLINK_KEY, []):
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+@event.listens_for(Session, "after_rollback")
+def _keep_deleted_files(session: Session) -> None:
+    session.info.pop(_UNLINK_KEY, None)
+
+
+def evict_gcode_files(session: Session, keep: set[str] | None = None) -> int:
+    keep = keep or set()
+    total = int(session.query(func.coalesce(func.sum(GcodeFile.size_bytes), 0)).scalar() or 0)
+    if total <= _LIBRARY_MAX_BYTES:
+        return 0
+    evicted = 0
+    for gcode_file in session.query(GcodeFile).order_by(GcodeFile.last_used_at).all():
+        if total <= _LIBRARY_MAX_BYTES:
+            break
+        if gcode_file.sha256 in keep:
+            continue
+        total -= gcode_file.size_bytes
+        delete_gcode_file(session, gcode_file)
+        evicted += 1
+    return evicted
+
+
+def gcode_file_to_dict(gcode_file: GcodeFile) -> dict:
+    return {
+        "sha256": gcode_file.sha256,
+        "filename": gcode_file.filename,
+        "size_bytes": gcode_file.size_bytes,
+        "created_at": gcode_file.created_at,
+        "last_used_at": gcode_file.last_used_at,
+        "use_count": gcode_file.use_count,
+        "uploaded_by": gcode_file.uploaded_by,
+    }
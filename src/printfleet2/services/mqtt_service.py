@@ -0,0 +1,320 @@
+import asyncio
+import json
+import logging
+import os
+import ssl
+import struct
+import time
+from dataclasses import dataclass
+from urllib.parse import unquote, urlsplit
+
+from printfleet2.services.async_http_service import submit_coroutine
+from printfleet2.services.printer_status_service import (
+    DEFAULT_PLUG_PUSH_MAX_AGE,
+    PlugSampler,
+    build_tasmota_reading,
+    get_plug_sampler,
+)
+
+
+DEFAULT_MQTT_PORT = 1883
+DEFAULT_MQTTS_PORT = 8883
+CONNECT_TIMEOUT = 5.0
+KEEPALIVE = 60
+MAX_PACKET_BYTES = 256 * 1024
+RECONNECT_MIN_DELAY = 1.0
+RECONNECT_MAX_DELAY = 60.0
+TASMOTA_SUBSCRIPTIONS = ("tele/+/STATE", "tele/+/SENSOR", "tele/+/LWT", "stat/+/POWER")
+TASMOTA_MESSAGES = {("tele", "STATE"), ("tele", "SENSOR"), ("tele", "LWT"), ("stat", "POWER")}
+
+CONNECT = 1
+CONNACK = 2
+PUBLISH = 3
+SUBSCRIBE = 8
+SUBACK = 9
+PINGREQ = 12
+PINGRESP = 13
+DISCONNECT = 14
+
+logger = logging.getLogger(__name__)
+
+
+class MqttError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class BrokerSettings:
+    scheme: str
+    host: str
+    port: int
+    username: str | None = None
+    password: str | None = None
+    client_id: str = ""
+
+
+def parse_broker_url(url: str) -> BrokerSettings:
+    parts = urlsplit(url.strip())
+    scheme = (parts.scheme or "mqtt").lower()
+    if scheme not in {"mqtt", "mqtts", "tcp", "ssl"}:
+        raise MqttError(f"unsupported broker scheme: {scheme}")
+    if not parts.hostname:
+        raise MqttError("broker host missing")
+    secure = scheme in {"mqtts", "ssl"}
+    client_id = parts.path.strip("/") or f"printfleet2-{os.getpid()}"
+    return BrokerSettings(
+        scheme="mqtts" if secure else "mqtt",
+        host=parts.hostname,
+        port=parts.port or (DEFAULT_MQTTS_PORT if secure else DEFAULT_MQTT_PORT),
+        username=unquote(parts.username) if parts.username else None,
+        password=unquote(parts.password) if parts.password else None,
+        client_id=client_id[:23],
+    )
+
+
+def _encode_string(value: str) -> bytes:
+    data = value.encode("utf-8")
+    return struct.pack("!H", len(data)) + data
+
+
+def _encode_packet(packet_type: int, flags: int, body: bytes) -> bytes:
+    length = len(body)
+    encoded = bytearray()
+    while True:
+        byte = length % 128
+        length //= 128
+        encoded.append(byte | 0x80 if length else byte)
+        if not length:
+            break
+    return bytes([(packet_type << 4) | flags]) + bytes(encoded) + body
+
+
+class MqttConnection:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._reader = reader
+        self._writer = writer
+        self._packet_id = 0
+        self.closed = False
+
+    async def subscribe(self, filters: list[str] | tuple[str, ...]) -> None:
+        self._packet_id = self._packet_id % 65535 + 1
+        body = struct.pack("!H", self._packet_id) + b"".join(_encode_string(name) + b"\x00" for name in filters)
+        await self._send(SUBSCRIBE, 0x2, body)
+
+    async def publish(self, topic: str, payload: bytes = b"") -> None:
+        await self._send(PUBLISH, 0, _encode_string(topic) + payload)
+
+    async def ping(self) -> None:
+        await self._send(PINGREQ, 0, b"")
+
+    async def receive(self) -> tuple[str, bytes]:
+        while True:
+            packet_type, flags, body = await self._read_packet()
+            if packet_type != PUBLISH:
+                if packet_type not in {SUBACK, PINGRESP}:
+                    logger.debug("Ignoring MQTT packet type %s", packet_type)
+                continue
+            (topic_length,) = struct.unpack("!H", body[:2])
+            topic = body[2 : 2 + topic_length].decode("utf-8", errors="ignore")
+            offset = 2 + topic_length
+            if (flags >> 1) & 0x3:
+                offset += 2
+            return topic, body[offset:]
+
+    async def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            self._writer.write(_encode_packet(DISCONNECT, 0, b""))
+            await self._writer.drain()
+        except Exception:
+            pass
+        try:
+            self._writer.close()
+            await self._writer.wait_closed()
+        except Exception:
+            pass
+
+    async def _send(self, packet_type: int, flags: int, body: bytes) -> None:
+        if self.closed:
+            raise MqttError("connection closed")
+        self._writer.write(_encode_packet(packet_type, flags, body))
+        await self._writer.drain()
+
+    async def _read_packet(self) -> tuple[int, int, bytes]:
+        try:
+            (header,) = await self._reader.readexactly(1)
+            length = 0
+            for shift in range(0, 28, 7):
+                (byte,) = await self._reader.readexactly(1)
+                length |= (byte & 0x7F) << shift
+                if not byte & 0x80:
+                    break
+            else:
+                raise MqttError("malformed packet length")
+            if length > MAX_PACKET_BYTES:
+                raise MqttError("packet too large")
+            body = await self._reader.readexactly(length)
+        except (asyncio.IncompleteReadError, ConnectionError) as exc:
+            self.closed = True
+            raise MqttError("connection lost") from exc
+        return header >> 4, header & 0x0F, body
+
+
+async def open_mqtt(settings: BrokerSettings, keepalive: int = KEEPALIVE, timeout: float = CONNECT_TIMEOUT) -> MqttConnection:
+    flags = 0x02
+    payload = _encode_string(settings.client_id)
+    if settings.username:
+        flags |= 0x80
+        payload += _encode_string(settings.username)
+        if settings.password:
+            flags |= 0x40
+            payload += _encode_string(settings.password)
+    body = _encode_string("MQTT") + bytes([4, flags]) + struct.pack("!H", keepalive) + payload
+    context = ssl.create_default_context() if settings.scheme == "mqtts" else None
+
+    async def handshake() -> MqttConnection:
+        reader, writer = await asyncio.open_connection(settings.host, settings.port, ssl=context)
+        connection = MqttConnection(reader, writer)
+        try:
+            writer.write(_encode_packet(CONNECT, 0, body))
+            await writer.drain()
+            packet_type, _, ack = await connection._read_packet()
+            if packet_type != CONNACK or len(ack) < 2:
+                raise MqttError("unexpected broker response")
+            if ack[1] != 0:
+                raise MqttError(f"connection refused (code {ack[1]})")
+        except BaseException:
+            writer.close()
+            raise
+        return connection
+
+    return await asyncio.wait_for(handshake(), timeout)
+
+
+def tasmota_reading(suffix: str, payload: bytes) -> dict:
+    text = payload.decode("utf-8", errors="ignore").strip()
+    if suffix == "POWER":
+        return build_tasmota_reading({"POWER": text})
+    if suffix == "LWT":
+        if text.lower() == "offline":
+            return {"plug_label": "Plug offline", "plug_state": "error", "power_w": None, "error": "offline"}
+        return {}
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return {}
+    return build_tasmota_reading(data) if isinstance(data, dict) else {}
+
+
+class TasmotaMqttSubscriber:
+    def __init__(self, settings: BrokerSettings, sampler: PlugSampler) -> None:
+        self.settings = settings
+        self.connected = False
+        self.connects = 0
+        self.messages = 0
+        self.last_message_at: float | None = None
+        self.last_error: str | None = None
+        self._sampler = sampler
+        self._delay = RECONNECT_MIN_DELAY
+        self._future = None
+
+    def start(self) -> None:
+        if self._future is None or self._future.done():
+            self._future = submit_coroutine(self._run())
+
+    def stop(self) -> None:
+        if self._future is not None:
+            self._future.cancel()
+            self._future = None
+
+    def to_dict(self) -> dict:
+        return {
+            "broker": f"{self.settings.scheme}://{self.settings.host}:{self.settings.port}",
+            "connected": self.connected,
+            "connects": self.connects,
+            "messages": self.messages,
+            "topics": len(self._sampler.topics()),
+            "last_message_at": self.last_message_at,
+            "last_error": self.last_error,
+        }
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._session()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                self.last_error = str(exc) or exc.__class__.__name__
+                logger.debug("MQTT session ended: %s", self.last_error)
+            self.connected = False
+            await asyncio.sleep(self._delay)
+            self._delay = min(RECONNECT_MAX_DELAY, self._delay * 2)
+
+    async def _session(self) -> None:
+        connection = await open_mqtt(self.settings)
+        try:
+            await connection.subscribe(TASMOTA_SUBSCRIPTIONS)
+            self.connected = True
+            self.connects += 1
+            self.last_error = None
+            self._delay = RECONNECT_MIN_DELAY
+            requested: set[str] = set()
+            last_ping = time.monotonic()
+            while True:
+                topics = self._sampler.topics()
+                for topic in set(topics) - requested:
+                    await connection.publish(f"cmnd/{topic}/TelePeriod")
+                requested = set(topics)
+                if time.monotonic() - last_ping >= KEEPALIVE / 2:
+                    await connection.ping()
+                    last_ping = time.monotonic()
+                try:
+                    topic, payload = await asyncio.wait_for(connection.receive(), KEEPALIVE / 2)
+                except asyncio.TimeoutError:
+                    continue
+                self._handle_message(topics, topic, payload)
+        finally:
+            self.connected = False
+            self._sampler.expire_readings()
+            await connection.close()
+
+    def _handle_message(self, topics: dict[str, int], topic: str, payload: bytes) -> None:
+        parts = topic.split("/")
+        if len(parts) != 3 or (parts[0], parts[2]) not in TASMOTA_MESSAGES:
+            return
+        _, name, suffix = parts
+        printer_id = topics.get(name)
+        if printer_id is None:
+            return
+        reading = tasmota_reading(suffix, payload)
+        self.messages += 1
+        self.last_message_at = time.time()
+        if reading:
+            self._sampler.apply_reading(printer_id, reading)
+
+
+_SUBSCRIBER: TasmotaMqttSubscriber | None = None
+
+
+def start_mqtt_subscriber(url: str, max_age: float = DEFAULT_PLUG_PUSH_MAX_AGE) -> TasmotaMqttSubscriber | None:
+    global _SUBSCRIBER
+    if _SUBSCRIBER is None:
+        try:
+            settings = parse_broker_url(url)
+        except MqttError as exc:
+            logger.warning("MQTT ingestion disabled: %s", exc)
+            return None
+        sampler = get_plug_sampler()
+        sampler.push_max_age = max_age
+        _SUBSCRIBER = TasmotaMqttSubscriber(settings, sampler)
+        _SUBSCRIBER.start()
+    return _SUBSCRIBER
+
+
+def get_mqtt_status() -> dict | None:
+    if _SUBSCRIBER is None:
+        return None
+    return _SUBSCRIBER.to_dict()
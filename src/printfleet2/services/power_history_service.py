@@ -0,0 +1,296 @@
+import struct
+import threading
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import inspect, text
+from sqlalchemy.orm import Session
+
+from printfleet2.db.session import session_scope
+from printfleet2.models.power import PowerChunk, PowerRollup
+from printfleet2.services.printer_status_service import get_plug_sampler
+
+
+SAMPLE_FORMAT = "<If"
+SAMPLE_SIZE = struct.calcsize(SAMPLE_FORMAT)
+FLUSH_INTERVAL = 300.0
+MAX_GAP_SECONDS = 300.0
+ROLLUP_SECONDS = 3600
+MAX_BUFFERED_SAMPLES = 4096
+ENERGY_RESOLUTIONS = {"hour", "day"}
+
+
+def ensure_power_schema(session: Session) -> None:
+    engine = session.get_bind()
+    inspector = inspect(engine)
+    try:
+        tables = set(inspector.get_table_names())
+    except Exception:
+        return
+    if {"power_chunks", "power_rollups"}.issubset(tables):
+        return
+    try:
+        with engine.begin() as conn:
+            if "power_chunks" not in tables:
+                conn.execute(
+                    text(
+                        "CREATE TABLE power_chunks ("
+                        "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                        "printer_id INTEGER NOT NULL, "
+                        "start_ts REAL NOT NULL, "
+                        "end_ts REAL NOT NULL, "
+                        "sample_count INTEGER NOT NULL, "
+                        "samples BLOB NOT NULL"
+                        ")"
+                    )
+                )
+                conn.execute(text("CREATE INDEX ix_power_chunks_printer_id ON power_chunks (printer_id)"))
+                conn.execute(text("CREATE INDEX ix_power_chunks_start_ts ON power_chunks (start_ts)"))
+            if "power_rollups" not in tables:
+                conn.execute(
+                    text(
+                        "CREATE TABLE power_rollups ("
+                        "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                        "printer_id INTEGER NOT NULL, "
+                        "bucket_start INTEGER NOT NULL, "
+                        "energy_wh REAL NOT NULL DEFAULT 0, "
+                        "sample_count INTEGER NOT NULL DEFAULT 0, "
+                        "power_sum_w REAL NOT NULL DEFAULT 0, "
+                        "power_max_w REAL, "
+                        "CONSTRAINT uq_power_rollups_printer_id UNIQUE (printer_id, bucket_start)"
+                        ")"
+                    )
+                )
+                conn.execute(text("CREATE INDEX ix_power_rollups_bucket_start ON power_rollups (bucket_start)"))
+    except Exception:
+        return
+
+
+def encode_samples(start_ts: float, samples: list[tuple[float, float]]) -> bytes:
+    return b"".join(
+        struct.pack(SAMPLE_FORMAT, int(round((ts - start_ts) * 1000)), watts) for ts, watts in samples
+    )
+
+
+def decode_chunk(chunk: PowerChunk) -> list[tuple[float, float]]:
+    return [
+        (chunk.start_ts + offset_ms / 1000.0, watts)
+        for offset_ms, watts in struct.iter_unpack(SAMPLE_FORMAT, chunk.samples)
+    ]
+
+
+def _segments(samples: list[tuple[float, float]], previous: tuple[float, float] | None = None):
+    for ts, watts in samples:
+        if previous is not None:
+            elapsed = ts - previous[0]
+            if 0 < elapsed <= MAX_GAP_SECONDS:
+                yield previous[0], (previous[1] + watts) / 2 * elapsed / 3600.0
+        previous = (ts, watts)
+
+
+def integrate_wh(samples: list[tuple[float, float]]) -> float:
+    return sum(energy_wh for _, energy_wh in _segments(samples))
+
+
+class PowerRecorder:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._buffers: dict[int, list[tuple[float, float]]] = {}
+        self._last: dict[int, tuple[float, float]] = {}
+        self._flushed_at = time.monotonic()
+        self.dropped = 0
+
+    def record(self, readings: dict[int, dict], now: float | None = None) -> None:
+        now = time.time() if now is None else now
+        with self._lock:
+            for printer_id, reading in readings.items():
+                watts = reading.get("power_w")
+                if watts is None or reading.get("stale"):
+                    continue
+                buffer = self._buffers.setdefault(printer_id, [])
+                if buffer and buffer[-1][0] >= now:
+                    continue
+                buffer.append((now, float(watts)))
+                self._trim_buffer_locked(buffer)
+
+    def _trim_buffer_locked(self, buffer: list[tuple[float, float]]) -> None:
+        excess = len(buffer) - MAX_BUFFERED_SAMPLES
+        if excess > 0:
+            del buffer[:excess]
+            self.dropped += excess
+
+    def pending(self, printer_id: int) -> list[tuple[float, float]]:
+        with self._lock:
+            return list(self._buffers.get(printer_id, []))
+
+    def flush(self, force: bool = False) -> int:
+        if not force and time.monotonic() - self._flushed_at < FLUSH_INTERVAL:
+            return 0
+        with self._lock:
+            buffers = {printer_id: samples for printer_id, samples in self._buffers.items() if samples}
+            self._buffers = {}
+            last = dict(self._last)
+            self._flushed_at = time.monotonic()
+        if not buffers:
+            return 0
+        try:
+            with session_scope() as session:
+                ensure_power_schema(session)
+                for printer_id, samples in buffers.items():
+                    session.add(
+                        PowerChunk(
+                            printer_id=printer_id,
+                            start_ts=samples[0][0],
+                            end_ts=samples[-1][0],
+                            sample_count=len(samples),
+                            samples=encode_samples(samples[0][0], samples),
+                        )
+                    )
+                    _add_rollups(session, printer_id, samples, last.get(printer_id))
+        except Exception:
+            with self._lock:
+                for printer_id, samples in buffers.items():
+                    buffer = self._buffers.setdefault(printer_id, [])
+                    buffer[:0] = samples
+                    self._trim_buffer_locked(buffer)
+            raise
+        with self._lock:
+            for printer_id, samples in buffers.items():
+                self._last[printer_id] = samples[-1]
+        return sum(len(samples) for samples in buffers.values())
+
+
+def _bucket(ts: float) -> int:
+    return int(ts // ROLLUP_SECONDS) * ROLLUP_SECONDS
+
+
+def _add_rollups(
+    session: Session,
+    printer_id: int,
+    samples: list[tuple[float, float]],
+    previous: tuple[float, float] | None,
+) -> None:
+    totals: dict[int, list] = {}
+    for ts, watts in samples:
+        entry = totals.setdefault(_bucket(ts), [0.0, 0, 0.0, None])
+        entry[1] += 1
+        entry[2] += watts
+        entry[3] = watts if entry[3] is None else max(entry[3], watts)
+    for ts, energy_wh in _segments(samples, previous):
+        totals.setdefault(_bucket(ts), [0.0, 0, 0.0, None])[0] += energy_wh
+    existing = {
+        rollup.bucket_start: rollup
+        for rollup in session.query(PowerRollup).filter(
+            PowerRollup.printer_id == printer_id,
+            PowerRollup.bucket_start.in_(list(totals)),
+        )
+    }
+    for bucket_start, (energy_wh, count, power_sum, power_max) in totals.items():
+        rollup = existing.get(bucket_start)
+        if rollup is None:
+            session.add(
+                PowerRollup(
+                    printer_id=printer_id,
+                    bucket_start=bucket_start,
+                    energy_wh=energy_wh,
+                    sample_count=count,
+                    power_sum_w=power_sum,
+                    power_max_w=power_max,
+                )
+            )
+            continue
+        rollup.energy_wh = float(rollup.energy_wh or 0.0) + energy_wh
+        rollup.sample_count = int(rollup.sample_count or 0) + count
+        rollup.power_sum_w = float(rollup.power_sum_w or 0.0) + power_sum
+        if power_max is not None:
+            rollup.power_max_w = power_max if rollup.power_max_w is None else max(rollup.power_max_w, power_max)
+
+
+def integrate_printer_energy_wh(session: Session, printer_id: int, start_ts: float, end_ts: float) -> float:
+    ensure_power_schema(session)
+    chunks = (
+        session.query(PowerChunk)
+        .filter(
+            PowerChunk.printer_id == printer_id,
+            PowerChunk.end_ts >= start_ts,
+            PowerChunk.start_ts <= end_ts,
+        )
+        .order_by(PowerChunk.start_ts)
+        .all()
+    )
+    samples = [sample for chunk in chunks for sample in decode_chunk(chunk)]
+    samples.extend(_RECORDER.pending(printer_id))
+    return integrate_wh([sample for sample in samples if start_ts <= sample[0] <= end_ts])
+
+
+def _bucket_label(bucket_start: int, resolution: str) -> str:
+    moment = datetime.fromtimestamp(bucket_start, timezone.utc).astimezone()
+    if resolution == "day":
+        return moment.date().isoformat()
+    return moment.isoformat(timespec="minutes")
+
+
+def energy_series(
+    session: Session,
+    start_ts: float,
+    end_ts: float,
+    resolution: str = "day",
+    printer_id: int | None = None,
+) -> dict:
+    ensure_power_schema(session)
+    query = session.query(
+        PowerRollup.printer_id,
+        PowerRollup.bucket_start,
+        PowerRollup.energy_wh,
+        PowerRollup.sample_count,
+        PowerRollup.power_sum_w,
+        PowerRollup.power_max_w,
+    ).filter(PowerRollup.bucket_start >= _bucket(start_ts), PowerRollup.bucket_start < end_ts)
+    if printer_id is not None:
+        query = query.filter(PowerRollup.printer_id == printer_id)
+    buckets: dict[str, dict] = {}
+    printers: dict[int, float] = {}
+    for row_printer_id, bucket_start, energy_wh, count, power_sum, power_max in query.order_by(PowerRollup.bucket_start):
+        label = _bucket_label(bucket_start, resolution)
+        entry = buckets.setdefault(label, {"start": label, "energy_wh": 0.0, "samples": 0, "power_sum_w": 0.0, "max_w": None})
+        entry["energy_wh"] += energy_wh or 0.0
+        entry["samples"] += count or 0
+        entry["power_sum_w"] += power_sum or 0.0
+        if power_max is not None:
+            entry["max_w"] = power_max if entry["max_w"] is None else max(entry["max_w"], power_max)
+        printers[row_printer_id] = printers.get(row_printer_id, 0.0) + (energy_wh or 0.0)
+    items = [
+        {
+            "start": entry["start"],
+            "energy_kwh": round(entry["energy_wh"] / 1000.0, 4),
+            "avg_w": round(entry["power_sum_w"] / entry["samples"], 1) if entry["samples"] else None,
+            "max_w": entry["max_w"],
+        }
+        for entry in buckets.values()
+    ]
+    return {
+        "resolution": resolution,
+        "total_kwh": round(sum(printers.values()) / 1000.0, 4),
+        "items": items,
+        "printers": {printer: round(energy_wh / 1000.0, 4) for printer, energy_wh in printers.items()},
+    }
+
+
+_RECORDER = PowerRecorder()
+_STARTED = False
+
+
+def get_power_recorder() -> PowerRecorder:
+    return _RECORDER
+
+
+def flush_power_samples(force: bool = False) -> int:
+    return _RECORDER.flush(force)
+
+
+def start_power_recorder() -> PowerRecorder:
+    global _STARTED
+    if not _STARTED:
+        _STARTED = True
+        get_plug_sampler().add_reading_sink(_RECORDER.record)
+    return _RECORDER
@@ -0,0 +1,297 @@
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+
+from sqlalchemy.orm import Session
+
+from printfleet2.db.session import session_scope
+from printfleet2.models.printer import Printer
+from printfleet2.models.print_job import PrintJob
+from printfleet2.models.printer_group import PrinterGroup
+from printfleet2.services.print_job_service import (
+    count_print_jobs,
+    count_print_jobs_today,
+    create_print_job,
+    ensure_print_job_schema,
+)
+from printfleet2.services.power_history_service import flush_power_samples, integrate_printer_energy_wh
+from printfleet2.services.printer_service import list_printers, update_print_time_totals
+from printfleet2.services.printer_status_service import get_status_poller
+from printfleet2.services.settings_service import ensure_settings_row
+from printfleet2.services.status_event_service import JOB_END_EVENTS, get_status_event_bus, is_active_job_label
+
+
+PENDING_UPLOAD_TTL_SECONDS = 30 * 60
+SUMMARY_MIN_INTERVAL = 1.0
+JOB_START_GRACE_SECONDS = 300.0
+JOB_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+@dataclass(frozen=True)
+class FleetSummary:
+    updated_at: float
+    total_printers: int
+    printers: list[tuple[int, str]] = field(default_factory=list)
+    print_time_today_seconds: float = 0.0
+    print_time_total_seconds: float = 0.0
+    print_jobs_today: int = 0
+    print_jobs_total: int = 0
+    uptime_start_ts: float | None = None
+
+
+_PENDING_UPLOADS: dict[int, list[dict]] = {}
+_PENDING_LOCK = threading.Lock()
+_SUMMARY: FleetSummary | None = None
+_SUMMARY_LOCK = threading.Lock()
+_RUNNING_PRINTERS: set[int] = set()
+_STARTED = False
+
+
+def _normalize_job_filename(value: object | None) -> str | None:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        cleaned = value.strip()
+    else:
+        cleaned = str(value).strip()
+    if not cleaned:
+        return None
+    for sep in ("/", "\\"):
+        if sep in cleaned:
+            cleaned = cleaned.rsplit(sep, 1)[-1]
+    return cleaned or None
+
+
+def job_name_matches(filename: str, job_name: str | None) -> bool:
+    normalized_job = _normalize_job_filename(job_name)
+    normalized_file = _normalize_job_filename(filename)
+    if not normalized_job or not normalized_file:
+        return False
+    job_lower = normalized_job.lower()
+    file_lower = normalized_file.lower()
+    job_stem = job_lower.rsplit(".", 1)[0]
+    file_stem = file_lower.rsplit(".", 1)[0]
+    if job_lower == file_lower:
+        return True
+    if job_stem and file_stem and job_stem == file_stem:
+        return True
+    safe_name = filename.replace("\\", "_").replace("/", "_").lower()
+    if job_lower == safe_name:
+        return True
+    return job_lower.endswith(file_lower)
+
+
+def record_pending_upload(
+    printer_id: int,
+    filename: str,
+    printer_name: str,
+    username: str,
+    print_via: str,
+) -> None:
+    now = time.time()
+    with _PENDING_LOCK:
+        _cleanup_pending_uploads(now)
+        attempts = _PENDING_UPLOADS.setdefault(printer_id, [])
+        attempts = [entry for entry in attempts if not job_name_matches(entry["filename"], filename)]
+        attempts.append(
+            {
+                "ts": now,
+                "filename": filename,
+                "printer_name": printer_name,
+                "username": username,
+                "print_via": print_via,
+            }
+        )
+        _PENDING_UPLOADS[printer_id] = attempts
+
+
+def discard_pending_upload(printer_id: int, filename: str) -> None:
+    with _PENDING_LOCK:
+        attempts = _PENDING_UPLOADS.get(printer_id)
+        if not attempts:
+            return
+        attempts = [entry for entry in attempts if not job_name_matches(entry["filename"], filename)]
+        if attempts:
+            _PENDING_UPLOADS[printer_id] = attempts
+        else:
+            _PENDING_UPLOADS.pop(printer_id, None)
+
+
+def _cleanup_pending_uploads(now: float) -> None:
+    cutoff = now - PENDING_UPLOAD_TTL_SECONDS
+    for printer_id in list(_PENDING_UPLOADS.keys()):
+        attempts = [entry for entry in _PENDING_UPLOADS[printer_id] if entry["ts"] >= cutoff]
+        if attempts:
+            _PENDING_UPLOADS[printer_id] = attempts
+        else:
+            _PENDING_UPLOADS.pop(printer_id, None)
+
+
+def _pop_pending_upload(printer_id: int, job_name: str | None) -> dict | None:
+    if not job_name:
+        return None
+    attempts = _PENDING_UPLOADS.get(printer_id)
+    if not attempts:
+        return None
+    for idx, attempt in enumerate(attempts):
+        if job_name_matches(attempt["filename"], job_name):
+            return attempts.pop(idx)
+    return None
+
+
+def flush_pending_uploads(session: Session, status_map: dict[int, dict], name_map: dict[int, str]) -> None:
+    now = time.time()
+    with _PENDING_LOCK:
+        _cleanup_pending_uploads(now)
+        if not _PENDING_UPLOADS:
+            return
+        matched = []
+        for printer_id, status in status_map.items():
+            label = status.get("label")
+            job_name = str(status.get("job_name") or "").strip() or None
+            if not job_name and not is_active_job_label(label):
+                continue
+            attempt = _pop_pending_upload(printer_id, job_name)
+            if attempt:
+                matched.append((printer_id, job_name, attempt))
+    for printer_id, job_name, attempt in matched:
+        create_print_job(
+            session,
+            gcode_filename=attempt.get("filename") or job_name or "unknown",
+            printer_name=name_map.get(printer_id) or attempt.get("printer_name") or "Unknown printer",
+            username=attempt.get("username") or "unknown",
+            print_via=attempt.get("print_via") or "unknown",
+            printer_id=printer_id,
+        )
+
+
+def _mark_printing_checks(session: Session, printers: list[Printer], status_map: dict[int, dict]) -> None:
+    group_ids_to_check: set[int] = set()
+    for printer in printers:
+        label = status_map.get(printer.id, {}).get("label")
+        if isinstance(label, str) and "printing" in label.lower():
+            if (printer.print_check_status or "").strip().lower() != "check":
+                printer.print_check_status = "check"
+            if printer.group_id:
+                group_ids_to_check.add(int(printer.group_id))
+    if not group_ids_to_check:
+        return
+    groups = session.query(PrinterGroup).filter(PrinterGroup.id.in_(group_ids_to_check)).all()
+    for group in groups:
+        if (group.print_check_status or "").strip().lower() != "check":
+            group.print_check_status = "check"
+
+
+def _job_timestamp(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value[:19], JOB_TIMESTAMP_FORMAT).replace(tzinfo=timezone.utc).timestamp()
+    except ValueError:
+        return None
+
+
+def _finish_print_job(session: Session, job: PrintJob, finished_ts: float) -> None:
+    job.finished_at = datetime.fromtimestamp(finished_ts, timezone.utc).strftime(JOB_TIMESTAMP_FORMAT)
+    started = _job_timestamp(job.job_date)
+    if started is not None:
+        job.energy_kwh = round(integrate_printer_energy_wh(session, job.printer_id, started, finished_ts) / 1000.0, 4)
+
+
+def _open_print_jobs(session: Session, printer_ids: list[int]) -> list[PrintJob]:
+    ensure_print_job_schema(session)
+    return session.query(PrintJob).filter(PrintJob.finished_at.is_(None), PrintJob.printer_id.in_(printer_ids)).all()
+
+
+def _expire_unstarted_jobs(session: Session, status_map: dict[int, dict]) -> None:
+    now = time.time()
+    for job in _open_print_jobs(session, [printer_id for printer_id in status_map if printer_id not in _RUNNING_PRINTERS]):
+        status = status_map.get(job.printer_id) or {}
+        if status.get("stale") or is_active_job_label(status.get("label")):
+            continue
+        started = _job_timestamp(job.job_date)
+        if started is not None and now - started < JOB_START_GRACE_SECONDS:
+            continue
+        _finish_print_job(session, job, now)
+
+
+def apply_status_events(events: list[dict]) -> None:
+    ended: dict[int, float] = {}
+    for event in events:
+        printer_id = event["printer_id"]
+        if event["type"] == "job_started":
+            _RUNNING_PRINTERS.add(printer_id)
+        elif event["type"] in JOB_END_EVENTS or event["type"] == "went_offline":
+            _RUNNING_PRINTERS.discard(printer_id)
+            if event["type"] in JOB_END_EVENTS:
+                ended[printer_id] = event["ts"]
+    if not ended:
+        return
+    with session_scope() as session:
+        for job in _open_print_jobs(session, list(ended)):
+            started = _job_timestamp(job.job_date)
+            if started is not None and started > ended[job.printer_id]:
+                continue
+            _finish_print_job(session, job, ended[job.printer_id])
+
+
+def _build_summary(session: Session, printers: list[Printer]) -> FleetSummary:
+    enabled = [printer for printer in printers if printer.enabled]
+    today_key = date.today().isoformat()
+    settings = ensure_settings_row(session)
+    return FleetSummary(
+        updated_at=time.time(),
+        total_printers=len(printers),
+        printers=[(printer.id, printer.name) for printer in enabled],
+        print_time_today_seconds=sum(
+            float(printer.print_time_today_seconds or 0.0)
+            for printer in enabled
+            if printer.print_time_today_date == today_key
+        ),
+        print_time_total_seconds=sum(float(printer.print_time_total_seconds or 0.0) for printer in enabled),
+        print_jobs_today=count_print_jobs_today(session),
+        print_jobs_total=count_print_jobs(session),
+        uptime_start_ts=settings.uptime_start_ts,
+    )
+
+
+def apply_status_samples(samples: dict[int, dict]) -> FleetSummary:
+    global _SUMMARY
+    with _SUMMARY_LOCK:
+        current = _SUMMARY
+    if not samples and current is not None and time.time() - current.updated_at < SUMMARY_MIN_INTERVAL:
+        return current
+    with session_scope() as session:
+        printers = list_printers(session)
+        enabled = [printer for printer in printers if printer.enabled]
+        fresh = {printer.id: samples[printer.id] for printer in enabled if printer.id in samples}
+        if fresh:
+            update_print_time_totals(enabled, fresh)
+            _mark_printing_checks(session, enabled, fresh)
+            flush_pending_uploads(session, fresh, {printer.id: printer.name for printer in enabled})
+            session.flush()
+            _expire_unstarted_jobs(session, fresh)
+        summary = _build_summary(session, printers)
+    with _SUMMARY_LOCK:
+        _SUMMARY = summary
+    flush_power_samples()
+    return summary
+
+
+def get_fleet_summary() -> FleetSummary:
+    with _SUMMARY_LOCK:
+        summary = _SUMMARY
+    if summary is not None:
+        return summary
+    with session_scope() as session:
+        return _build_summary(session, list_printers(session))
+
+
+def start_print_accounting() -> None:
+    global _STARTED
+    if _STARTED:
+        return
+    _STARTED = True
+    get_status_event_bus().subscribe(apply_status_events)
+    get_status_poller().add_sample_sink(apply_status_samples)
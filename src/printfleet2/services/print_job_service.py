@@ -11,6 +11,7 @@ PRINT_VIA_MAP = {
     "justprinting": "JustPrinting",
     "justgroupprinting": "JustGroupPrinting",
     "webui": "Web UI",
+    "reprint": "Reprint",
 }
 
 
@@ -51,7 +52,11 @@ def ensure_print_job_schema(session: Session) -> None:
                         "gcode_filename VARCHAR NOT NULL, "
                         "printer_name VARCHAR NOT NULL, "
                         "username VARCHAR NOT NULL, "
-                        "print_via VARCHAR NOT NULL DEFAULT 'unknown'"
+                        "print_via VARCHAR NOT NULL DEFAULT 'unknown', "
+                        "printer_id INTEGER, "
+                        "finished_at VARCHAR, "
+                        "energy_kwh REAL, "
+                        "gcode_sha256 VARCHAR(64)"
                         ")"
                     )
                 )
@@ -62,6 +67,14 @@ def ensure_print_job_schema(session: Session) -> None:
     missing = {}
     if "print_via" not in columns:
         missing["print_via"] = "TEXT NOT NULL DEFAULT 'unknown'"
+    if "printer_id" not in columns:
+        missing["printer_id"] = "INTEGER"
+    if "finished_at" not in columns:
+        missing["finished_at"] = "VARCHAR"
+    if "energy_kwh" not in columns:
+        missing["energy_kwh"] = "REAL"
+    if "gcode_sha256" not in columns:
+        missing["gcode_sha256"] = "VARCHAR(64)"
     if not missing:
         return
     try:
@@ -86,6 +99,8 @@ def create_print_job(
     printer_name: str,
     username: str,
     print_via: str | None,
+    printer_id: int | None = None,
+    gcode_sha256: str | None = None,
 ) -> PrintJob | None:
     ensure_print_job_schema(session)
     columns = _get_print_job_columns(session)
@@ -97,6 +112,8 @@ def create_print_job(
         printer_name=printer_name,
         username=username,
         print_via=normalize_print_via(print_via),
+        printer_id=printer_id,
+        gcode_sha256=gcode_sha256,
     )
     session.add(job)
     return job
@@ -168,4 +185,8 @@ def print_job_to_dict(job: PrintJob) -> dict:
         "printer_name": job.printer_name,
         "username": job.username,
         "print_via": job.print_via,
+        "printer_id": job.printer_id,
+        "finished_at": job.finished_at,
+        "energy_kwh": job.energy_kwh,
+        "gcode_sha256": job.gcode_sha256,
     }
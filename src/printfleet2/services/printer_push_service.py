@@ -0,0 +1,342 @@
+import asyncio
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Callable
+
+from printfleet2.services.async_http_service import (
+    WebSocket,
+    WebSocketClosed,
+    http_request,
+    open_websocket,
+    run_coroutine,
+)
+from printfleet2.services.printer_status_service import (
+    MOONRAKER_OBJECTS,
+    PrinterSnapshot,
+    StatusPoller,
+    build_moonraker_status,
+    build_octoprint_status,
+    get_status_poller,
+    moonraker_headers,
+    octoprint_headers,
+)
+
+
+USER_AGENT = "PrintFleet2 Push"
+CONNECT_TIMEOUT = 5.0
+RPC_TIMEOUT = 5.0
+IDLE_TIMEOUT = 60.0
+RECONNECT_MIN_DELAY = 1.0
+RECONNECT_MAX_DELAY = 60.0
+OCTOPRINT_THROTTLE = 1
+
+logger = logging.getLogger(__name__)
+
+
+def _printer_base_url(printer: PrinterSnapshot, websocket: bool = False) -> str:
+    if websocket:
+        scheme = "wss" if printer.https else "ws"
+    else:
+        scheme = "https" if printer.https else "http"
+    return f"{scheme}://{printer.host}:{printer.port}"
+
+
+class PushSession(ABC):
+    backend = ""
+
+    def __init__(
+        self,
+        printer: PrinterSnapshot,
+        publish: Callable[[int, dict], bool],
+        on_disconnect: Callable[[int], None],
+    ) -> None:
+        self.printer = printer
+        self.connected = False
+        self.connects = 0
+        self.last_message_at: float | None = None
+        self.last_error: str | None = None
+        self._publish = publish
+        self._on_disconnect = on_disconnect
+        self._task: asyncio.Task | None = None
+        self._delay = RECONNECT_MIN_DELAY
+        self._last_status: dict | None = None
+
+    @classmethod
+    def supports(cls, printer: PrinterSnapshot) -> bool:
+        return True
+
+    def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def cancel(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+        if self.connected:
+            self.connected = False
+            self._on_disconnect(self.printer.id)
+
+    def to_dict(self) -> dict:
+        return {
+            "printer_id": self.printer.id,
+            "backend": self.backend,
+            "connected": self.connected,
+            "connects": self.connects,
+            "last_message_at": self.last_message_at,
+            "last_error": self.last_error,
+        }
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._stream()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                self.last_error = str(exc) or exc.__class__.__name__
+                logger.debug("Push stream for printer %s ended: %s", self.printer.id, self.last_error)
+            if self.connected:
+                self.connected = False
+                self._on_disconnect(self.printer.id)
+            await asyncio.sleep(self._delay)
+            self._delay = min(RECONNECT_MAX_DELAY, self._delay * 2)
+
+    def _mark_connected(self) -> None:
+        self.connected = True
+        self.connects += 1
+        self.last_error = None
+        self._delay = RECONNECT_MIN_DELAY
+
+    def _emit(self, status: dict) -> None:
+        self.last_message_at = time.time()
+        if status == self._last_status:
+            return
+        if self._publish(self.printer.id, status):
+            self._last_status = status
+
+    @abstractmethod
+    async def _stream(self) -> None: ...
+
+
+class MoonrakerPushSession(PushSession):
+    backend = "moonraker"
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._ws: WebSocket | None = None
+        self._rpc_id = 0
+        self._info: dict | None = None
+        self._objects: dict[str, dict] = {}
+        self._resync = False
+
+    async def _stream(self) -> None:
+        url = f"{_printer_base_url(self.printer, websocket=True)}/websocket"
+        self._ws = await open_websocket(url, moonraker_headers(self.printer, USER_AGENT), CONNECT_TIMEOUT)
+        try:
+            await self._sync_state()
+            self._mark_connected()
+            self._emit(self._build_status())
+            while True:
+                try:
+                    message = await asyncio.wait_for(self._ws.receive_json(), IDLE_TIMEOUT)
+                except asyncio.TimeoutError:
+                    self._resync = True
+                    message = None
+                if message is not None:
+                    self._handle_notification(message)
+                if self._resync:
+                    await self._sync_state()
+                    self._emit(self._build_status())
+        finally:
+            await self._ws.close()
+            self._ws = None
+
+    async def _call(self, method: str, params: dict | None = None) -> Any:
+        if self._ws is None:
+            raise WebSocketClosed("not connected")
+        self._rpc_id += 1
+        request_id = self._rpc_id
+        request: dict = {"jsonrpc": "2.0", "method": method, "id": request_id}
+        if params is not None:
+            request["params"] = params
+        await self._ws.send_json(request)
+
+        async def wait_response() -> Any:
+            while True:
+                message = await self._ws.receive_json()
+                if isinstance(message, dict) and message.get("id") == request_id:
+                    return message.get("result") if "error" not in message else None
+                self._handle_notification(message)
+
+        return await asyncio.wait_for(wait_response(), RPC_TIMEOUT)
+
+    async def _sync_state(self) -> None:
+        self._resync = False
+        info = await self._call("printer.info")
+        self._info = info if isinstance(info, dict) else None
+        self._objects = {}
+        state = self._info.get("state") if self._info else None
+        if state != "ready":
+            return
+        result = await self._call("printer.objects.subscribe", {"objects": MOONRAKER_OBJECTS})
+        status = result.get("status") if isinstance(result, dict) else None
+        if isinstance(status, dict):
+            self._objects = {name: dict(values) for name, values in status.items() if isinstance(values, dict)}
+
+    def _handle_notification(self, message: Any) -> None:
+        if not isinstance(message, dict):
+            return
+        method = message.get("method")
+        if method == "notify_status_update":
+            params = message.get("params")
+            delta = params[0] if isinstance(params, list) and params else None
+            if not isinstance(delta, dict):
+                return
+            for name, values in delta.items():
+                if isinstance(values, dict):
+                    self._objects.setdefault(name, {}).update(values)
+            if self.connected:
+                self._emit(self._build_status())
+        elif method in {"notify_klippy_ready", "notify_klippy_shutdown", "notify_klippy_disconnected"}:
+            self._resync = True
+
+    def _build_status(self) -> dict:
+        return build_moonraker_status(self._info, self._objects)
+
+
+class OctoPrintPushSession(PushSession):
+    backend = "octoprint"
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._current: dict = {}
+        self._temperature: dict = {}
+
+    @classmethod
+    def supports(cls, printer: PrinterSnapshot) -> bool:
+        return bool(printer.api_key)
+
+    async def _login(self) -> str:
+        headers = octoprint_headers(self.printer, USER_AGENT)
+        headers["Content-Type"] = "application/json"
+        url = f"{_printer_base_url(self.printer)}/api/login"
+        body = json.dumps({"passive": True}).encode("utf-8")
+        status_code, raw = await http_request("POST", url, headers, body=body, timeout=CONNECT_TIMEOUT)
+        if status_code in {401, 403}:
+            raise WebSocketClosed("API key invalid")
+        if status_code >= 400:
+            raise WebSocketClosed(f"login failed with HTTP {status_code}")
+        payload = json.loads(raw.decode("utf-8"))
+        name = payload.get("name") if isinstance(payload, dict) else None
+        session = payload.get("session") if isinstance(payload, dict) else None
+        if not name or not session:
+            raise WebSocketClosed("login returned no session")
+        return f"{name}:{session}"
+
+    async def _stream(self) -> None:
+        auth = await self._login()
+        url = f"{_printer_base_url(self.printer, websocket=True)}/sockjs/websocket"
+        ws = await open_websocket(url, {"User-Agent": USER_AGENT}, CONNECT_TIMEOUT)
+        try:
+            await ws.send_json({"auth": auth})
+            await ws.send_json({"throttle": OCTOPRINT_THROTTLE})
+            self._current = {}
+            self._temperature = {}
+            while True:
+                message = await asyncio.wait_for(ws.receive_json(), IDLE_TIMEOUT)
+                if not isinstance(message, dict):
+                    continue
+                if "reauthRequired" in message:
+                    raise WebSocketClosed("re-authentication required")
+                data = message.get("current") or message.get("history")
+                if not isinstance(data, dict):
+                    continue
+                self._handle_current(data)
+                if not self.connected:
+                    self._mark_connected()
+                self._emit(self._build_status())
+        finally:
+            await ws.close()
+
+    def _handle_current(self, data: dict) -> None:
+        for key in ("state", "job", "progress"):
+            if isinstance(data.get(key), dict):
+                self._current[key] = data[key]
+        temps = data.get("temps")
+        if isinstance(temps, list):
+            for entry in temps:
+                if not isinstance(entry, dict):
+                    continue
+                for name, values in entry.items():
+                    if isinstance(values, dict):
+                        self._temperature[name] = values
+
+    def _build_status(self) -> dict:
+        state = self._current.get("state")
+        job_payload = {
+            "job": self._current.get("job"),
+            "progress": self._current.get("progress"),
+            "state": state.get("text") if isinstance(state, dict) else None,
+        }
+        return build_octoprint_status({"state": state, "temperature": self._temperature}, job_payload)
+
+
+SESSION_TYPES: dict[str, type[PushSession]] = {
+    "moonraker": MoonrakerPushSession,
+    "octoprint": OctoPrintPushSession,
+}
+
+
+class PushManager:
+    def __init__(self, poller: StatusPoller) -> None:
+        self._poller = poller
+        self._sessions: dict[int, PushSession] = {}
+
+    def sync(self, printers: list[PrinterSnapshot]) -> None:
+        wanted = {}
+        for printer in printers:
+            session_type = SESSION_TYPES.get((printer.backend or "").strip().lower())
+            if printer.status_push and printer.scanning and session_type is not None and session_type.supports(printer):
+                wanted[printer.id] = printer
+        run_coroutine(self._sync(wanted))
+
+    def connected_ids(self) -> set[int]:
+        return {printer_id for printer_id, session in list(self._sessions.items()) if session.connected}
+
+    def sessions(self) -> list[dict]:
+        return [session.to_dict() for session in list(self._sessions.values())]
+
+    async def _sync(self, wanted: dict[int, PrinterSnapshot]) -> None:
+        for printer_id, session in list(self._sessions.items()):
+            if wanted.get(printer_id) != session.printer:
+                session.cancel()
+                self._sessions.pop(printer_id, None)
+        for printer_id, printer in wanted.items():
+            if printer_id in self._sessions:
+                continue
+            session_type = SESSION_TYPES[(printer.backend or "").strip().lower()]
+            session = session_type(printer, self._poller.apply_push_status, self._handle_disconnect)
+            self._sessions[printer_id] = session
+            session.start()
+
+    def _handle_disconnect(self, printer_id: int) -> None:
+        self._poller.reprobe(printer_id)
+
+
+_MANAGER: PushManager | None = None
+
+
+def start_push_manager() -> PushManager:
+    global _MANAGER
+    if _MANAGER is None:
+        poller = get_status_poller()
+        _MANAGER = PushManager(poller)
+        poller.add_push_source(_MANAGER)
+    return _MANAGER
+
+
+def get_push_sessions() -> list[dict]:
+    if _MANAGER is None:
+        return []
+    return _MANAGER.sessions()
@@ -152,6 +152,8 @@ def ensure_printer_schema(session: Session) -> None:
                     conn.execute(text("UPDATE printers SET scanning = 1"))
             if "group_id" not in columns:
                 conn.execute(text("ALTER TABLE printers ADD COLUMN group_id INTEGER"))
+            if "status_push" not in columns:
+                conn.execute(text("ALTER TABLE printers ADD COLUMN status_push BOOLEAN NOT NULL DEFAULT 0"))
             if "print_check_status" not in columns:
                 conn.execute(text("ALTER TABLE printers ADD COLUMN print_check_status VARCHAR"))
                 conn.execute(
@@ -205,6 +207,7 @@ def create_printer(session: Session, data: dict) -> Printer:
         port=data.get("port", 80),
         https=_bool_value(data.get("https"), False),
         scanning=_resolve_scanning(data, True),
+        status_push=_bool_value(data.get("status_push"), False),
         token=data.get("token"),
         api_key=data.get("api_key"),
         error_report_interval=float(data.get("error_report_interval", 30.0)),
@@ -239,6 +242,8 @@ def update_printer(session: Session, printer: Printer, data: dict) -> Printer:
         printer.https = _bool_value(data.get("https"), printer.https)
     if "scanning" in data or "no_scanning" in data:
         printer.scanning = _resolve_scanning(data, printer.scanning)
+    if "status_push" in data:
+        printer.status_push = _bool_value(data.get("status_push"), printer.status_push)
     if "token" in data:
         printer.token = data["token"]
     if "api_key" in data:
@@ -280,6 +285,7 @@ def printer_to_dict(printer: Printer) -> dict:
         "port": printer.port,
         "https": printer.https,
         "scanning": printer.scanning,
+        "status_push": bool(printer.status_push),
         "token": printer.token,
         "api_key": printer.api_key,
         "error_report_interval": printer.error_report_interval,
@@ -1,16 +1,50 @@
-import concurrent.futures
-import json
-import ssl
-import urllib.error
-import urllib.request
-from dataclasses import dataclass
-from typing import Iterable
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Iterable, Protocol, TypeVar
 
+from printfleet2.db.session import session_scope
 from printfleet2.models.printer import Printer
+from printfleet2.services.async_http_service import CircuitOpenError, fetch_json, run_coroutine
+from printfleet2.services.printer_service import list_printers
+from printfleet2.services.settings_service import ensure_settings_row, normalize_plug_poll_interval
 
 
 REQUEST_TIMEOUT = 1.2
 USER_AGENT = "PrintFleet2 Status"
+DEFAULT_POLL_INTERVAL = 5.0
+MIN_POLL_INTERVAL = 1.0
+IDLE_POLL_FACTOR = 4.0
+MAX_IDLE_POLL_INTERVAL = 30.0
+MAX_BACKOFF_POLL_INTERVAL = 300.0
+POLL_DUE_SLACK = 0.25
+SINGLE_FLIGHT_WINDOW = 0.5
+STATUS_DEADLINE = 0.8
+STATUS_REMOVED_HISTORY = 256
+DEFAULT_PLUG_PUSH_MAX_AGE = 600.0
+ACTIVE_POLL_LABELS = {"Printing", "Paused", "Pausing", "Resuming"}
+MOONRAKER_OBJECTS = {
+    "print_stats": ["state", "filename", "print_duration", "total_duration", "message"],
+    "virtual_sdcard": ["progress"],
+    "display_status": ["progress"],
+    "extruder": ["temperature", "target"],
+    "heater_bed": ["temperature", "target"],
+}
+MOONRAKER_OBJECTS_QUERY = "&".join(f"{name}={','.join(fields)}" for name, fields in MOONRAKER_OBJECTS.items())
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_LAST_KNOWN: dict[tuple[str, int], tuple[float, dict]] = {}
+_LAST_KNOWN_LOCK = threading.Lock()
+_BACKGROUND_TASKS: set[asyncio.Task] = set()
+_IN_FLIGHT: dict[tuple[str, int], asyncio.Task] = {}
+_RECENT_RESULTS: dict[tuple[str, int], tuple[float, dict]] = {}
+_FLIGHT_COUNTERS: dict[str, dict[str, int]] = {}
+_FLIGHT_LOCK = threading.Lock()
 
 
 @dataclass(frozen=True)
@@ -24,22 +58,12 @@ class PrinterSnapshot:
     token: str | None
     api_key: str | None
     tasmota_host: str | None
+    status_push: bool = False
+    tasmota_topic: str | None = None
 
 
-def _fetch_json(url: str, headers: dict) -> tuple[int | None, dict | None]:
-    try:
-        context = None
-        if url.startswith("https://"):
-            context = ssl._create_unverified_context()
-        request = urllib.request.Request(url, headers=headers)
-        with urllib.request.urlopen(request, timeout=REQUEST_TIMEOUT, context=context) as response:
-            data = response.read(8192)
-            payload = json.loads(data.decode("utf-8", errors="ignore"))
-            return response.status, payload
-    except urllib.error.HTTPError as exc:
-        return exc.code, None
-    except Exception:
-        return None, None
+async def _fetch_json(url: str, headers: dict) -> tuple[int | None, dict | None]:
+    return await fetch_json(url, headers, REQUEST_TIMEOUT)
 
 
 def _coerce_temp(value: object | None) -> float | None:
@@ -194,26 +218,37 @@ def _extract_octoprint_temps(payload: dict | None) -> tuple[float | None, float
     return hotend, bed, hotend_target, bed_target
 
 
-def _moonraker_status(printer: PrinterSnapshot, plug_label: str | None, plug_state: str | None) -> dict:
-    headers = {"User-Agent": USER_AGENT}
+def moonraker_headers(printer: PrinterSnapshot, user_agent: str = USER_AGENT) -> dict:
+    headers = {"User-Agent": user_agent}
     if printer.token:
         headers["Authorization"] = f"Bearer {printer.token}"
         headers["X-Api-Key"] = printer.token
+    return headers
+
+
+async def _moonraker_status(printer: PrinterSnapshot, plug_label: str | None, plug_state: str | None) -> dict:
+    headers = moonraker_headers(printer)
     url = f"{_printer_base_url(printer)}/printer/info"
-    status_code, payload = _fetch_json(url, headers)
+    status_code, payload = await _fetch_json(url, headers)
     if status_code in {401, 403}:
         return _status("Auth required", "warn", plug_label=plug_label, plug_state=plug_state)
     if not payload or status_code is None:
         return _status("Offline", "error", plug_label=plug_label, plug_state=plug_state)
     result = payload.get("result") if isinstance(payload, dict) else None
-    objects_payload = _fetch_json(
-        f"{_printer_base_url(printer)}/printer/objects/query?"
-        "print_stats=state,filename,print_duration,total_duration,message&"
-        "virtual_sdcard=progress&display_status=progress&"
-        "extruder=temperature,target&heater_bed=temperature,target",
+    _, objects_payload = await _fetch_json(
+        f"{_printer_base_url(printer)}/printer/objects/query?{MOONRAKER_OBJECTS_QUERY}",
         headers,
-    )[1]
+    )
     status = _extract_moonraker_status(objects_payload)
+    return build_moonraker_status(result, status, plug_label, plug_state)
+
+
+def build_moonraker_status(
+    result: dict | None,
+    status: dict,
+    plug_label: str | None = None,
+    plug_state: str | None = None,
+) -> dict:
     hotend, bed, target_hotend, target_bed = _extract_moonraker_temps(status)
     job_name, progress, elapsed, remaining, error_message = _extract_moonraker_job(status)
     job_state = None
@@ -264,18 +299,39 @@ def _moonraker_status(printer: PrinterSnapshot, plug_label: str | None, plug_sta
     )
 
 
-def _octoprint_status(printer: PrinterSnapshot, plug_label: str | None, plug_state: str | None) -> dict:
+async def _octoprint_status(printer: PrinterSnapshot, plug_label: str | None, plug_state: str | None) -> dict:
     if not printer.api_key:
         return _status("API key missing", "warn", plug_label=plug_label, plug_state=plug_state)
-    headers = {"User-Agent": USER_AGENT, "X-Api-Key": printer.api_key}
+    headers = octoprint_headers(printer)
     url = f"{_printer_base_url(printer)}/api/printer"
-    status_code, payload = _fetch_json(url, headers)
+    status_code, payload = await _fetch_json(url, headers)
     if status_code in {401, 403}:
         return _status("API key invalid", "warn", plug_label=plug_label, plug_state=plug_state)
     if not payload or status_code is None:
         return _status("Offline", "error", plug_label=plug_label, plug_state=plug_state)
-    hotend, bed, target_hotend, target_bed = _extract_octoprint_temps(payload if isinstance(payload, dict) else None)
-    job_payload = _fetch_json(f"{_printer_base_url(printer)}/api/job", headers)[1]
+    _, job_payload = await _fetch_json(f"{_printer_base_url(printer)}/api/job", headers)
+    return build_octoprint_status(
+        payload if isinstance(payload, dict) else None,
+        job_payload if isinstance(job_payload, dict) else None,
+        plug_label,
+        plug_state,
+    )
+
+
+def octoprint_headers(printer: PrinterSnapshot, user_agent: str = USER_AGENT) -> dict:
+    headers = {"User-Agent": user_agent}
+    if printer.api_key:
+        headers["X-Api-Key"] = printer.api_key
+    return headers
+
+
+def build_octoprint_status(
+    payload: dict | None,
+    job_payload: dict | None,
+    plug_label: str | None = None,
+    plug_state: str | None = None,
+) -> dict:
+    hotend, bed, target_hotend, target_bed = _extract_octoprint_temps(payload)
     job_name = None
     progress = None
     elapsed = None
@@ -355,32 +411,31 @@ def _tasmota_base_url(host: str) -> str:
     return f"http://{base}".rstrip("/")
 
 
-def _tasmota_status(printer: PrinterSnapshot) -> tuple[str, str]:
-    if not printer.tasmota_host:
-        return "Plug missing", "muted"
-    base_url = _tasmota_base_url(printer.tasmota_host)
-    if not base_url:
-        return "Plug invalid", "muted"
+def _plug_result(label: str, state: str, error: str | None = None, power_w=None, today_wh=None) -> dict:
+    return {"plug_label": label, "plug_state": state, "power_w": power_w, "today_wh": today_wh, "error": error}
+
+
+def _tasmota_power_state(payload: dict | None) -> tuple[str, str]:
+    if not isinstance(payload, dict):
+        return "Plug unknown", "muted"
+    for data in (payload.get("StatusSTS"), payload):
+        if not isinstance(data, dict):
+            continue
+        for key, value in data.items():
+            if not str(key).upper().startswith("POWER"):
+                continue
+            state = str(value).strip().upper()
+            if state == "ON":
+                return "Plug on", "ok"
+            if state == "OFF":
+                return "Plug off", "muted"
+            return f"Plug {state.lower()}", "warn"
+    status = payload.get("Status")
+    power = status.get("Power") if isinstance(status, dict) else None
     try:
-        url = f"{base_url}/cm?cmnd=Power"
-        status_code, payload = _fetch_json(url, {"User-Agent": USER_AGENT})
-        if status_code in {401, 403}:
-            return "Plug auth", "warn"
-        if not payload or status_code is None:
-            return "Plug offline", "error"
-        if isinstance(payload, dict):
-            for key, value in payload.items():
-                if not str(key).upper().startswith("POWER"):
-                    continue
-                state = str(value).strip().upper()
-                if state == "ON":
-                    return "Plug on", "ok"
-                if state == "OFF":
-                    return "Plug off", "muted"
-                return f"Plug {state.lower()}", "warn"
+        return ("Plug on", "ok") if int(str(power).strip()) else ("Plug off", "muted")
+    except (TypeError, ValueError):
         return "Plug unknown", "muted"
-    except Exception:
-        return "Plug error", "muted"
 
 
 def _extract_tasmota_energy(payload: dict | None) -> tuple[float | None, float | None]:
@@ -404,49 +459,80 @@ def _extract_tasmota_energy(payload: dict | None) -> tuple[float | None, float |
     return None, None
 
 
-def _tasmota_energy(printer: PrinterSnapshot) -> dict:
+async def _tasmota_sample(printer: PrinterSnapshot) -> dict:
     if not printer.tasmota_host:
-        return {"power_w": None, "today_wh": None, "error": "missing"}
+        return _plug_result("Plug missing", "muted", "missing")
     base_url = _tasmota_base_url(printer.tasmota_host)
     if not base_url:
-        return {"power_w": None, "today_wh": None, "error": "invalid"}
-    last_status = None
-    for command in ("Status%208", "Status%200"):
-        try:
-            url = f"{base_url}/cm?cmnd={command}"
-            status_code, payload = _fetch_json(url, {"User-Agent": USER_AGENT})
-            last_status = status_code
-            if status_code in {401, 403}:
-                return {"power_w": None, "today_wh": None, "error": "auth"}
-            if not payload or status_code is None:
-                continue
-            power, today_kwh = _extract_tasmota_energy(payload)
-            if power is None and today_kwh is None:
-                continue
-            today_wh = today_kwh * 1000 if today_kwh is not None else None
-            return {"power_w": power, "today_wh": today_wh, "error": None}
-        except Exception:
-            return {"power_w": None, "today_wh": None, "error": "error"}
-    if last_status is None:
-        return {"power_w": None, "today_wh": None, "error": "offline"}
-    return {"power_w": None, "today_wh": None, "error": "unavailable"}
+        return _plug_result("Plug invalid", "muted", "invalid")
+    try:
+        status_code, payload = await _fetch_json(f"{base_url}/cm?cmnd=Status%200", {"User-Agent": USER_AGENT})
+    except CircuitOpenError:
+        raise
+    except Exception:
+        return _plug_result("Plug error", "muted", "error")
+    if status_code in {401, 403}:
+        return _plug_result("Plug auth", "warn", "auth")
+    if not payload or status_code is None:
+        return _plug_result("Plug offline", "error", "offline")
+    label, state = _tasmota_power_state(payload)
+    power, today_kwh = _extract_tasmota_energy(payload)
+    if power is None and today_kwh is None:
+        return _plug_result(label, state, "unavailable")
+    today_wh = today_kwh * 1000 if today_kwh is not None else None
+    return _plug_result(label, state, None, power, today_wh)
 
 
-def get_printer_status(printer: PrinterSnapshot, include_plug: bool = True) -> dict:
+async def _plug_sample(printer: PrinterSnapshot) -> dict:
+    return await _guarded_fetch(
+        "plug",
+        printer,
+        lambda: _tasmota_sample(printer),
+        lambda: _plug_result("Plug offline", "error", "offline"),
+    )
+
+
+def _plug_status_fields(sample: dict) -> dict:
+    status = {"plug_label": sample.get("plug_label"), "plug_state": sample.get("plug_state")}
+    if sample.get("stale"):
+        status.update(stale=True, age_ms=sample.get("age_ms"))
+    return status
+
+
+def build_tasmota_reading(payload: dict) -> dict:
+    reading: dict = {}
+    label, state = _tasmota_power_state(payload)
+    if label != "Plug unknown":
+        reading.update(plug_label=label, plug_state=state)
+    power, today_kwh = _extract_tasmota_energy(payload)
+    if power is not None or today_kwh is not None:
+        reading.update(power_w=power, today_wh=today_kwh * 1000 if today_kwh is not None else None, error=None)
+    return reading
+
+
+def _plug_energy_fields(sample: dict) -> dict:
+    energy = {"power_w": sample.get("power_w"), "today_wh": sample.get("today_wh"), "error": sample.get("error")}
+    if sample.get("stale"):
+        energy.update(stale=True, age_ms=sample.get("age_ms"))
+    return energy
+
+
+async def get_printer_status(printer: PrinterSnapshot, include_plug: bool = True) -> dict:
     plug_label = None
     plug_state = None
     if include_plug and printer.tasmota_host:
         try:
-            plug_label, plug_state = _tasmota_status(printer)
+            plug = await _plug_sample(printer)
+            plug_label, plug_state = plug["plug_label"], plug["plug_state"]
         except Exception:
             plug_label, plug_state = "Plug error", "muted"
     if not printer.scanning:
         return _status("Scanning off", "muted", plug_label=plug_label, plug_state=plug_state)
     backend = (printer.backend or "").strip().lower()
     if backend == "moonraker":
-        return _moonraker_status(printer, plug_label, plug_state)
+        return await _moonraker_status(printer, plug_label, plug_state)
     if backend == "octoprint":
-        return _octoprint_status(printer, plug_label, plug_state)
+        return await _octoprint_status(printer, plug_label, plug_state)
     return _status("Unsupported", "muted", plug_label=plug_label, plug_state=plug_state)
 
 
@@ -467,72 +553,851 @@ def build_printer_snapshots(printers: Iterable[Printer | PrinterSnapshot]) -> li
                 token=printer.token,
                 api_key=printer.api_key,
                 tasmota_host=printer.tasmota_host,
+                status_push=bool(printer.status_push),
+                tasmota_topic=(printer.tasmota_topic or "").strip() or None,
             )
         )
     return snapshots
 
 
+async def _gather_by_id(
+    items: list[PrinterSnapshot],
+    worker: Callable[[PrinterSnapshot], Awaitable[T]],
+    on_error: Callable[[Exception], T],
+    deadline: float | None = None,
+    on_late: Callable[[int, T], None] | None = None,
+) -> dict[int, T]:
+    async def run(printer: PrinterSnapshot) -> tuple[int, T]:
+        try:
+            return printer.id, await worker(printer)
+        except Exception as exc:
+            return printer.id, on_error(exc)
+
+    if deadline is None:
+        results = await asyncio.gather(*(run(printer) for printer in items))
+        return dict(results)
+    if not items:
+        return {}
+    tasks = [asyncio.ensure_future(run(printer)) for printer in items]
+    done, pending = await asyncio.wait(tasks, timeout=deadline)
+    for task in pending:
+        _BACKGROUND_TASKS.add(task)
+        task.add_done_callback(_BACKGROUND_TASKS.discard)
+        if on_late is not None:
+            task.add_done_callback(lambda late: None if late.cancelled() else on_late(*late.result()))
+    return dict(task.result() for task in done)
+
+
+def _remember_result(kind: str, printer_id: int, value: dict) -> dict:
+    with _LAST_KNOWN_LOCK:
+        _LAST_KNOWN[(kind, printer_id)] = (time.time(), value)
+    return value
+
+
+def _stale_result(kind: str, printer_id: int, fallback: dict) -> dict:
+    with _LAST_KNOWN_LOCK:
+        known = _LAST_KNOWN.get((kind, printer_id))
+    if known is None:
+        return {**fallback, "stale": True, "age_ms": None}
+    fetched_at, value = known
+    return {**value, "stale": True, "age_ms": int(max(0.0, time.time() - fetched_at) * 1000)}
+
+
+def _count_flight(kind: str, counter: str) -> None:
+    with _FLIGHT_LOCK:
+        counters = _FLIGHT_COUNTERS.setdefault(kind, {"fetches": 0, "saved": 0})
+        counters[counter] += 1
+
+
+def _finish_flight(key: tuple[str, int], task: asyncio.Task) -> None:
+    if _IN_FLIGHT.get(key) is task:
+        del _IN_FLIGHT[key]
+    if task.cancelled() or task.exception() is not None:
+        return
+    _RECENT_RESULTS[key] = (time.monotonic(), task.result())
+
+
+async def _single_flight(key: tuple[str, int], fetch: Callable[[], Awaitable[dict]]) -> dict:
+    recent = _RECENT_RESULTS.get(key)
+    if recent is not None and time.monotonic() - recent[0] <= SINGLE_FLIGHT_WINDOW:
+        _count_flight(key[0], "saved")
+        return recent[1]
+    task = _IN_FLIGHT.get(key)
+    if task is None:
+        _count_flight(key[0], "fetches")
+        task = asyncio.ensure_future(fetch())
+        _IN_FLIGHT[key] = task
+        task.add_done_callback(lambda done: _finish_flight(key, done))
+    else:
+        _count_flight(key[0], "saved")
+    return await asyncio.shield(task)
+
+
+def get_single_flight_stats() -> list[dict]:
+    with _FLIGHT_LOCK:
+        return [
+            {
+                "kind": kind,
+                "fetches": counters["fetches"],
+                "saved": counters["saved"],
+            }
+            for kind, counters in sorted(_FLIGHT_COUNTERS.items())
+        ]
+
+
+async def _guarded_fetch(
+    kind: str,
+    printer: PrinterSnapshot,
+    fetch: Callable[[], Awaitable[dict]],
+    fallback: Callable[[], dict],
+    variant: str | None = None,
+) -> dict:
+    try:
+        value = await _single_flight((variant or kind, printer.id), fetch)
+    except CircuitOpenError:
+        return _stale_result(kind, printer.id, fallback())
+    return _remember_result(kind, printer.id, value)
+
+
+async def collect_printer_statuses_async(
+    printers: Iterable[Printer | PrinterSnapshot],
+    include_plug: bool = True,
+    deadline: float | None = None,
+) -> dict[int, dict]:
+    snapshots = build_printer_snapshots(printers)
+    status_map = await _gather_by_id(
+        snapshots,
+        lambda printer: _guarded_fetch(
+            "status",
+            printer,
+            lambda: get_printer_status(printer, include_plug),
+            lambda: _status("Offline", "error"),
+            "status_plug" if include_plug else "status",
+        ),
+        lambda exc: _status("Status error", "error", error_message=str(exc)),
+        deadline,
+    )
+    for printer in snapshots:
+        if printer.id not in status_map:
+            status_map[printer.id] = _stale_result("status", printer.id, _status("Unknown", "muted"))
+    return status_map
+
+
+async def collect_plug_samples_async(printers: Iterable[Printer | PrinterSnapshot]) -> dict[int, dict]:
+    return await _gather_by_id(
+        [snapshot for snapshot in build_printer_snapshots(printers) if snapshot.tasmota_host],
+        _plug_sample,
+        lambda exc: _plug_result("Plug error", "muted", "error"),
+    )
+
+
+async def collect_plug_statuses_async(printers: Iterable[Printer | PrinterSnapshot]) -> dict[int, dict]:
+    samples = await collect_plug_samples_async(printers)
+    return {printer_id: _plug_status_fields(sample) for printer_id, sample in samples.items()}
+
+
+async def collect_plug_energy_async(printers: Iterable[Printer | PrinterSnapshot]) -> dict[int, dict]:
+    samples = await collect_plug_samples_async(printers)
+    return {printer_id: _plug_energy_fields(sample) for printer_id, sample in samples.items()}
+
+
 def collect_printer_statuses(
     printers: Iterable[Printer | PrinterSnapshot],
     include_plug: bool = True,
+    deadline: float | None = None,
 ) -> dict[int, dict]:
-    status_map: dict[int, dict] = {}
     snapshots = build_printer_snapshots(printers)
     if not snapshots:
-        return status_map
-    max_workers = min(16, max(1, len(snapshots)))
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = {
-            executor.submit(get_printer_status, printer, include_plug): printer.id
-            for printer in snapshots
-        }
-        for future in concurrent.futures.as_completed(futures):
-            printer_id = futures[future]
-            try:
-                status_map[printer_id] = future.result()
-            except Exception as exc:
-                status_map[printer_id] = _status("Status error", "error", error_message=str(exc))
-    return status_map
+        return {}
+    return run_coroutine(collect_printer_statuses_async(snapshots, include_plug, deadline))
 
 
 def collect_plug_statuses(printers: Iterable[Printer | PrinterSnapshot]) -> dict[int, dict]:
-    status_map: dict[int, dict] = {}
-    snapshots = [
-        snapshot
-        for snapshot in build_printer_snapshots(printers)
-        if snapshot.tasmota_host
-    ]
+    snapshots = build_printer_snapshots(printers)
     if not snapshots:
-        return status_map
-    max_workers = min(16, max(1, len(snapshots)))
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = {executor.submit(_tasmota_status, printer): printer.id for printer in snapshots}
-        for future in concurrent.futures.as_completed(futures):
-            printer_id = futures[future]
-            try:
-                label, state = future.result()
-                status_map[printer_id] = {"plug_label": label, "plug_state": state}
-            except Exception:
-                status_map[printer_id] = {"plug_label": "Plug error", "plug_state": "muted"}
-    return status_map
+        return {}
+    return run_coroutine(collect_plug_statuses_async(snapshots))
 
 
 def collect_plug_energy(printers: Iterable[Printer | PrinterSnapshot]) -> dict[int, dict]:
-    energy_map: dict[int, dict] = {}
-    snapshots = [
-        snapshot
-        for snapshot in build_printer_snapshots(printers)
-        if snapshot.tasmota_host
-    ]
+    snapshots = build_printer_snapshots(printers)
     if not snapshots:
-        return energy_map
-    max_workers = min(16, max(1, len(snapshots)))
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = {executor.submit(_tasmota_energy, printer): printer.id for printer in snapshots}
-        for future in concurrent.futures.as_completed(futures):
-            printer_id = futures[future]
+        return {}
+    return run_coroutine(collect_plug_energy_async(snapshots))
+
+
+class ChangeNotifier:
+    def __init__(self) -> None:
+        self._condition = threading.Condition()
+        self._sequence = 0
+
+    @property
+    def sequence(self) -> int:
+        with self._condition:
+            return self._sequence
+
+    def notify(self) -> None:
+        with self._condition:
+            self._sequence += 1
+            self._condition.notify_all()
+
+    def wait(self, sequence: int, timeout: float) -> int:
+        with self._condition:
+            self._condition.wait_for(lambda: self._sequence != sequence, timeout)
+            return self._sequence
+
+
+_CHANGES = ChangeNotifier()
+
+
+@dataclass(frozen=True)
+class StatusSnapshot:
+    version: int
+    updated_at: float | None
+    statuses: dict[int, dict] = field(default_factory=dict)
+    fetched_at: dict[int, float] = field(default_factory=dict)
+    changed: dict[int, int] = field(default_factory=dict)
+    removed: dict[int, int] = field(default_factory=dict)
+    history_floor: int = 0
+
+    def changes_since(self, since: int) -> tuple[set[int] | None, set[int]]:
+        if since < self.history_floor or since > self.version:
+            return None, set()
+        changed = {printer_id for printer_id, version in self.changed.items() if version > since}
+        removed = {printer_id for printer_id, version in self.removed.items() if version > since}
+        return changed, removed
+
+
+def _resolve_poll_interval(value: object | None) -> float:
+    try:
+        parsed = float(value) if value is not None else DEFAULT_POLL_INTERVAL
+    except (TypeError, ValueError):
+        return DEFAULT_POLL_INTERVAL
+    if parsed <= 0:
+        return DEFAULT_POLL_INTERVAL
+    return max(MIN_POLL_INTERVAL, parsed)
+
+
+@dataclass
+class PollScheduleEntry:
+    mode: str = "new"
+    interval: float = 0.0
+    next_due: float = 0.0
+    failures: int = 0
+    last_polled: float | None = None
+
+
+class PollSchedule:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: dict[int, PollScheduleEntry] = {}
+
+    def prune(self, printer_ids: set[int]) -> None:
+        with self._lock:
+            for printer_id in list(self._entries):
+                if printer_id not in printer_ids:
+                    del self._entries[printer_id]
+
+    def is_due(self, printer_id: int, now: float) -> bool:
+        with self._lock:
+            entry = self._entries.get(printer_id)
+            return entry is None or entry.next_due <= now + POLL_DUE_SLACK
+
+    def is_powered_down(self, printer_id: int) -> bool:
+        with self._lock:
+            entry = self._entries.get(printer_id)
+            return entry is not None and entry.mode in {"offline", "plug_off"}
+
+    def next_due(self) -> float | None:
+        with self._lock:
+            if not self._entries:
+                return None
+            return min(entry.next_due for entry in self._entries.values())
+
+    def record(self, printer_id: int, status: dict | None, base_interval: float, now: float) -> None:
+        label = status.get("label") if isinstance(status, dict) else None
+        with self._lock:
+            entry = self._entries.setdefault(printer_id, PollScheduleEntry())
+            if isinstance(status, dict) and status.get("plug_label") == "Plug off":
+                mode = "plug_off"
+            elif label == "Offline" or (isinstance(status, dict) and status.get("stale")):
+                mode = "offline"
+            elif label in ACTIVE_POLL_LABELS:
+                mode = "printing"
+            else:
+                mode = "idle"
+            if mode in {"offline", "plug_off"}:
+                entry.failures = entry.failures + 1 if entry.mode in {"offline", "plug_off"} else 1
+                interval = min(MAX_BACKOFF_POLL_INTERVAL, base_interval * (2 ** entry.failures))
+            elif mode == "printing":
+                entry.failures = 0
+                interval = base_interval
+            else:
+                entry.failures = 0
+                interval = max(base_interval, min(MAX_IDLE_POLL_INTERVAL, base_interval * IDLE_POLL_FACTOR))
+            entry.mode = mode
+            entry.interval = interval
+            entry.next_due = now + interval
+            entry.last_polled = now
+
+    def record_push(self, printer_id: int, base_interval: float, now: float) -> None:
+        with self._lock:
+            entry = self._entries.setdefault(printer_id, PollScheduleEntry())
+            entry.mode = "push"
+            entry.failures = 0
+            entry.interval = base_interval
+            entry.next_due = now + base_interval
+
+    def reprobe(self, printer_id: int | None = None) -> None:
+        with self._lock:
+            if printer_id is None:
+                entries = list(self._entries.values())
+            else:
+                entry = self._entries.get(printer_id)
+                entries = [entry] if entry is not None else []
+            for entry in entries:
+                entry.next_due = 0.0
+
+    def note_plug_states(self, plug_states: dict[int, dict]) -> list[int]:
+        reprobe_ids = []
+        with self._lock:
+            for printer_id, plug in plug_states.items():
+                entry = self._entries.get(printer_id)
+                if entry is None or entry.mode not in {"offline", "plug_off"}:
+                    continue
+                if plug.get("plug_label") == "Plug on":
+                    entry.next_due = 0.0
+                    reprobe_ids.append(printer_id)
+        return reprobe_ids
+
+    def to_dicts(self, now: float | None = None) -> list[dict]:
+        now = time.monotonic() if now is None else now
+        wall_now = time.time()
+        with self._lock:
+            return [
+                {
+                    "printer_id": printer_id,
+                    "mode": entry.mode,
+                    "interval_s": round(entry.interval, 3),
+                    "failures": entry.failures,
+                    "next_due_in_s": round(max(0.0, entry.next_due - now), 3),
+                    "next_due_at": wall_now + max(0.0, entry.next_due - now),
+                    "last_polled_at": (
+                        wall_now - (now - entry.last_polled) if entry.last_polled is not None else None
+                    ),
+                }
+                for printer_id, entry in sorted(self._entries.items())
+            ]
+
+
+async def _poll_printer_status(printer: PrinterSnapshot, check_plug: bool) -> dict:
+    if check_plug and printer.tasmota_host:
+        plug = await _plug_sample(printer)
+        if plug.get("plug_label") == "Plug off" and not plug.get("stale"):
+            return _status("Offline", "error", plug_label=plug["plug_label"], plug_state=plug["plug_state"])
+    return await _guarded_fetch(
+        "status",
+        printer,
+        lambda: get_printer_status(printer, include_plug=False),
+        lambda: _status("Offline", "error"),
+    )
+
+
+class PushSource(Protocol):
+    def sync(self, printers: list[PrinterSnapshot]) -> None: ...
+
+    def connected_ids(self) -> set[int]: ...
+
+
+def _same_status(left: dict | None, right: dict | None) -> bool:
+    if left is None or right is None:
+        return left is right
+    return {key: value for key, value in left.items() if key != "age_ms"} == {
+        key: value for key, value in right.items() if key != "age_ms"
+    }
+
+
+class StatusPoller:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._version = 0
+        self._updated_at: float | None = None
+        self._statuses: dict[int, dict] = {}
+        self._interval = DEFAULT_POLL_INTERVAL
+        self._push_sources: list[PushSource] = []
+        self._sample_sinks: list[Callable[[dict[int, dict]], object]] = []
+        self._fresh: dict[int, dict] = {}
+        self._printer_ids: set[int] = set()
+        self._pushed_at: dict[int, float] = {}
+        self._fetched_at: dict[int, float] = {}
+        self._schedule = PollSchedule()
+        self._deadline = STATUS_DEADLINE
+        self._changed_version: dict[int, int] = {}
+        self._removed_version: dict[int, int] = {}
+        self._history_floor = 0
+
+    @property
+    def interval(self) -> float:
+        return self._interval
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="printfleet2-status-poller", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def refresh(self) -> None:
+        self._schedule.reprobe()
+        self._wake.set()
+
+    def reprobe(self, printer_id: int) -> None:
+        self._schedule.reprobe(printer_id)
+        self._wake.set()
+
+    def note_plug_states(self, plug_states: dict[int, dict]) -> None:
+        if self._schedule.note_plug_states(plug_states):
+            self._wake.set()
+
+    def schedule(self) -> list[dict]:
+        return self._schedule.to_dicts()
+
+    def snapshot(self) -> StatusSnapshot:
+        with self._lock:
+            return self._snapshot_locked()
+
+    def _snapshot_locked(self) -> StatusSnapshot:
+        return StatusSnapshot(
+            self._version,
+            self._updated_at,
+            dict(self._statuses),
+            dict(self._fetched_at),
+            dict(self._changed_version),
+            dict(self._removed_version),
+            self._history_floor,
+        )
+
+    def _commit_changes_locked(self, changed_ids: set[int], removed_ids: set[int]) -> bool:
+        if not changed_ids and not removed_ids:
+            return False
+        self._version += 1
+        self._updated_at = time.time()
+        for printer_id in changed_ids:
+            self._changed_version[printer_id] = self._version
+            self._removed_version.pop(printer_id, None)
+        for printer_id in removed_ids:
+            self._changed_version.pop(printer_id, None)
+            self._removed_version[printer_id] = self._version
+        while len(self._removed_version) > STATUS_REMOVED_HISTORY:
+            oldest = min(self._removed_version, key=self._removed_version.__getitem__)
+            self._history_floor = max(self._history_floor, self._removed_version.pop(oldest))
+        return True
+
+    def add_push_source(self, source: PushSource) -> None:
+        self._push_sources.append(source)
+
+    def add_sample_sink(self, sink: Callable[[dict[int, dict]], object]) -> None:
+        self._sample_sinks.append(sink)
+
+    def _drain_samples(self) -> None:
+        with self._lock:
+            fresh = self._fresh
+            self._fresh = {}
+        for sink in self._sample_sinks:
             try:
-                energy_map[printer_id] = future.result()
+                sink(fresh)
             except Exception:
-                energy_map[printer_id] = {"power_w": None, "today_wh": None, "error": "error"}
-    return energy_map
+                logger.exception("Status sample sink failed")
+
+    def apply_push_status(self, printer_id: int, status: dict) -> bool:
+        with self._lock:
+            if printer_id not in self._printer_ids:
+                return False
+            changed = not _same_status(self._statuses.get(printer_id), status)
+            self._statuses[printer_id] = status
+            self._pushed_at[printer_id] = time.monotonic()
+            self._fetched_at[printer_id] = time.time()
+            self._fresh[printer_id] = status
+            if changed:
+                self._commit_changes_locked({printer_id}, set())
+        if changed:
+            _CHANGES.notify()
+        return True
+
+    def _apply_late_status(self, printer_id: int, status: dict) -> None:
+        with self._lock:
+            if printer_id not in self._printer_ids:
+                return
+            if self._pushed_at.get(printer_id, 0.0) > time.monotonic() - self._interval:
+                return
+            changed = not _same_status(self._statuses.get(printer_id), status)
+            self._statuses[printer_id] = status
+            if not status.get("stale"):
+                self._fetched_at[printer_id] = time.time()
+                self._fresh[printer_id] = status
+            if changed:
+                self._commit_changes_locked({printer_id}, set())
+        self._schedule.record(printer_id, status, self._interval, time.monotonic())
+        if changed:
+            _CHANGES.notify()
+
+    def poll_once(self) -> StatusSnapshot:
+        snapshots, interval = self._load_printers()
+        self._interval = interval
+        cycle_started = time.monotonic()
+        cycle_started_at = time.time()
+        with self._lock:
+            self._printer_ids = {printer.id for printer in snapshots}
+            self._pushed_at = {
+                printer_id: pushed_at
+                for printer_id, pushed_at in self._pushed_at.items()
+                if printer_id in self._printer_ids
+            }
+        pushed: set[int] = set()
+        for source in self._push_sources:
+            try:
+                source.sync(snapshots)
+                pushed |= source.connected_ids()
+            except Exception:
+                logger.exception("Status push sync failed")
+        self._schedule.prune(self._printer_ids)
+        due = [
+            printer
+            for printer in snapshots
+            if printer.id not in pushed and self._schedule.is_due(printer.id, cycle_started)
+        ]
+        status_map = (
+            run_coroutine(
+                _gather_by_id(
+                    due,
+                    lambda printer: _poll_printer_status(printer, self._schedule.is_powered_down(printer.id)),
+                    lambda exc: _status("Status error", "error", error_message=str(exc)),
+                    self._deadline,
+                    self._apply_late_status,
+                )
+            )
+            if due
+            else {}
+        )
+        late = {printer.id for printer in due if printer.id not in status_map}
+        polled_at = time.monotonic()
+        for printer in due:
+            if printer.id not in late:
+                self._schedule.record(printer.id, status_map.get(printer.id), interval, polled_at)
+        for printer_id in pushed:
+            self._schedule.record_push(printer_id, interval, polled_at)
+        with self._lock:
+            previous = self._statuses
+            pushed |= {
+                printer_id
+                for printer_id, pushed_at in self._pushed_at.items()
+                if pushed_at >= cycle_started and printer_id in previous
+            }
+            statuses: dict[int, dict] = {}
+            for printer in snapshots:
+                status = previous.get(printer.id)
+                if printer.id in status_map and printer.id not in pushed:
+                    status = status_map[printer.id]
+                    if not status.get("stale"):
+                        self._fetched_at[printer.id] = time.time()
+                        self._fresh[printer.id] = status
+                elif printer.id in late and self._fetched_at.get(printer.id, 0.0) < cycle_started_at:
+                    status = {**(status or _status("Unknown", "muted")), "stale": True}
+                statuses[printer.id] = status or _status("Unknown", "muted")
+            self._statuses = statuses
+            self._fetched_at = {
+                printer_id: fetched_at
+                for printer_id, fetched_at in self._fetched_at.items()
+                if printer_id in statuses
+            }
+            changed = self._commit_changes_locked(
+                {
+                    printer_id
+                    for printer_id, status in statuses.items()
+                    if not _same_status(previous.get(printer_id), status)
+                },
+                set(previous) - set(statuses),
+            )
+            self._fresh = {printer_id: status for printer_id, status in self._fresh.items() if printer_id in statuses}
+            snapshot = self._snapshot_locked()
+        if changed:
+            _CHANGES.notify()
+        self._drain_samples()
+        return snapshot
+
+    def _load_printers(self) -> tuple[list[PrinterSnapshot], float]:
+        with session_scope() as session:
+            settings = ensure_settings_row(session)
+            printers = [printer for printer in list_printers(session) if printer.enabled]
+            return build_printer_snapshots(printers), _resolve_poll_interval(settings.poll_interval)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                self.poll_once()
+            except Exception:
+                logger.exception("Status poll cycle failed")
+            now = time.monotonic()
+            next_due = self._schedule.next_due()
+            deadline = started + self._interval if next_due is None else min(next_due, started + self._interval)
+            remaining = max(deadline - now, POLL_DUE_SLACK)
+            self._wake.wait(remaining)
+            self._wake.clear()
+
+
+@dataclass(frozen=True)
+class PlugSnapshot:
+    version: int
+    updated_at: float | None
+    plugs: dict[int, dict] = field(default_factory=dict)
+    energy: dict[int, dict] = field(default_factory=dict)
+
+
+def _without_age(items: dict[int, dict]) -> dict[int, dict]:
+    return {key: {name: value for name, value in item.items() if name != "age_ms"} for key, item in items.items()}
+
+
+class PlugSampler:
+    def __init__(self, poller: StatusPoller) -> None:
+        self._poller = poller
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._version = 0
+        self._updated_at: float | None = None
+        self._plugs: dict[int, dict] = {}
+        self._energy: dict[int, dict] = {}
+        self._interval = DEFAULT_POLL_INTERVAL
+        self._samples: dict[int, dict] = {}
+        self._topics: dict[str, int] = {}
+        self._pushed_at: dict[int, float] = {}
+        self._reading_sinks: list[Callable[[dict[int, dict]], object]] = []
+        self.push_max_age = DEFAULT_PLUG_PUSH_MAX_AGE
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="printfleet2-plug-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def refresh(self) -> None:
+        self._wake.set()
+
+    def snapshot(self) -> PlugSnapshot:
+        with self._lock:
+            return PlugSnapshot(self._version, self._updated_at, dict(self._plugs), dict(self._energy))
+
+    def add_reading_sink(self, sink: Callable[[dict[int, dict]], object]) -> None:
+        self._reading_sinks.append(sink)
+
+    def topics(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._topics)
+
+    def expire_readings(self) -> None:
+        with self._lock:
+            self._pushed_at = {}
+        self._wake.set()
+
+    def apply_reading(self, printer_id: int, reading: dict) -> bool:
+        with self._lock:
+            sample = {**self._samples.get(printer_id, _plug_result("Plug unknown", "muted", "unavailable"))}
+            sample.pop("stale", None)
+            sample.pop("age_ms", None)
+            sample.update(reading)
+            self._samples[printer_id] = sample
+            self._pushed_at[printer_id] = time.monotonic()
+            plug = _plug_status_fields(sample)
+            energy = _plug_energy_fields(sample)
+            changed = plug != self._plugs.get(printer_id) or energy != self._energy.get(printer_id)
+            self._plugs[printer_id] = plug
+            self._energy[printer_id] = energy
+            if changed:
+                self._version += 1
+                self._updated_at = time.time()
+        self._poller.note_plug_states({printer_id: plug})
+        if changed:
+            _CHANGES.notify()
+        return changed
+
+    def sample_once(self) -> PlugSnapshot:
+        printers, interval = self._load_printers()
+        self._interval = interval
+        now = time.monotonic()
+        with self._lock:
+            self._topics = {printer.tasmota_topic: printer.id for printer in printers if printer.tasmota_topic}
+            ids = {printer.id for printer in printers}
+            self._pushed_at = {
+                printer_id: pushed_at
+                for printer_id, pushed_at in self._pushed_at.items()
+                if printer_id in ids and now - pushed_at <= self.push_max_age
+            }
+            pushed = {printer_id: self._samples[printer_id] for printer_id in self._pushed_at}
+        polled = [printer for printer in printers if printer.tasmota_host and printer.id not in pushed]
+        samples = run_coroutine(collect_plug_samples_async(polled)) if polled else {}
+        plugs = {printer_id: _plug_status_fields(sample) for printer_id, sample in samples.items()}
+        energy = {printer_id: _plug_energy_fields(sample) for printer_id, sample in samples.items()}
+        self._poller.note_plug_states(plugs)
+        with self._lock:
+            for printer_id in self._pushed_at:
+                samples[printer_id] = self._samples[printer_id]
+                plugs[printer_id] = self._plugs[printer_id]
+                energy[printer_id] = self._energy[printer_id]
+            changed = _without_age(plugs) != _without_age(self._plugs)
+            changed = changed or _without_age(energy) != _without_age(self._energy)
+            self._samples = samples
+            self._plugs = plugs
+            self._energy = energy
+            if changed:
+                self._version += 1
+                self._updated_at = time.time()
+            snapshot = PlugSnapshot(self._version, self._updated_at, dict(self._plugs), dict(self._energy))
+        if changed:
+            _CHANGES.notify()
+        for sink in self._reading_sinks:
+            try:
+                sink(snapshot.energy)
+            except Exception:
+                logger.exception("Plug reading sink failed")
+        return snapshot
+
+    def _load_printers(self) -> tuple[list[PrinterSnapshot], float]:
+        with session_scope() as session:
+            settings = ensure_settings_row(session)
+            printers = [printer for printer in list_printers(session) if printer.tasmota_host or printer.tasmota_topic]
+            interval = normalize_plug_poll_interval(settings.live_wall_plug_poll_interval) or DEFAULT_POLL_INTERVAL
+            return build_printer_snapshots(printers), interval
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                self.sample_once()
+            except Exception:
+                logger.exception("Plug sample cycle failed")
+            remaining = self._interval - (time.monotonic() - started)
+            if remaining > 0:
+                self._wake.wait(remaining)
+            self._wake.clear()
+
+
+_POLLER = StatusPoller()
+_PLUG_SAMPLER = PlugSampler(_POLLER)
+
+
+def get_status_poller() -> StatusPoller:
+    return _POLLER
+
+
+def start_status_poller() -> StatusPoller:
+    _POLLER.start()
+    return _POLLER
+
+
+def refresh_status_poller() -> None:
+    _POLLER.refresh()
+    _PLUG_SAMPLER.refresh()
+
+
+def start_plug_sampler() -> PlugSampler:
+    _PLUG_SAMPLER.start()
+    return _PLUG_SAMPLER
+
+
+def get_plug_sampler() -> PlugSampler:
+    return _PLUG_SAMPLER
+
+
+def get_plug_snapshot() -> PlugSnapshot:
+    return _PLUG_SAMPLER.snapshot()
+
+
+def get_plug_readings(printers: Iterable[Printer | PrinterSnapshot]) -> tuple[dict[int, dict], dict[int, dict]]:
+    snapshots = [
+        snapshot for snapshot in build_printer_snapshots(printers) if snapshot.tasmota_host or snapshot.tasmota_topic
+    ]
+    cached = _PLUG_SAMPLER.snapshot() if _PLUG_SAMPLER.running else PlugSnapshot(0, None)
+    plugs = {printer.id: cached.plugs[printer.id] for printer in snapshots if printer.id in cached.plugs}
+    energy = {printer.id: cached.energy[printer.id] for printer in snapshots if printer.id in cached.energy}
+    missing = [printer for printer in snapshots if printer.id not in plugs]
+    if missing:
+        for printer_id, sample in run_coroutine(collect_plug_samples_async(missing)).items():
+            plugs[printer_id] = _plug_status_fields(sample)
+            energy[printer_id] = _plug_energy_fields(sample)
+    return plugs, energy
+
+
+def status_change_sequence() -> int:
+    return _CHANGES.sequence
+
+
+def wait_for_status_change(sequence: int, timeout: float) -> int:
+    return _CHANGES.wait(sequence, timeout)
+
+
+def reprobe_printer(printer_id: int) -> None:
+    _POLLER.reprobe(printer_id)
+
+
+def note_plug_states(plug_states: dict[int, dict]) -> None:
+    _POLLER.note_plug_states(plug_states)
+
+
+def get_poll_schedule() -> list[dict]:
+    return _POLLER.schedule()
+
+
+def get_status_snapshot() -> StatusSnapshot:
+    return _POLLER.snapshot()
+
+
+def get_cached_statuses_by_id(printer_ids: Iterable[int] | None = None) -> dict[int, dict]:
+    snapshot = _POLLER.snapshot()
+    now = time.time()
+    statuses = {}
+    for printer_id in snapshot.statuses if printer_ids is None else printer_ids:
+        status = snapshot.statuses.get(printer_id)
+        if status is None:
+            continue
+        fetched_at = snapshot.fetched_at.get(printer_id)
+        age_ms = int(max(0.0, now - fetched_at) * 1000) if fetched_at is not None else status.get("age_ms")
+        statuses[printer_id] = {**status, "stale": bool(status.get("stale")), "age_ms": age_ms}
+    return statuses
+
+
+def get_cached_statuses(printers: Iterable[Printer | PrinterSnapshot]) -> dict[int, dict]:
+    snapshots = build_printer_snapshots(printers)
+    statuses = get_cached_statuses_by_id(printer.id for printer in snapshots) if _POLLER.running else {}
+    missing = [printer for printer in snapshots if printer.id not in statuses]
+    if missing:
+        for printer_id, status in collect_printer_statuses(missing).items():
+            statuses[printer_id] = {**status, "stale": bool(status.get("stale")), "age_ms": 0}
+    return statuses
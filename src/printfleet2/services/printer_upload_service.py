@@ -1,33 +1,100 @@
+import hashlib
 import json
 import mimetypes
-import ssl
-import urllib.error
-import urllib.request
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import BinaryIO, Callable
 from uuid import uuid4
 
 from printfleet2.models.printer import Printer
+from printfleet2.services.async_http_service import FileBody, http_request, run_coroutine
 
 
 DEFAULT_UPLOAD_TIMEOUT = 120
 USER_AGENT = "PrintFleet2 Upload"
+SPOOL_CHUNK_SIZE = 1024 * 1024
+
+_SPOOL_DIR: Path | None = None
+
+
+def configure_upload_spool(path: str | Path | None) -> None:
+    global _SPOOL_DIR
+    _SPOOL_DIR = Path(path) if path else None
+
+
+def _spool_file() -> BinaryIO:
+    directory = None
+    if _SPOOL_DIR is not None:
+        _SPOOL_DIR.mkdir(parents=True, exist_ok=True)
+        directory = str(_SPOOL_DIR)
+    return tempfile.NamedTemporaryFile(prefix="upload-", suffix=".part", dir=directory, delete=False)
+
+
+def spool_upload(stream: BinaryIO) -> tuple[str, int, str]:
+    digest = hashlib.sha256()
+    handle = _spool_file()
+    try:
+        with handle:
+            while True:
+                chunk = stream.read(SPOOL_CHUNK_SIZE)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                handle.write(chunk)
+            size = handle.tell()
+    except BaseException:
+        discard_spooled_upload(handle.name)
+        raise
+    return handle.name, size, digest.hexdigest()
+
+
+def spool_existing_file(source: str | Path) -> str:
+    handle = _spool_file()
+    handle.close()
+    try:
+        os.unlink(handle.name)
+        try:
+            os.link(source, handle.name)
+        except OSError:
+            shutil.copyfile(source, handle.name)
+    except BaseException:
+        discard_spooled_upload(handle.name)
+        raise
+    return handle.name
+
+
+def discard_spooled_upload(path: str | None) -> None:
+    if not path:
+        return
+    try:
+        os.remove(path)
+    except OSError:
+        pass
 
 
 def upload_and_print(
     printer: Printer,
     filename: str,
-    content: bytes,
+    path: str,
     upload_timeout: int | float | None = None,
+    progress: Callable[[int], object] | None = None,
 ) -> tuple[bool, str]:
     backend = (printer.backend or "").strip().lower()
     if backend == "octoprint":
-        return _upload_octoprint(printer, filename, content, upload_timeout)
+        return _upload_octoprint(printer, filename, path, upload_timeout, progress)
     if backend == "moonraker":
-        return _upload_moonraker(printer, filename, content, upload_timeout)
+        return _upload_moonraker(printer, filename, path, upload_timeout, progress)
     return False, "unsupported_backend"
 
 
 def _upload_octoprint(
-    printer: Printer, filename: str, content: bytes, upload_timeout: int | float | None
+    printer: Printer,
+    filename: str,
+    path: str,
+    upload_timeout: int | float | None,
+    progress: Callable[[int], object] | None,
 ) -> tuple[bool, str]:
     if not printer.api_key:
         return False, "api_key_missing"
@@ -38,8 +105,9 @@ def _upload_octoprint(
         headers={"User-Agent": USER_AGENT, "X-Api-Key": printer.api_key},
         fields=fields,
         filename=filename,
-        content=content,
+        path=path,
         timeout=upload_timeout,
+        progress=progress,
     )
     if _is_success_status(status):
         return True, "ok"
@@ -50,7 +118,11 @@ def _upload_octoprint(
 
 
 def _upload_moonraker(
-    printer: Printer, filename: str, content: bytes, upload_timeout: int | float | None
+    printer: Printer,
+    filename: str,
+    path: str,
+    upload_timeout: int | float | None,
+    progress: Callable[[int], object] | None,
 ) -> tuple[bool, str]:
     url = f"{_printer_base_url(printer)}/server/files/upload"
     headers = {"User-Agent": USER_AGENT}
@@ -63,8 +135,9 @@ def _upload_moonraker(
         headers=headers,
         fields=fields,
         filename=filename,
-        content=content,
+        path=path,
         timeout=upload_timeout,
+        progress=progress,
     )
     if _is_success_status(status):
         return True, "ok"
@@ -79,25 +152,21 @@ def _post_multipart(
     headers: dict,
     fields: dict,
     filename: str,
-    content: bytes,
+    path: str,
     timeout: int | float | None,
+    progress: Callable[[int], object] | None = None,
 ) -> tuple[int | None, bytes | None]:
     boundary = uuid4().hex
-    body = _encode_multipart(fields, filename, content, boundary)
+    prefix, suffix = _multipart_envelope(fields, filename, boundary)
+    body = FileBody(path, prefix, suffix, progress=progress)
     request_headers = {
         **headers,
         "Content-Type": f"multipart/form-data; boundary={boundary}",
-        "Content-Length": str(len(body)),
     }
-    request = urllib.request.Request(url, data=body, headers=request_headers, method="POST")
     try:
-        context = ssl._create_unverified_context() if url.startswith("https://") else None
-        with urllib.request.urlopen(
-            request, timeout=_resolve_timeout(timeout), context=context
-        ) as response:
-            return response.status, response.read()
-    except urllib.error.HTTPError as exc:
-        return exc.code, exc.read()
+        return run_coroutine(
+            http_request("POST", url, request_headers, body=body, timeout=_resolve_timeout(timeout))
+        )
     except Exception:
         return None, None
 
@@ -118,7 +187,7 @@ def _resolve_timeout(timeout: int | float | None) -> float:
     return parsed
 
 
-def _encode_multipart(fields: dict, filename: str, content: bytes, boundary: str) -> bytes:
+def _multipart_envelope(fields: dict, filename: str, boundary: str) -> tuple[bytes, bytes]:
     mime_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
     parts: list[bytes] = []
     for name, value in fields.items():
@@ -132,10 +201,7 @@ def _encode_multipart(fields: dict, filename: str, content: bytes, boundary: str
         f'Content-Disposition: form-data; name="file"; filename="{safe_name}"\r\n'.encode("utf-8")
     )
     parts.append(f"Content-Type: {mime_type}\r\n\r\n".encode("utf-8"))
-    parts.append(content)
-    parts.append(b"\r\n")
-    parts.append(f"--{boundary}--\r\n".encode("utf-8"))
-    return b"".join(parts)
+    return b"".join(parts), f"\r\n--{boundary}--\r\n".encode("utf-8")
 
 
 def _extract_error(payload: bytes | None) -> str | None:
@@ -0,0 +1,277 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+from sqlalchemy import insert, inspect, text
+from sqlalchemy.orm import Session
+
+from printfleet2.db.session import session_scope
+from printfleet2.models.printer_event import PrinterEvent
+from printfleet2.services.printer_status_service import get_status_poller
+
+
+EVENT_TYPES = ("job_started", "job_completed", "job_cancelled", "error", "went_offline", "came_online")
+JOB_END_EVENTS = {"job_completed", "job_cancelled", "error"}
+EVENT_BATCH_SIZE = 100
+EVENT_FLUSH_INTERVAL = 10.0
+MAX_BUFFERED_EVENTS = 10000
+COMPLETE_PROGRESS = 99.5
+UNKNOWN_LABELS = {
+    "unknown",
+    "status error",
+    "auth required",
+    "api key missing",
+    "api key invalid",
+    "scanning off",
+    "unsupported",
+}
+
+logger = logging.getLogger(__name__)
+
+
+def ensure_printer_event_schema(session: Session) -> None:
+    engine = session.get_bind()
+    inspector = inspect(engine)
+    try:
+        if "printer_events" in inspector.get_table_names():
+            return
+    except Exception:
+        return
+    try:
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    "CREATE TABLE printer_events ("
+                    "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                    "ts REAL NOT NULL, "
+                    "printer_id INTEGER NOT NULL, "
+                    "event_type VARCHAR NOT NULL, "
+                    "job_name VARCHAR, "
+                    "progress REAL, "
+                    "message TEXT"
+                    ")"
+                )
+            )
+            conn.execute(text("CREATE INDEX ix_printer_events_ts ON printer_events (ts)"))
+            conn.execute(text("CREATE INDEX ix_printer_events_printer_id ON printer_events (printer_id)"))
+    except Exception:
+        return
+
+
+def is_active_job_label(label: str | None) -> bool:
+    if not label:
+        return False
+    lowered = str(label).lower()
+    return any(token in lowered for token in ("printing", "paused", "pausing", "resuming"))
+
+
+@dataclass
+class PrinterLifecycle:
+    online: bool = True
+    error: bool = False
+    job: str | None = None
+    progress: float | None = None
+
+
+def _job_end_type(label: str, progress: float | None) -> str:
+    if label == "cancelled":
+        return "job_cancelled"
+    if label == "complete" or (progress is not None and progress >= COMPLETE_PROGRESS):
+        return "job_completed"
+    return "job_cancelled"
+
+
+def derive_events(
+    state: PrinterLifecycle | None,
+    status: dict,
+) -> tuple[PrinterLifecycle | None, list[tuple[str, str | None, float | None, str | None]]]:
+    label = str(status.get("label") or "").strip().lower()
+    if not label or label in UNKNOWN_LABELS:
+        return state, []
+    active = is_active_job_label(label)
+    job_name = str(status.get("job_name") or "").strip()
+    progress = status.get("progress")
+    if state is None:
+        return (
+            PrinterLifecycle(
+                online=label != "offline",
+                error=label == "error",
+                job=job_name if active else None,
+                progress=progress if active else None,
+            ),
+            [],
+        )
+    events = []
+    if label == "offline":
+        if state.online:
+            state.online = False
+            events.append(("went_offline", state.job or None, state.progress, None))
+        return state, events
+    if not state.online:
+        state.online = True
+        events.append(("came_online", None, None, None))
+    error = label == "error"
+    if error and not state.error:
+        events.append(("error", state.job or None, state.progress, status.get("error_message")))
+        state.job = None
+    state.error = error
+    if error:
+        return state, events
+    if state.job is not None:
+        if not active:
+            events.append((_job_end_type(label, state.progress), state.job or None, state.progress, None))
+            state.job = None
+        elif job_name and state.job and job_name != state.job:
+            events.append((_job_end_type("", state.progress), state.job, state.progress, None))
+            state.job = None
+        elif job_name:
+            state.job = job_name
+    if active:
+        if state.job is None:
+            events.append(("job_started", job_name or None, progress, None))
+            state.job = job_name
+        if progress is not None:
+            state.progress = progress
+    else:
+        state.progress = None
+    return state, events
+
+
+class StatusEventBus:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._states: dict[int, PrinterLifecycle] = {}
+        self._pending: list[dict] = []
+        self._subscribers: list[Callable[[list[dict]], object]] = []
+        self._flushed_at = time.monotonic()
+        self.emitted = 0
+        self.persisted = 0
+        self.dropped = 0
+
+    def subscribe(self, callback: Callable[[list[dict]], object]) -> None:
+        self._subscribers.append(callback)
+
+    def process(self, samples: dict[int, dict], now: float | None = None) -> list[dict]:
+        now = time.time() if now is None else now
+        events = []
+        with self._lock:
+            for printer_id, status in samples.items():
+                if status.get("stale"):
+                    continue
+                state, derived = derive_events(self._states.get(printer_id), status)
+                if state is not None:
+                    self._states[printer_id] = state
+                for event_type, job_name, progress, message in derived:
+                    events.append(
+                        {
+                            "ts": now,
+                            "printer_id": printer_id,
+                            "type": event_type,
+                            "job_name": job_name,
+                            "progress": progress,
+                            "message": message,
+                        }
+                    )
+            self._pending.extend(events)
+            self._trim_pending_locked()
+            self.emitted += len(events)
+        if events:
+            for callback in self._subscribers:
+                try:
+                    callback(events)
+                except Exception:
+                    logger.exception("Status event subscriber failed")
+        self.flush()
+        return events
+
+    def _trim_pending_locked(self) -> None:
+        excess = len(self._pending) - MAX_BUFFERED_EVENTS
+        if excess > 0:
+            del self._pending[:excess]
+            self.dropped += excess
+
+    def flush(self, force: bool = False) -> int:
+        with self._lock:
+            if not self._pending:
+                return 0
+            due = len(self._pending) >= EVENT_BATCH_SIZE or time.monotonic() - self._flushed_at >= EVENT_FLUSH_INTERVAL
+            if not force and not due:
+                return 0
+            rows = self._pending
+            self._pending = []
+            self._flushed_at = time.monotonic()
+        try:
+            with session_scope() as session:
+                ensure_printer_event_schema(session)
+                session.execute(
+                    insert(PrinterEvent),
+                    [
+                        {
+                            "ts": row["ts"],
+                            "printer_id": row["printer_id"],
+                            "event_type": row["type"],
+                            "job_name": row["job_name"],
+                            "progress": row["progress"],
+                            "message": row["message"],
+                        }
+                        for row in rows
+                    ],
+                )
+        except Exception:
+            with self._lock:
+                self._pending[:0] = rows
+                self._trim_pending_locked()
+            raise
+        with self._lock:
+            self.persisted += len(rows)
+        return len(rows)
+
+
+def list_printer_events(
+    session: Session,
+    since_id: int = 0,
+    printer_id: int | None = None,
+    event_type: str | None = None,
+    limit: int = 200,
+) -> list[PrinterEvent]:
+    ensure_printer_event_schema(session)
+    query = session.query(PrinterEvent).filter(PrinterEvent.id > since_id)
+    if printer_id is not None:
+        query = query.filter(PrinterEvent.printer_id == printer_id)
+    if event_type is not None:
+        query = query.filter(PrinterEvent.event_type == event_type)
+    return query.order_by(PrinterEvent.id).limit(limit).all()
+
+
+def printer_event_to_dict(event: PrinterEvent) -> dict:
+    return {
+        "id": event.id,
+        "ts": event.ts,
+        "printer_id": event.printer_id,
+        "type": event.event_type,
+        "job_name": event.job_name,
+        "progress": event.progress,
+        "message": event.message,
+    }
+
+
+_BUS = StatusEventBus()
+_STARTED = False
+
+
+def get_status_event_bus() -> StatusEventBus:
+    return _BUS
+
+
+def flush_status_events(force: bool = False) -> int:
+    return _BUS.flush(force)
+
+
+def start_status_events() -> StatusEventBus:
+    global _STARTED
+    if not _STARTED:
+        _STARTED = True
+        get_status_poller().add_sample_sink(_BUS.process)
+    return _BUS
@@ -0,0 +1,194 @@
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+
+from printfleet2.services.printer_status_service import DEFAULT_POLL_INTERVAL, get_status_poller, get_status_snapshot
+
+
+HISTORY_FIELDS = ("temp_hotend", "temp_bed", "target_hotend", "target_bed", "progress")
+HISTORY_SCALES = {"temp_hotend": 10, "temp_bed": 10, "target_hotend": 10, "target_bed": 10, "progress": 100}
+HISTORY_SECONDS = 24 * 3600
+DEFAULT_HISTORY_SLOTS = int(HISTORY_SECONDS / DEFAULT_POLL_INTERVAL)
+MISSING_VALUE = -32768
+SLOT_BYTES = array("I").itemsize + array("h").itemsize * len(HISTORY_FIELDS)
+DEFAULT_HISTORY_POINTS = 500
+MAX_HISTORY_POINTS = 5000
+DOWNSAMPLE_METHODS = {"lttb", "minmax"}
+PRUNE_INTERVAL = 60.0
+
+
+def _encode(value: object, scale: int) -> int:
+    try:
+        scaled = int(round(float(value) * scale))
+    except (TypeError, ValueError):
+        return MISSING_VALUE
+    return max(MISSING_VALUE + 1, min(32767, scaled))
+
+
+class StatusRing:
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self._ts = array("I", bytes(array("I").itemsize * capacity))
+        self._values = {name: array("h", [MISSING_VALUE]) * capacity for name in HISTORY_FIELDS}
+        self._head = 0
+        self._count = 0
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def memory_bytes(self) -> int:
+        return self.capacity * SLOT_BYTES
+
+    def append(self, ts: float, status: dict) -> bool:
+        second = int(ts)
+        if self._count and second <= self._ts[(self._head - 1) % self.capacity]:
+            return False
+        self._ts[self._head] = second
+        for name in HISTORY_FIELDS:
+            self._values[name][self._head] = _encode(status.get(name), HISTORY_SCALES[name])
+        self._head = (self._head + 1) % self.capacity
+        self._count = min(self.capacity, self._count + 1)
+        return True
+
+    def window(self, start_ts: float, end_ts: float) -> tuple[list[int], dict[str, list[float | None]]]:
+        first = (self._head - self._count) % self.capacity
+        order = [(first + offset) % self.capacity for offset in range(self._count)]
+        timestamps = [self._ts[index] for index in order]
+        low = bisect_left(timestamps, start_ts)
+        high = bisect_right(timestamps, end_ts)
+        order = order[low:high]
+        series = {}
+        for name in HISTORY_FIELDS:
+            values = self._values[name]
+            scale = HISTORY_SCALES[name]
+            series[name] = [None if values[index] == MISSING_VALUE else values[index] / scale for index in order]
+        return timestamps[low:high], series
+
+
+def downsample_minmax(points: list[tuple[int, float]], threshold: int) -> list[tuple[int, float]]:
+    if threshold <= 0 or len(points) <= threshold:
+        return points
+    buckets = max(1, threshold // 2)
+    size = len(points) / buckets
+    sampled = []
+    for bucket in range(buckets):
+        chunk = points[int(bucket * size) : int((bucket + 1) * size)]
+        if not chunk:
+            continue
+        low = min(range(len(chunk)), key=lambda index: chunk[index][1])
+        high = max(range(len(chunk)), key=lambda index: chunk[index][1])
+        for index in sorted({low, high}):
+            sampled.append(chunk[index])
+    return sampled
+
+
+def downsample_lttb(points: list[tuple[int, float]], threshold: int) -> list[tuple[int, float]]:
+    if threshold <= 2 or len(points) <= threshold:
+        return points
+    sampled = [points[0]]
+    size = (len(points) - 2) / (threshold - 2)
+    previous = 0
+    for bucket in range(threshold - 2):
+        start = int(bucket * size) + 1
+        end = int((bucket + 1) * size) + 1
+        next_end = min(len(points), int((bucket + 2) * size) + 1)
+        following = points[end:next_end] or [points[-1]]
+        avg_t = sum(point[0] for point in following) / len(following)
+        avg_v = sum(point[1] for point in following) / len(following)
+        anchor_t, anchor_v = points[previous]
+        best = start
+        best_area = -1.0
+        for index in range(start, end):
+            t, v = points[index]
+            area = abs((anchor_t - avg_t) * (v - anchor_v) - (anchor_t - t) * (avg_v - anchor_v))
+            if area > best_area:
+                best_area = area
+                best = index
+        sampled.append(points[best])
+        previous = best
+    sampled.append(points[-1])
+    return sampled
+
+
+DOWNSAMPLERS = {"lttb": downsample_lttb, "minmax": downsample_minmax}
+
+
+class StatusHistory:
+    def __init__(self, capacity: int = DEFAULT_HISTORY_SLOTS) -> None:
+        self.capacity = max(1, capacity)
+        self._lock = threading.Lock()
+        self._rings: dict[int, StatusRing] = {}
+        self._pruned_at = time.monotonic()
+
+    def record(self, samples: dict[int, dict], now: float | None = None) -> None:
+        now = time.time() if now is None else now
+        with self._lock:
+            for printer_id, status in samples.items():
+                if status.get("stale"):
+                    continue
+                ring = self._rings.get(printer_id)
+                if ring is None:
+                    ring = self._rings[printer_id] = StatusRing(self.capacity)
+                ring.append(now, status)
+        if time.monotonic() - self._pruned_at >= PRUNE_INTERVAL:
+            self.prune(set(get_status_snapshot().statuses))
+
+    def prune(self, printer_ids: set[int]) -> None:
+        with self._lock:
+            self._pruned_at = time.monotonic()
+            for printer_id in list(self._rings):
+                if printer_id not in printer_ids:
+                    del self._rings[printer_id]
+
+    def memory_bytes(self) -> int:
+        with self._lock:
+            return sum(ring.memory_bytes for ring in self._rings.values())
+
+    def query(
+        self,
+        printer_id: int,
+        start_ts: float,
+        end_ts: float,
+        points: int = DEFAULT_HISTORY_POINTS,
+        method: str = "lttb",
+    ) -> dict:
+        with self._lock:
+            ring = self._rings.get(printer_id)
+            timestamps, values = ring.window(start_ts, end_ts) if ring is not None else ([], {})
+        downsample = DOWNSAMPLERS[method]
+        series = {}
+        for name in HISTORY_FIELDS:
+            column = values.get(name, [])
+            samples = [(ts, value) for ts, value in zip(timestamps, column) if value is not None]
+            series[name] = [[ts, value] for ts, value in downsample(samples, points)]
+        return {
+            "from": start_ts,
+            "to": end_ts,
+            "points": points,
+            "method": method,
+            "samples": len(timestamps),
+            "capacity": self.capacity,
+            "memory_bytes": self.capacity * SLOT_BYTES,
+            "series": series,
+        }
+
+
+_HISTORY = StatusHistory()
+_STARTED = False
+
+
+def get_status_history() -> StatusHistory:
+    return _HISTORY
+
+
+def start_status_history(capacity: int = DEFAULT_HISTORY_SLOTS) -> StatusHistory:
+    global _HISTORY, _STARTED
+    if not _STARTED:
+        _STARTED = True
+        if capacity != _HISTORY.capacity:
+            _HISTORY = StatusHistory(capacity)
+        get_status_poller().add_sample_sink(_HISTORY.record)
+    return _HISTORY
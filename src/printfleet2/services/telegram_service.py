@@ -0,0 +1,263 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import deque
+
+from printfleet2.db.session import session_scope
+from printfleet2.services.async_http_service import get_event_loop, http_request, submit_coroutine
+from printfleet2.services.print_accounting_service import get_fleet_summary
+from printfleet2.services.settings_service import ensure_settings_row
+from printfleet2.services.status_event_service import EVENT_TYPES, get_status_event_bus
+
+
+DEFAULT_TELEGRAM_API_URL = "https://api.telegram.org"
+DEFAULT_TELEGRAM_EVENTS = ("job_started", "job_completed", "job_cancelled", "error", "went_offline")
+MAX_QUEUED_EVENTS = 500
+COALESCE_SECONDS = 3.0
+CHAT_MIN_INTERVAL = 3.0
+SEND_TIMEOUT = 10.0
+MAX_SEND_ATTEMPTS = 5
+RETRY_MIN_DELAY = 2.0
+RETRY_MAX_DELAY = 60.0
+MAX_MESSAGE_LENGTH = 4096
+EVENT_VERBS = {
+    "job_started": "started printing",
+    "job_completed": "finished printing",
+    "job_cancelled": "cancelled printing",
+    "error": "reported an error",
+    "went_offline": "went offline",
+    "came_online": "came back online",
+}
+
+logger = logging.getLogger(__name__)
+
+
+def parse_event_types(value: str | None) -> tuple[str, ...]:
+    if not value:
+        return DEFAULT_TELEGRAM_EVENTS
+    types = tuple(item.strip() for item in value.split(",") if item.strip() in EVENT_TYPES)
+    return types or DEFAULT_TELEGRAM_EVENTS
+
+
+def _event_detail(event: dict) -> str:
+    detail = event.get("job_name") or ""
+    if event.get("type") == "error" and event.get("message"):
+        detail = f"{detail}: {event['message']}" if detail else str(event["message"])
+    return detail
+
+
+def format_events(events: list[dict], names: dict[int, str]) -> str:
+    groups: dict[str, list[dict]] = {}
+    for event in events:
+        groups.setdefault(event["type"], []).append(event)
+    lines = []
+    for event_type in EVENT_TYPES:
+        group = groups.get(event_type)
+        if not group:
+            continue
+        verb = EVENT_VERBS[event_type]
+        labels = []
+        for event in group:
+            name = names.get(event["printer_id"]) or f"Printer {event['printer_id']}"
+            detail = _event_detail(event)
+            labels.append(f"{name} ({detail})" if detail else name)
+        if len(group) == 1:
+            lines.append(f"{labels[0]} {verb}")
+        else:
+            lines.append(f"{len(group)} printers {verb}: {', '.join(labels)}")
+    text = "\n".join(lines)
+    if len(text) > MAX_MESSAGE_LENGTH:
+        text = text[: MAX_MESSAGE_LENGTH - 3] + "..."
+    return text
+
+
+class TelegramSendError(Exception):
+    def __init__(self, message: str, retry_after: float | None = None, permanent: bool = False) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.permanent = permanent
+
+
+class TelegramNotifier:
+    def __init__(
+        self,
+        token: str,
+        chat_id: str | None = None,
+        api_url: str = DEFAULT_TELEGRAM_API_URL,
+        event_types: tuple[str, ...] = DEFAULT_TELEGRAM_EVENTS,
+    ) -> None:
+        self.api_url = api_url.rstrip("/")
+        self.event_types = set(event_types)
+        self.sent = 0
+        self.failed = 0
+        self.retries = 0
+        self.dropped = 0
+        self.last_error: str | None = None
+        self.last_sent_at: float | None = None
+        self._token = token
+        self._chat_id = chat_id
+        self._lock = threading.Lock()
+        self._queue: deque[dict] = deque()
+        self._wakeup: asyncio.Event | None = None
+        self._next_send: dict[str, float] = {}
+        self._future = None
+
+    def start(self) -> None:
+        if self._future is None or self._future.done():
+            self._future = submit_coroutine(self._run())
+
+    def stop(self) -> None:
+        if self._future is not None:
+            self._future.cancel()
+            self._future = None
+
+    def enqueue(self, events: list[dict]) -> None:
+        wanted = [event for event in events if event.get("type") in self.event_types or event.get("type") == "test"]
+        if not wanted:
+            return
+        with self._lock:
+            for event in wanted:
+                if len(self._queue) >= MAX_QUEUED_EVENTS:
+                    self._queue.popleft()
+                    self.dropped += 1
+                self._queue.append(event)
+        if self._wakeup is not None:
+            get_event_loop().call_soon_threadsafe(self._wakeup.set)
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            queued = len(self._queue)
+        return {
+            "api_url": self.api_url,
+            "running": self._future is not None and not self._future.done(),
+            "events": sorted(self.event_types),
+            "queued": queued,
+            "sent": self.sent,
+            "failed": self.failed,
+            "retries": self.retries,
+            "dropped": self.dropped,
+            "last_sent_at": self.last_sent_at,
+            "last_error": self.last_error,
+        }
+
+    def _recipients(self) -> tuple[list[str], dict[int, str]]:
+        value = None
+        try:
+            with session_scope() as session:
+                value = ensure_settings_row(session).telegram_chat_id
+        except Exception:
+            value = None
+        value = (value or "").strip() or (self._chat_id or "")
+        chat_ids = [chat.strip() for chat in value.split(",") if chat.strip()]
+        return chat_ids, dict(get_fleet_summary().printers)
+
+    def _drain(self) -> list[dict]:
+        with self._lock:
+            events = list(self._queue)
+            self._queue.clear()
+        return events
+
+    async def _run(self) -> None:
+        self._wakeup = asyncio.Event()
+        while True:
+            if not self._queue:
+                await self._wakeup.wait()
+            self._wakeup.clear()
+            await asyncio.sleep(COALESCE_SECONDS)
+            events = self._drain()
+            if not events:
+                continue
+            try:
+                await self._dispatch(events)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                self.failed += 1
+                self.last_error = str(exc) or exc.__class__.__name__
+                logger.exception("Telegram dispatch failed")
+
+    async def _dispatch(self, events: list[dict]) -> None:
+        chat_ids, names = await asyncio.to_thread(self._recipients)
+        if not chat_ids:
+            self.dropped += len(events)
+            self.last_error = "no chat id configured"
+            return
+        tests = [event for event in events if event.get("type") == "test"]
+        texts = [str(event.get("message") or "PrintFleet2 test message") for event in tests]
+        lifecycle = [event for event in events if event.get("type") != "test"]
+        if lifecycle:
+            texts.append(format_events(lifecycle, names))
+        await asyncio.gather(*(self._send_chat(chat_id, "\n".join(texts)) for chat_id in chat_ids))
+
+    async def _send_chat(self, chat_id: str, text: str) -> None:
+        delay = RETRY_MIN_DELAY
+        for attempt in range(1, MAX_SEND_ATTEMPTS + 1):
+            wait = self._next_send.get(chat_id, 0.0) - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._next_send[chat_id] = time.monotonic() + CHAT_MIN_INTERVAL
+            try:
+                await self._send(chat_id, text)
+            except TelegramSendError as exc:
+                self.last_error = str(exc)
+                if exc.permanent or attempt == MAX_SEND_ATTEMPTS:
+                    self.failed += 1
+                    return
+                self.retries += 1
+                await asyncio.sleep(exc.retry_after if exc.retry_after is not None else delay)
+                delay = min(RETRY_MAX_DELAY, delay * 2)
+                continue
+            self.sent += 1
+            self.last_sent_at = time.time()
+            return
+
+    async def _send(self, chat_id: str, text: str) -> None:
+        body = json.dumps({"chat_id": chat_id, "text": text, "disable_web_page_preview": True}).encode("utf-8")
+        url = f"{self.api_url}/bot{self._token}/sendMessage"
+        try:
+            status, raw = await http_request(
+                "POST",
+                url,
+                {"Content-Type": "application/json"},
+                body=body,
+                timeout=SEND_TIMEOUT,
+                max_bytes=65536,
+            )
+        except Exception as exc:
+            raise TelegramSendError(str(exc) or exc.__class__.__name__) from exc
+        if status < 300:
+            return
+        try:
+            payload = json.loads(raw.decode("utf-8", errors="ignore"))
+        except ValueError:
+            payload = {}
+        description = payload.get("description") if isinstance(payload, dict) else None
+        parameters = payload.get("parameters") if isinstance(payload, dict) else None
+        retry_after = parameters.get("retry_after") if isinstance(parameters, dict) else None
+        message = f"HTTP {status}: {description}" if description else f"HTTP {status}"
+        if status == 429:
+            raise TelegramSendError(message, float(retry_after) if retry_after is not None else None)
+        raise TelegramSendError(message, permanent=400 <= status < 500)
+
+
+_NOTIFIER: TelegramNotifier | None = None
+
+
+def start_telegram_notifier(
+    token: str,
+    chat_id: str | None = None,
+    api_url: str = DEFAULT_TELEGRAM_API_URL,
+    event_types: tuple[str, ...] = DEFAULT_TELEGRAM_EVENTS,
+) -> TelegramNotifier:
+    global _NOTIFIER
+    if _NOTIFIER is None:
+        _NOTIFIER = TelegramNotifier(token, chat_id, api_url, event_types)
+        get_status_event_bus().subscribe(_NOTIFIER.enqueue)
+        _NOTIFIER.start()
+    return _NOTIFIER
+
+
+def get_telegram_notifier() -> TelegramNotifier | None:
+    return _NOTIFIER
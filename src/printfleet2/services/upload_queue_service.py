@@ -0,0 +1,317 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from uuid import uuid4
+
+from printfleet2.db.session import session_scope
+from printfleet2.models.printer import Printer
+from printfleet2.services.gcode_analysis_service import get_cached_gcode_metadata
+from printfleet2.services.print_accounting_service import (
+    discard_pending_upload,
+    is_active_job_label,
+    job_name_matches,
+    record_pending_upload,
+)
+from printfleet2.services.print_job_service import create_print_job
+from printfleet2.services.printer_group_service import get_printer_group
+from printfleet2.services.printer_service import get_printer
+from printfleet2.services.printer_status_service import ChangeNotifier, collect_printer_statuses
+from printfleet2.services.printer_upload_service import discard_spooled_upload, upload_and_print
+from printfleet2.services.settings_service import ensure_settings_row
+
+
+DEFAULT_UPLOAD_WORKERS = 20
+UPLOAD_STATES = ("queued", "uploading", "confirming", "completed", "failed")
+FINISHED_STATES = {"completed", "failed"}
+FINISHED_JOB_TTL = 3600.0
+MAX_FINISHED_JOBS = 200
+PROGRESS_NOTIFY_INTERVAL = 0.25
+UPLOAD_ERROR_MESSAGES = {
+    "api_key_missing": "API key missing for this printer.",
+    "api_key_invalid": "API key invalid for this printer.",
+    "auth_required": "Printer authentication required.",
+    "unsupported_backend": "Unsupported backend for upload.",
+    "upload_failed": "Upload failed.",
+}
+
+logger = logging.getLogger(__name__)
+
+
+def confirm_print_started(printer: Printer, filename: str, attempts: int = 5, delay: float = 1.0) -> bool:
+    for idx in range(max(1, attempts)):
+        status_map = collect_printer_statuses([printer], include_plug=False)
+        status = status_map.get(printer.id, {})
+        label = status.get("label")
+        job_name = str(status.get("job_name") or "").strip()
+        if job_name:
+            if job_name_matches(filename, job_name):
+                return True
+        elif is_active_job_label(label):
+            return True
+        if idx < attempts - 1:
+            time.sleep(delay)
+    return False
+
+
+@dataclass
+class UploadJob:
+    printer_id: int
+    printer_name: str
+    filename: str
+    path: str
+    size: int
+    print_via: str
+    username: str
+    batch_id: str = ""
+    sha256: str | None = None
+    id: str = field(default_factory=lambda: uuid4().hex)
+    state: str = "queued"
+    bytes_sent: int = 0
+    error: str | None = None
+    estimated_time_s: int | None = None
+    created_at: float = field(default_factory=time.time)
+    started_at: float | None = None
+    finished_at: float | None = None
+
+    def to_dict(self, now: float | None = None) -> dict:
+        now = time.time() if now is None else now
+        throughput = None
+        eta = None
+        if self.started_at is not None and self.bytes_sent:
+            elapsed = (self.finished_at or now) - self.started_at
+            if elapsed > 0:
+                throughput = self.bytes_sent / elapsed
+        if self.state == "uploading" and throughput:
+            eta = round(max(0, self.size - self.bytes_sent) / throughput, 1)
+        estimated_end = None
+        if self.state == "completed" and self.estimated_time_s is not None and self.finished_at is not None:
+            estimated_end = self.finished_at + self.estimated_time_s
+        return {
+            "id": self.id,
+            "batch_id": self.batch_id,
+            "printer_id": self.printer_id,
+            "printer_name": self.printer_name,
+            "filename": self.filename,
+            "sha256": self.sha256,
+            "print_via": self.print_via,
+            "state": self.state,
+            "size_bytes": self.size,
+            "bytes_sent": self.bytes_sent,
+            "progress": round(self.bytes_sent * 100.0 / self.size, 1) if self.size else None,
+            "throughput_bps": round(throughput) if throughput is not None else None,
+            "eta_s": eta,
+            "error": self.error,
+            "estimated_time_s": self.estimated_time_s,
+            "estimated_end_at": estimated_end,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class UploadQueue:
+    def __init__(self, workers: int = DEFAULT_UPLOAD_WORKERS) -> None:
+        self.workers = max(1, int(workers))
+        self._lock = threading.Lock()
+        self._jobs: dict[str, UploadJob] = {}
+        self._changes = ChangeNotifier()
+        self._executor: ThreadPoolExecutor | None = None
+        self._notified_at: dict[str, float] = {}
+        self._spool_refs: dict[str, int] = {}
+
+    def submit(
+        self,
+        printer_id: int,
+        printer_name: str,
+        filename: str,
+        path: str,
+        size: int,
+        print_via: str,
+        username: str,
+        sha256: str | None = None,
+    ) -> dict:
+        return self.submit_batch([(printer_id, printer_name)], filename, path, size, print_via, username, sha256)[0]
+
+    def submit_batch(
+        self,
+        printers: list[tuple[int, str]],
+        filename: str,
+        path: str,
+        size: int,
+        print_via: str,
+        username: str,
+        sha256: str | None = None,
+    ) -> list[dict]:
+        batch_id = uuid4().hex
+        jobs = [
+            UploadJob(printer_id, printer_name, filename, path, size, print_via, username, batch_id, sha256)
+            for printer_id, printer_name in printers
+        ]
+        with self._lock:
+            self._prune_locked(time.time())
+            for job in jobs:
+                self._jobs[job.id] = job
+            self._spool_refs[path] = self._spool_refs.get(path, 0) + len(jobs)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="printfleet2-upload")
+            executor = self._executor
+            result = [job.to_dict() for job in jobs]
+        for job in jobs:
+            executor.submit(self._run, job)
+        self._changes.notify()
+        return result
+
+    def get(self, job_id: str) -> dict | None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job.to_dict() if job is not None else None
+
+    def list(self, printer_id: int | None = None) -> list[dict]:
+        now = time.time()
+        with self._lock:
+            return [
+                job.to_dict(now)
+                for job in reversed(self._jobs.values())
+                if printer_id is None or job.printer_id == printer_id
+            ]
+
+    def batch(self, batch_id: str) -> dict | None:
+        now = time.time()
+        with self._lock:
+            items = [job.to_dict(now) for job in self._jobs.values() if job.batch_id == batch_id]
+        if not items:
+            return None
+        counts = {state: 0 for state in UPLOAD_STATES}
+        for item in items:
+            counts[item["state"]] += 1
+        size = sum(item["size_bytes"] for item in items)
+        sent = sum(item["bytes_sent"] for item in items)
+        return {
+            "id": batch_id,
+            "filename": items[0]["filename"],
+            "finished": counts["completed"] + counts["failed"] == len(items),
+            "total": len(items),
+            "counts": counts,
+            "size_bytes": size,
+            "bytes_sent": sent,
+            "progress": round(sent * 100.0 / size, 1) if size else None,
+            "estimated_end_at": max((item["estimated_end_at"] or 0 for item in items), default=0) or None,
+            "items": items,
+        }
+
+    def sequence(self) -> int:
+        return self._changes.sequence
+
+    def wait(self, sequence: int, timeout: float) -> int:
+        return self._changes.wait(sequence, timeout)
+
+    def _prune_locked(self, now: float) -> None:
+        finished = [job for job in self._jobs.values() if job.state in FINISHED_STATES]
+        excess = len(finished) - MAX_FINISHED_JOBS
+        for job in finished:
+            if excess > 0 or now - (job.finished_at or now) > FINISHED_JOB_TTL:
+                self._jobs.pop(job.id, None)
+                self._notified_at.pop(job.id, None)
+                excess -= 1
+
+    def _release_spool(self, path: str) -> None:
+        with self._lock:
+            remaining = self._spool_refs.get(path, 1) - 1
+            if remaining > 0:
+                self._spool_refs[path] = remaining
+                return
+            self._spool_refs.pop(path, None)
+        discard_spooled_upload(path)
+
+    def _update(self, job: UploadJob, **changes) -> None:
+        with self._lock:
+            for name, value in changes.items():
+                setattr(job, name, value)
+        self._changes.notify()
+
+    def _progress(self, job: UploadJob, sent: int) -> None:
+        now = time.monotonic()
+        with self._lock:
+            job.bytes_sent = sent
+            if now - self._notified_at.get(job.id, 0.0) < PROGRESS_NOTIFY_INTERVAL and sent < job.size:
+                return
+            self._notified_at[job.id] = now
+        self._changes.notify()
+
+    def _run(self, job: UploadJob) -> None:
+        try:
+            self._update(job, state="uploading", started_at=time.time())
+            ok, message = self._transfer(job)
+        except Exception as exc:
+            logger.exception("Upload %s to printer %s failed", job.filename, job.printer_id)
+            ok, message = False, str(exc) or exc.__class__.__name__
+        finally:
+            self._release_spool(job.path)
+        if ok:
+            self._update(job, state="completed", finished_at=time.time())
+        else:
+            self._update(job, state="failed", finished_at=time.time(), error=UPLOAD_ERROR_MESSAGES.get(message, message))
+
+    def _transfer(self, job: UploadJob) -> tuple[bool, str]:
+        with session_scope() as session:
+            printer = get_printer(session, job.printer_id)
+            if printer is None:
+                return False, "Printer not found."
+            upload_timeout = ensure_settings_row(session).upload_timeout
+            session.expunge(printer)
+        ok, message = upload_and_print(
+            printer,
+            job.filename,
+            job.path,
+            upload_timeout,
+            progress=lambda sent: self._progress(job, sent),
+        )
+        if not ok:
+            self._update(job, state="confirming")
+            if confirm_print_started(printer, job.filename):
+                ok = True
+                message = "ok"
+        if not ok:
+            record_pending_upload(printer.id, job.filename, printer.name, job.username, job.print_via)
+            return ok, message
+        with session_scope() as session:
+            printer = get_printer(session, job.printer_id)
+            if printer is None:
+                return False, "Printer not found."
+            printer.print_check_status = "check"
+            if printer.group_id:
+                group = get_printer_group(session, int(printer.group_id))
+                if group is not None:
+                    group.print_check_status = "check"
+            create_print_job(
+                session,
+                gcode_filename=job.filename,
+                printer_name=printer.name,
+                username=job.username,
+                print_via=job.print_via,
+                printer_id=printer.id,
+                gcode_sha256=job.sha256,
+            )
+            if job.sha256:
+                metadata = get_cached_gcode_metadata(session, [job.sha256]).get(job.sha256)
+                if metadata is not None:
+                    with self._lock:
+                        job.estimated_time_s = metadata.get("estimated_time_s")
+        discard_pending_upload(job.printer_id, job.filename)
+        return ok, message
+
+
+_QUEUE: UploadQueue | None = None
+
+
+def start_upload_queue(workers: int = DEFAULT_UPLOAD_WORKERS) -> UploadQueue:
+    global _QUEUE
+    if _QUEUE is None:
+        _QUEUE = UploadQueue(workers)
+    return _QUEUE
+
+
+def get_upload_queue() -> UploadQueue:
+    return start_upload_queue()
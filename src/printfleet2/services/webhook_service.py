@@ -0,0 +1,479 @@
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import random
+import threading
+import time
+from collections import deque
+from urllib.parse import urlsplit
+
+from sqlalchemy import func, insert, inspect, text, update
+from sqlalchemy.orm import Session
+
+from printfleet2.db.session import session_scope
+from printfleet2.models.webhook import Webhook, WebhookDelivery
+from printfleet2.services.async_http_service import get_event_loop, http_request, submit_coroutine
+from printfleet2.services.print_accounting_service import get_fleet_summary
+from printfleet2.services.status_event_service import EVENT_TYPES, get_status_event_bus
+
+
+USER_AGENT = "PrintFleet2 Webhooks"
+DEFAULT_WEBHOOK_WORKERS = 8
+WEBHOOK_TIMEOUT = 10.0
+MAX_WEBHOOK_ATTEMPTS = 8
+RETRY_BASE_DELAY = 5.0
+RETRY_MAX_DELAY = 3600.0
+CLAIM_BATCH = 100
+IDLE_POLL_INTERVAL = 2.0
+STATS_WINDOW_SECONDS = 60.0
+MAX_LATENCY_SAMPLES = 2000
+MAX_QUEUED_EVENTS = 10000
+DELIVERY_STATUSES = {"pending", "delivered", "dead"}
+
+logger = logging.getLogger(__name__)
+
+
+def ensure_webhook_schema(session: Session) -> None:
+    engine = session.get_bind()
+    inspector = inspect(engine)
+    try:
+        tables = set(inspector.get_table_names())
+    except Exception:
+        return
+    if {"webhooks", "webhook_deliveries"}.issubset(tables):
+        return
+    try:
+        with engine.begin() as conn:
+            if "webhooks" not in tables:
+                conn.execute(
+                    text(
+                        "CREATE TABLE webhooks ("
+                        "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                        "name VARCHAR NOT NULL, "
+                        "url VARCHAR NOT NULL, "
+                        "secret VARCHAR, "
+                        "event_types VARCHAR NOT NULL DEFAULT '*', "
+                        "enabled BOOLEAN NOT NULL DEFAULT 1"
+                        ")"
+                    )
+                )
+            if "webhook_deliveries" not in tables:
+                conn.execute(
+                    text(
+                        "CREATE TABLE webhook_deliveries ("
+                        "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                        "webhook_id INTEGER NOT NULL, "
+                        "event_type VARCHAR NOT NULL, "
+                        "payload TEXT NOT NULL, "
+                        "status VARCHAR NOT NULL DEFAULT 'pending', "
+                        "attempts INTEGER NOT NULL DEFAULT 0, "
+                        "created_at REAL NOT NULL, "
+                        "next_attempt_at REAL NOT NULL, "
+                        "delivered_at REAL, "
+                        "last_status INTEGER, "
+                        "last_error TEXT"
+                        ")"
+                    )
+                )
+                conn.execute(text("CREATE INDEX ix_webhook_deliveries_webhook_id ON webhook_deliveries (webhook_id)"))
+                conn.execute(
+                    text("CREATE INDEX ix_webhook_deliveries_next_attempt_at ON webhook_deliveries (next_attempt_at)")
+                )
+    except Exception:
+        return
+
+
+def normalize_webhook_url(value: object | None) -> str | None:
+    if not isinstance(value, str):
+        return None
+    cleaned = value.strip()
+    parts = urlsplit(cleaned)
+    if parts.scheme not in {"http", "https"} or not parts.hostname:
+        return None
+    return cleaned
+
+
+def normalize_event_types(value: object | None) -> str | None:
+    if value is None:
+        return "*"
+    if isinstance(value, str):
+        items = [item.strip() for item in value.split(",")]
+    elif isinstance(value, (list, tuple)):
+        items = [str(item).strip() for item in value]
+    else:
+        return None
+    items = [item for item in items if item]
+    if not items or "*" in items:
+        return "*"
+    if any(item not in EVENT_TYPES for item in items):
+        return None
+    return ",".join(event_type for event_type in EVENT_TYPES if event_type in items)
+
+
+def list_webhooks(session: Session) -> list[Webhook]:
+    ensure_webhook_schema(session)
+    return session.query(Webhook).order_by(Webhook.id).all()
+
+
+def get_webhook(session: Session, webhook_id: int) -> Webhook | None:
+    ensure_webhook_schema(session)
+    return session.get(Webhook, webhook_id)
+
+
+def create_webhook(
+    session: Session,
+    name: str,
+    url: str,
+    secret: str | None = None,
+    event_types: str = "*",
+    enabled: bool = True,
+) -> Webhook:
+    ensure_webhook_schema(session)
+    webhook = Webhook(name=name, url=url, secret=secret, event_types=event_types, enabled=enabled)
+    session.add(webhook)
+    session.flush()
+    return webhook
+
+
+def delete_webhook(session: Session, webhook: Webhook) -> int:
+    removed = session.query(WebhookDelivery).filter(WebhookDelivery.webhook_id == webhook.id).delete()
+    session.delete(webhook)
+    return removed or 0
+
+
+def webhook_to_dict(webhook: Webhook) -> dict:
+    return {
+        "id": webhook.id,
+        "name": webhook.name,
+        "url": webhook.url,
+        "has_secret": bool(webhook.secret),
+        "events": webhook.event_types.split(",") if webhook.event_types != "*" else ["*"],
+        "enabled": bool(webhook.enabled),
+    }
+
+
+def list_webhook_deliveries(
+    session: Session,
+    webhook_id: int,
+    status: str | None = None,
+    limit: int = 100,
+) -> list[WebhookDelivery]:
+    ensure_webhook_schema(session)
+    query = session.query(WebhookDelivery).filter(WebhookDelivery.webhook_id == webhook_id)
+    if status is not None:
+        query = query.filter(WebhookDelivery.status == status)
+    return query.order_by(WebhookDelivery.id.desc()).limit(limit).all()
+
+
+def get_webhook_delivery(session: Session, delivery_id: int) -> WebhookDelivery | None:
+    ensure_webhook_schema(session)
+    return session.get(WebhookDelivery, delivery_id)
+
+
+def requeue_webhook_delivery(delivery: WebhookDelivery) -> None:
+    delivery.status = "pending"
+    delivery.attempts = 0
+    delivery.next_attempt_at = time.time()
+    delivery.last_error = None
+
+
+def webhook_delivery_to_dict(delivery: WebhookDelivery) -> dict:
+    return {
+        "id": delivery.id,
+        "webhook_id": delivery.webhook_id,
+        "event_type": delivery.event_type,
+        "status": delivery.status,
+        "attempts": delivery.attempts,
+        "created_at": delivery.created_at,
+        "next_attempt_at": delivery.next_attempt_at,
+        "delivered_at": delivery.delivered_at,
+        "last_status": delivery.last_status,
+        "last_error": delivery.last_error,
+        "payload": json.loads(delivery.payload),
+    }
+
+
+def count_webhook_deliveries(session: Session) -> dict[str, int]:
+    ensure_webhook_schema(session)
+    counts = {status: 0 for status in DELIVERY_STATUSES}
+    for status, count in session.query(WebhookDelivery.status, func.count(WebhookDelivery.id)).group_by(
+        WebhookDelivery.status
+    ):
+        counts[status] = count
+    return counts
+
+
+def sign_payload(secret: str, timestamp: str, body: bytes) -> str:
+    digest = hmac.new(secret.encode("utf-8"), timestamp.encode("ascii") + b"." + body, hashlib.sha256).hexdigest()
+    return f"sha256={digest}"
+
+
+def _retry_delay(attempts: int) -> float:
+    delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** (attempts - 1))
+    return delay + random.uniform(0, delay * 0.1)
+
+
+def _percentile(values: list[float], fraction: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 1)
+
+
+class WebhookDispatcher:
+    def __init__(self, workers: int = DEFAULT_WEBHOOK_WORKERS) -> None:
+        self.workers = max(1, workers)
+        self.delivered = 0
+        self.failed = 0
+        self.dead = 0
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._events: list[dict] = []
+        self._results: list[dict] = []
+        self._inflight: set[int] = set()
+        self._samples: deque[tuple[float, float, float]] = deque(maxlen=MAX_LATENCY_SAMPLES)
+        self._webhooks: list[tuple[int, str]] | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._future = None
+
+    def start(self) -> None:
+        if self._future is None or self._future.done():
+            self._future = submit_coroutine(self._run())
+
+    def stop(self) -> None:
+        if self._future is not None:
+            self._future.cancel()
+            self._future = None
+
+    def wake(self) -> None:
+        if self._wakeup is not None:
+            get_event_loop().call_soon_threadsafe(self._wakeup.set)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._webhooks = None
+        self.wake()
+
+    def _enabled_webhooks(self) -> list[tuple[int, str]]:
+        with self._lock:
+            cached = self._webhooks
+        if cached is None:
+            with session_scope() as session:
+                cached = [(webhook.id, webhook.event_types) for webhook in list_webhooks(session) if webhook.enabled]
+            with self._lock:
+                self._webhooks = cached
+        return cached
+
+    def enqueue(self, events: list[dict]) -> int:
+        if not events:
+            return 0
+        with self._lock:
+            self._events.extend(events)
+            self._trim_events_locked()
+        self.wake()
+        return len(events)
+
+    def _trim_events_locked(self) -> None:
+        excess = len(self._events) - MAX_QUEUED_EVENTS
+        if excess > 0:
+            del self._events[:excess]
+            self.dropped += excess
+
+    def _delivery_rows(self, events: list[dict], webhooks: list[tuple[int, str]]) -> list[dict]:
+        now = time.time()
+        names = dict(get_fleet_summary().printers)
+        rows = []
+        for event in events:
+            payload = json.dumps(
+                {
+                    "type": event["type"],
+                    "ts": event["ts"],
+                    "printer": {"id": event.get("printer_id"), "name": names.get(event.get("printer_id"))},
+                    "job_name": event.get("job_name"),
+                    "progress": event.get("progress"),
+                    "message": event.get("message"),
+                },
+                separators=(",", ":"),
+            )
+            for webhook_id, event_types in webhooks:
+                if event_types != "*" and event["type"] not in event_types.split(","):
+                    continue
+                rows.append(
+                    {
+                        "webhook_id": webhook_id,
+                        "event_type": event["type"],
+                        "payload": payload,
+                        "status": "pending",
+                        "attempts": 0,
+                        "created_at": now,
+                        "next_attempt_at": now,
+                    }
+                )
+        return rows
+
+    def to_dict(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            samples = [sample for sample in self._samples if now - sample[0] <= STATS_WINDOW_SECONDS]
+            in_flight = len(self._inflight)
+            queued = len(self._events)
+        window = min(STATS_WINDOW_SECONDS, now - samples[0][0]) if samples else 0.0
+        return {
+            "running": self._future is not None and not self._future.done(),
+            "workers": self.workers,
+            "in_flight": in_flight,
+            "queued_events": queued,
+            "dropped_events": self.dropped,
+            "delivered": self.delivered,
+            "failed_attempts": self.failed,
+            "dead": self.dead,
+            "throughput_per_s": round(len(samples) / window, 1) if window > 0 else None,
+            "latency_ms_p50": _percentile([sample[1] for sample in samples], 0.5),
+            "latency_ms_p95": _percentile([sample[1] for sample in samples], 0.95),
+            "lag_ms_p50": _percentile([sample[2] for sample in samples], 0.5),
+            "lag_ms_p95": _percentile([sample[2] for sample in samples], 0.95),
+        }
+
+    def _sync(self, results: list[dict], events: list[dict] | None = None, claim: bool = True) -> list[dict]:
+        webhooks = self._enabled_webhooks()
+        rows = self._delivery_rows(events, webhooks) if events and webhooks else []
+        claim = claim and bool(webhooks)
+        if not results and not rows and not claim:
+            return []
+        with session_scope() as session:
+            ensure_webhook_schema(session)
+            if rows:
+                session.execute(insert(WebhookDelivery), rows)
+            if results:
+                session.execute(update(WebhookDelivery), results)
+            with self._lock:
+                for result in results:
+                    self._inflight.discard(result["id"])
+                inflight = set(self._inflight)
+            if not claim:
+                return []
+            query = (
+                session.query(WebhookDelivery, Webhook.url, Webhook.secret)
+                .join(Webhook, Webhook.id == WebhookDelivery.webhook_id)
+                .filter(
+                    WebhookDelivery.status == "pending",
+                    WebhookDelivery.next_attempt_at <= time.time(),
+                    Webhook.enabled.is_(True),
+                )
+            )
+            if inflight:
+                query = query.filter(WebhookDelivery.id.notin_(inflight))
+            claimed = [
+                {
+                    "id": delivery.id,
+                    "event_type": delivery.event_type,
+                    "payload": delivery.payload,
+                    "attempts": delivery.attempts,
+                    "created_at": delivery.created_at,
+                    "url": url,
+                    "secret": secret,
+                }
+                for delivery, url, secret in query.order_by(WebhookDelivery.next_attempt_at).limit(CLAIM_BATCH)
+            ]
+        with self._lock:
+            self._inflight.update(delivery["id"] for delivery in claimed)
+        return claimed
+
+    async def _run(self) -> None:
+        self._wakeup = asyncio.Event()
+        queue: asyncio.Queue = asyncio.Queue()
+        workers = [asyncio.get_running_loop().create_task(self._worker(queue)) for _ in range(self.workers)]
+        try:
+            while True:
+                self._wakeup.clear()
+                with self._lock:
+                    results, self._results = self._results, []
+                    events, self._events = self._events, []
+                claimed = []
+                try:
+                    claimed = await asyncio.to_thread(self._sync, results, events, queue.qsize() < CLAIM_BATCH)
+                except Exception:
+                    with self._lock:
+                        self._results[:0] = results
+                        self._events[:0] = events
+                        self._trim_events_locked()
+                    logger.exception("Webhook outbox sync failed")
+                for delivery in claimed:
+                    queue.put_nowait(delivery)
+                if claimed and queue.qsize() < CLAIM_BATCH:
+                    continue
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), IDLE_POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            for worker in workers:
+                worker.cancel()
+
+    async def _worker(self, queue: asyncio.Queue) -> None:
+        while True:
+            delivery = await queue.get()
+            result = await self._deliver(delivery)
+            with self._lock:
+                self._results.append(result)
+            self._wakeup.set()
+
+    async def _deliver(self, delivery: dict) -> dict:
+        body = delivery["payload"].encode("utf-8")
+        timestamp = str(int(time.time()))
+        headers = {
+            "Content-Type": "application/json",
+            "User-Agent": USER_AGENT,
+            "X-PrintFleet2-Event": delivery["event_type"],
+            "X-PrintFleet2-Delivery": str(delivery["id"]),
+            "X-PrintFleet2-Timestamp": timestamp,
+        }
+        if delivery["secret"]:
+            headers["X-PrintFleet2-Signature"] = sign_payload(delivery["secret"], timestamp, body)
+        started = time.monotonic()
+        status = None
+        error = None
+        try:
+            status, _ = await http_request("POST", delivery["url"], headers, body=body, timeout=WEBHOOK_TIMEOUT, max_bytes=8192)
+        except Exception as exc:
+            error = str(exc) or exc.__class__.__name__
+        now = time.time()
+        attempts = delivery["attempts"] + 1
+        result = {"id": delivery["id"], "attempts": attempts, "last_status": status}
+        if status is not None and 200 <= status < 300:
+            self.delivered += 1
+            with self._lock:
+                self._samples.append(
+                    (time.monotonic(), (time.monotonic() - started) * 1000, (now - delivery["created_at"]) * 1000)
+                )
+            return {**result, "status": "delivered", "delivered_at": now, "last_error": None}
+        self.failed += 1
+        error = error or f"HTTP {status}"
+        permanent = status is not None and 400 <= status < 500 and status not in {408, 429}
+        if permanent or attempts >= MAX_WEBHOOK_ATTEMPTS:
+            self.dead += 1
+            return {**result, "status": "dead", "last_error": error}
+        return {**result, "status": "pending", "next_attempt_at": now + _retry_delay(attempts), "last_error": error}
+
+
+_DISPATCHER: WebhookDispatcher | None = None
+
+
+def start_webhook_dispatcher(workers: int = DEFAULT_WEBHOOK_WORKERS) -> WebhookDispatcher:
+    global _DISPATCHER
+    if _DISPATCHER is None:
+        _DISPATCHER = WebhookDispatcher(workers)
+        get_status_event_bus().subscribe(_DISPATCHER.enqueue)
+        _DISPATCHER.start()
+    return _DISPATCHER
+
+
+def get_webhook_dispatcher() -> WebhookDispatcher | None:
+    return _DISPATCHER
+
+
+def invalidate_webhooks() -> None:
+    if _DISPATCHER is not None:
+        _DISPATCHER.invalidate()
@@ -13,7 +13,10 @@ document.addEventListener("DOMContentLoaded", () => {
   });
 
   const statusUrl = "/api/live-wall/status";
+  let statusVersion = null;
   const plugStatusUrl = "/api/live-wall/plug-status";
+  const eventsUrl = "/api/live-wall/events";
+  const eventsRetryMs = 30000;
   const wall = document.querySelector(".live-wall");
   const statusIntervalValue = wall ? Number(wall.dataset.statusPollInterval) : NaN;
   const plugIntervalValue = wall ? Number(wall.dataset.plugPollInterval) : NaN;
@@ -58,6 +61,14 @@ document.addEventListener("DOMContentLoaded", () => {
     return `${secs}s`;
   }
 
+  function formatAge(value) {
+    const ms = Number(value);
+    if (!Number.isFinite(ms) || ms < 0) {
+      return "--";
+    }
+    return formatDuration(ms / 1000);
+  }
+
   function isPrintingStatus(status) {
     if (!status || typeof status.status !== "string") {
       return false;
@@ -79,6 +90,9 @@ document.addEventListener("DOMContentLoaded", () => {
       statusEl.className = "printer-status status-" + getStatusClass(status);
     }
 
+    const stale = Boolean(status.stale);
+    card.classList.toggle("is-stale", stale);
+    card.title = stale ? `Last update ${formatAge(status.age_ms)} ago` : "";
 
     const tempsEl = card.querySelector("[data-printer-temps]");
     if (tempsEl) {
@@ -165,13 +179,30 @@ document.addEventListener("DOMContentLoaded", () => {
     });
   });
 
+  function applyAnomalies(anomalies) {
+    const messages = new Map();
+    (anomalies || []).forEach((anomaly) => {
+      const id = Number(anomaly.printer_id);
+      messages.set(id, (messages.get(id) || []).concat(anomaly.message));
+    });
+    cardMap.forEach((card, id) => {
+      const list = messages.get(id) || [];
+      card.classList.toggle("has-anomaly", list.length > 0);
+      card.dataset.anomaly = list.join(", ");
+    });
+  }
+
   async function refreshStatuses() {
     try {
-      const res = await fetch(statusUrl, { cache: "no-store" });
+      const url = statusVersion === null ? statusUrl : `${statusUrl}?since=${statusVersion}`;
+      const res = await fetch(url, { cache: "no-store" });
       if (!res.ok) {
         return;
       }
       const data = await res.json().catch(() => ({}));
+      if (Number.isInteger(data.version)) {
+        statusVersion = data.version;
+      }
       const items = data.items || [];
       items.forEach((item) => {
         const card = cardMap.get(Number(item.id));
@@ -179,6 +210,9 @@ document.addEventListener("DOMContentLoaded", () => {
           updateCard(card, item);
         }
       });
+      if (Array.isArray(data.anomalies)) {
+        applyAnomalies(data.anomalies);
+      }
     } catch (error) {
       // Keep the last known values on network errors.
     }
@@ -203,8 +237,69 @@ document.addEventListener("DOMContentLoaded", () => {
     }
   }
 
-  refreshStatuses();
-  refreshPlugStatuses();
-  setInterval(refreshStatuses, statusPollIntervalMs);
-  setInterval(refreshPlugStatuses, plugPollIntervalMs);
+  let statusTimer = null;
+  let plugTimer = null;
+
+  function startPolling() {
+    if (statusTimer) {
+      return;
+    }
+    refreshStatuses();
+    refreshPlugStatuses();
+    statusTimer = setInterval(refreshStatuses, statusPollIntervalMs);
+    plugTimer = setInterval(refreshPlugStatuses, plugPollIntervalMs);
+  }
+
+  function stopPolling() {
+    if (statusTimer) {
+      clearInterval(statusTimer);
+      statusTimer = null;
+    }
+    if (plugTimer) {
+      clearInterval(plugTimer);
+      plugTimer = null;
+    }
+  }
+
+  function applyEventItems(event, update) {
+    let data = null;
+    try {
+      data = JSON.parse(event.data);
+    } catch (error) {
+      return;
+    }
+    const items = (data && data.items) || [];
+    items.forEach((item) => {
+      const card = cardMap.get(Number(item.id));
+      if (card) {
+        update(card, item);
+      }
+    });
+  }
+
+  function connectEvents() {
+    if (!window.EventSource) {
+      startPolling();
+      return;
+    }
+    const source = new EventSource(eventsUrl);
+    source.addEventListener("open", stopPolling);
+    source.addEventListener("status", (event) => applyEventItems(event, updateCard));
+    source.addEventListener("plug", (event) => applyEventItems(event, updatePlug));
+    source.addEventListener("anomaly", (event) => {
+      try {
+        applyAnomalies(JSON.parse(event.data).items);
+      } catch (error) {
+        // Ignore malformed events.
+      }
+    });
+    source.addEventListener("error", () => {
+      startPolling();
+      if (source.readyState === EventSource.CLOSED) {
+        setTimeout(connectEvents, eventsRetryMs);
+      }
+    });
+  }
+
+  connectEvents();
 });
@@ -22,6 +22,9 @@ document.addEventListener("DOMContentLoaded", () => {
   let currentPage = 1;
   let cachedItems = [];
   let isFiltered = false;
+  const gcodeMetadata = new Map();
+  const metadataRetryMs = 3000;
+  const metadataRetries = 5;
 
   function setNotice(message, type) {
     if (!notice) {
@@ -100,34 +103,168 @@ document.addEventListener("DOMContentLoaded", () => {
     URL.revokeObjectURL(url);
   }
 
+  function formatEnergy(value) {
+    const number = Number(value);
+    if (value === null || value === undefined || !Number.isFinite(number)) {
+      return "--";
+    }
+    return `${number.toFixed(3)} kWh`;
+  }
+
+  function formatDuration(value) {
+    const seconds = Number(value);
+    if (value === null || value === undefined || !Number.isFinite(seconds)) {
+      return "";
+    }
+    const hours = Math.floor(seconds / 3600);
+    const minutes = Math.floor((seconds % 3600) / 60);
+    if (hours) {
+      return `${hours}h ${minutes}m`;
+    }
+    return minutes ? `${minutes}m` : `${Math.round(seconds)}s`;
+  }
+
+  function formatEstimate(metadata) {
+    if (!metadata) {
+      return "--";
+    }
+    const parts = [];
+    const duration = formatDuration(metadata.estimated_time_s);
+    if (duration) {
+      parts.push(duration);
+    }
+    if (metadata.filament_weight_g !== null && metadata.filament_weight_g !== undefined) {
+      parts.push(`${Number(metadata.filament_weight_g).toFixed(1)} g`);
+    } else if (metadata.filament_length_mm !== null && metadata.filament_length_mm !== undefined) {
+      parts.push(`${(Number(metadata.filament_length_mm) / 1000).toFixed(2)} m`);
+    }
+    if (metadata.layer_count) {
+      parts.push(`${metadata.layer_count} layers`);
+    }
+    return parts.length ? parts.join(" · ") : "--";
+  }
+
+  function renderEstimate(cell, metadata) {
+    cell.textContent = formatEstimate(metadata);
+    cell.title = metadata && metadata.slicer ? `${metadata.slicer} ${metadata.slicer_version || ""}`.trim() : "";
+  }
+
+  async function loadMetadata(items, attempt = 0) {
+    const missing = [];
+    items.forEach((item) => {
+      if (item.gcode_sha256 && !gcodeMetadata.has(item.gcode_sha256)) {
+        gcodeMetadata.set(item.gcode_sha256, null);
+        missing.push(item.gcode_sha256);
+      }
+    });
+    if (!missing.length) {
+      return;
+    }
+    try {
+      const res = await fetch(`/api/gcode-metadata?sha256=${missing.join(",")}`, { cache: "no-store" });
+      if (!res.ok) {
+        return;
+      }
+      const data = await res.json().catch(() => ({}));
+      Object.entries(data.items || {}).forEach(([sha256, metadata]) => {
+        gcodeMetadata.set(sha256, metadata);
+      });
+      const pending = data.pending || [];
+      if (pending.length && attempt < metadataRetries) {
+        pending.forEach((sha256) => gcodeMetadata.delete(sha256));
+        window.setTimeout(() => loadMetadata(items, attempt + 1), metadataRetryMs);
+      }
+    } catch (error) {
+      return;
+    }
+    tableBody.querySelectorAll("td[data-sha256]").forEach((cell) => {
+      renderEstimate(cell, gcodeMetadata.get(cell.dataset.sha256));
+    });
+  }
+
+  async function reprint(item, button) {
+    const printerName = item.printer_name || "the printer";
+    const confirmed = window.confirm(
+      `Print ${item.gcode_filename || "this file"} again on ${printerName}?\n\n` +
+        "Make sure the print bed is clear and the correct filament is loaded."
+    );
+    if (!confirmed) {
+      return;
+    }
+    button.disabled = true;
+    try {
+      const res = await fetch(`/api/printers/${item.printer_id}/upload-print`, {
+        method: "POST",
+        credentials: "same-origin",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({
+          sha256: item.gcode_sha256,
+          filename: item.gcode_filename,
+          print_via: "Reprint",
+        }),
+      });
+      const data = await res.json().catch(() => ({}));
+      if (!res.ok) {
+        setNotice(data.error || "Reprint failed.", "error");
+        return;
+      }
+      setNotice(`Reprint of ${item.gcode_filename || "file"} queued for ${printerName}.`, "success");
+    } catch (error) {
+      setNotice("Reprint failed.", "error");
+    } finally {
+      button.disabled = false;
+    }
+  }
+
   function renderRows(items, filtered) {
     tableBody.innerHTML = "";
     if (!items.length) {
       const message = filtered ? "No logs for the selected period." : "No logs yet.";
-      tableBody.innerHTML = `<tr><td colspan="5" class="muted">${message}</td></tr>`;
+      tableBody.innerHTML = `<tr><td colspan="8" class="muted">${message}</td></tr>`;
       return;
     }
     items.forEach((item) => {
       const row = document.createElement("tr");
       const dateCell = document.createElement("td");
       const fileCell = document.createElement("td");
+      const estimateCell = document.createElement("td");
       const printerCell = document.createElement("td");
       const userCell = document.createElement("td");
       const viaCell = document.createElement("td");
+      const energyCell = document.createElement("td");
+      const actionCell = document.createElement("td");
 
       dateCell.textContent = item.job_date || "--";
       fileCell.textContent = item.gcode_filename || "--";
+      renderEstimate(estimateCell, gcodeMetadata.get(item.gcode_sha256));
+      if (item.gcode_sha256) {
+        estimateCell.dataset.sha256 = item.gcode_sha256;
+      }
       printerCell.textContent = item.printer_name || "--";
       userCell.textContent = item.username || "--";
       viaCell.textContent = item.print_via || "--";
+      energyCell.textContent = formatEnergy(item.energy_kwh);
+      if (item.gcode_sha256 && item.printer_id) {
+        const reprintBtn = document.createElement("button");
+        reprintBtn.className = "btn soft small";
+        reprintBtn.type = "button";
+        reprintBtn.textContent = "Reprint";
+        reprintBtn.title = `Print ${item.gcode_filename || "this file"} again on ${item.printer_name || "the same printer"}`;
+        reprintBtn.addEventListener("click", () => reprint(item, reprintBtn));
+        actionCell.appendChild(reprintBtn);
+      }
 
       row.appendChild(dateCell);
       row.appendChild(fileCell);
+      row.appendChild(estimateCell);
       row.appendChild(printerCell);
       row.appendChild(userCell);
       row.appendChild(viaCell);
+      row.appendChild(energyCell);
+      row.appendChild(actionCell);
       tableBody.appendChild(row);
     });
+    loadMetadata(items);
   }
 
   function getTotalPages(total) {
@@ -8,6 +8,13 @@ document.addEventListener("DOMContentLoaded", () => {
   let sortState = { key: null, direction: "asc" };
   let pollIntervalId = null;
   let pollIntervalMs = 5000;
+  const eventsUrl = "/api/live-wall/events";
+  const eventsResyncMs = 60000;
+  let eventsConnected = false;
+  let renderQueued = false;
+  let lastPrintersData = null;
+  let lastStatusData = null;
+  let lastEnergyData = null;
   let cachedPrinters = [];
   let cachedStatuses = [];
   let cachedGroups = [];
@@ -52,7 +59,74 @@ document.addEventListener("DOMContentLoaded", () => {
     if (pollIntervalId) {
       clearInterval(pollIntervalId);
     }
-    pollIntervalId = setInterval(refreshDashboard, pollIntervalMs);
+    pollIntervalId = setInterval(refreshDashboard, eventsConnected ? eventsResyncMs : pollIntervalMs);
+  }
+
+  function mergeEventItems(data, items, removed) {
+    const current = data && Array.isArray(data.items) ? data.items : [];
+    const itemMap = new Map(current.map((item) => [Number(item.id), item]));
+    items.forEach((item) => {
+      const id = Number(item.id);
+      itemMap.set(id, { ...(itemMap.get(id) || {}), ...item });
+    });
+    (removed || []).forEach((id) => itemMap.delete(Number(id)));
+    return { ...(data || {}), items: Array.from(itemMap.values()) };
+  }
+
+  function parseEventData(event) {
+    try {
+      return JSON.parse(event.data);
+    } catch (error) {
+      return null;
+    }
+  }
+
+  function queueRender() {
+    if (renderQueued) {
+      return;
+    }
+    renderQueued = true;
+    window.requestAnimationFrame(() => {
+      renderQueued = false;
+      updateSnapshot(lastPrintersData, lastStatusData, lastEnergyData);
+      renderTable(cachedPrinters, cachedStatuses, cachedGroups);
+    });
+  }
+
+  function connectEvents() {
+    if (!window.EventSource) {
+      return;
+    }
+    const source = new EventSource(eventsUrl);
+    source.addEventListener("open", () => {
+      eventsConnected = true;
+      scheduleRefresh();
+    });
+    source.addEventListener("status", (event) => {
+      const data = parseEventData(event);
+      if (!data || !lastStatusData) {
+        return;
+      }
+      lastStatusData = mergeEventItems(lastStatusData, data.items || [], data.removed);
+      cachedStatuses = lastStatusData.items;
+      queueRender();
+    });
+    source.addEventListener("energy", (event) => {
+      const data = parseEventData(event);
+      if (!data) {
+        return;
+      }
+      lastEnergyData = mergeEventItems(lastEnergyData, data.items || []);
+      queueRender();
+    });
+    source.addEventListener("error", () => {
+      if (!eventsConnected) {
+        return;
+      }
+      eventsConnected = false;
+      scheduleRefresh();
+      refreshDashboard();
+    });
   }
 
   function formatMetricValue(value, options = {}) {
@@ -232,6 +306,10 @@ document.addEventListener("DOMContentLoaded", () => {
     const className = getStatusClass(state, status);
     badge.className = `printer-status status-${className}`;
     badge.textContent = label;
+    if (status && status.stale) {
+      badge.classList.add("is-stale");
+      badge.title = `Last update ${formatAge(status.age_ms)} ago`;
+    }
     td.appendChild(badge);
     return td;
   }
@@ -290,6 +368,14 @@ document.addEventListener("DOMContentLoaded", () => {
     await refreshDashboard();
   }
 
+  function formatAge(value) {
+    const ms = Number(value);
+    if (!Number.isFinite(ms) || ms < 0) {
+      return "--";
+    }
+    return formatDuration(ms / 1000);
+  }
+
   function isPrintingStatus(status) {
     if (!status || typeof status.status !== "string") {
       return false;
@@ -528,6 +614,7 @@ document.addEventListener("DOMContentLoaded", () => {
     sortedPrinters.forEach((printer) => {
       const status = statusMap.get(Number(printer.id)) || {};
       const row = document.createElement("tr");
+      row.classList.toggle("is-stale", Boolean(status.stale));
       row.appendChild(createNameCell(printer, groupMap, status));
       row.appendChild(createStatusCell(status));
       row.appendChild(createTempCell(status.temp_hotend, status.temp_bed));
@@ -651,6 +738,9 @@ document.addEventListener("DOMContentLoaded", () => {
       fetchJson("/api/printer-groups"),
     ]);
     updatePollInterval(settingsData);
+    lastPrintersData = printersData;
+    lastStatusData = statusData;
+    lastEnergyData = energyData;
     updateSnapshot(printersData, statusData, energyData);
     cachedPrinters = (printersData && printersData.items) || [];
     cachedStatuses = (statusData && statusData.items) || [];
@@ -677,6 +767,7 @@ document.addEventListener("DOMContentLoaded", () => {
     updateSortButtons();
     await refreshDashboard();
     scheduleRefresh();
+    connectEvents();
   }
 
   initDashboard();
@@ -9,6 +9,13 @@ document.addEventListener("DOMContentLoaded", () => {
   let sortState = { key: "name", direction: "asc" };
   let pollIntervalId = null;
   let pollIntervalMs = 5000;
+  const eventsUrl = "/api/live-wall/events";
+  const eventsResyncMs = 60000;
+  let eventsConnected = false;
+  let renderQueued = false;
+  let lastPrintersData = null;
+  let lastStatusData = null;
+  let lastEnergyData = null;
   const DEFAULT_FILENAME_DISPLAY_LENGTH = 32;
   const MIN_FILENAME_DISPLAY_LENGTH = 10;
   const MAX_FILENAME_DISPLAY_LENGTH = 120;
@@ -95,7 +102,74 @@ document.addEventListener("DOMContentLoaded", () => {
     if (pollIntervalId) {
       clearInterval(pollIntervalId);
     }
-    pollIntervalId = setInterval(refreshDashboard, pollIntervalMs);
+    pollIntervalId = setInterval(refreshDashboard, eventsConnected ? eventsResyncMs : pollIntervalMs);
+  }
+
+  function mergeEventItems(data, items, removed) {
+    const current = data && Array.isArray(data.items) ? data.items : [];
+    const itemMap = new Map(current.map((item) => [Number(item.id), item]));
+    items.forEach((item) => {
+      const id = Number(item.id);
+      itemMap.set(id, { ...(itemMap.get(id) || {}), ...item });
+    });
+    (removed || []).forEach((id) => itemMap.delete(Number(id)));
+    return { ...(data || {}), items: Array.from(itemMap.values()) };
+  }
+
+  function parseEventData(event) {
+    try {
+      return JSON.parse(event.data);
+    } catch (error) {
+      return null;
+    }
+  }
+
+  function queueRender() {
+    if (renderQueued) {
+      return;
+    }
+    renderQueued = true;
+    window.requestAnimationFrame(() => {
+      renderQueued = false;
+      updateSnapshot(lastPrintersData, lastStatusData, lastEnergyData);
+      renderTable(cachedPrinters, cachedStatuses, cachedGroups, cachedTypes);
+    });
+  }
+
+  function connectEvents() {
+    if (!window.EventSource) {
+      return;
+    }
+    const source = new EventSource(eventsUrl);
+    source.addEventListener("open", () => {
+      eventsConnected = true;
+      scheduleRefresh();
+    });
+    source.addEventListener("status", (event) => {
+      const data = parseEventData(event);
+      if (!data || !lastStatusData) {
+        return;
+      }
+      lastStatusData = mergeEventItems(lastStatusData, data.items || [], data.removed);
+      cachedStatuses = lastStatusData.items;
+      queueRender();
+    });
+    source.addEventListener("energy", (event) => {
+      const data = parseEventData(event);
+      if (!data) {
+        return;
+      }
+      lastEnergyData = mergeEventItems(lastEnergyData, data.items || []);
+      queueRender();
+    });
+    source.addEventListener("error", () => {
+      if (!eventsConnected) {
+        return;
+      }
+      eventsConnected = false;
+      scheduleRefresh();
+      refreshDashboard();
+    });
   }
 
   function formatMetricValue(value, options = {}) {
@@ -686,26 +760,151 @@ document.addEventListener("DOMContentLoaded", () => {
     return { cleared, failed };
   }
 
-  async function uploadToPrinter(printer, file) {
+  function sendGroupUpload(entry, printers, file, onProgress) {
     const formData = new FormData();
     formData.append("file", file, file.name);
-    try {
-      const res = await fetch(
-        `/api/printers/${printer.id}/upload-print?print_via=JustGroupPrinting`,
-        {
-          method: "POST",
-          credentials: "same-origin",
-          body: formData,
+    formData.append("printer_ids", printers.map((printer) => printer.id).join(","));
+    return new Promise((resolve) => {
+      const xhr = new XMLHttpRequest();
+      xhr.open("POST", `/api/printer-groups/${entry.id}/upload-print?print_via=JustGroupPrinting`);
+      xhr.withCredentials = true;
+      xhr.upload.addEventListener("progress", (event) => {
+        if (event.lengthComputable) {
+          onProgress(event.loaded, event.total);
         }
-      );
-      const data = await res.json().catch(() => ({}));
-      if (!res.ok) {
-        return { ok: false, error: data.error || "Upload failed.", code: data.code };
+      });
+      xhr.addEventListener("load", () => {
+        let data = {};
+        try {
+          data = JSON.parse(xhr.responseText || "{}");
+        } catch (error) {
+          data = {};
+        }
+        resolve({ ok: xhr.status >= 200 && xhr.status < 300, data });
+      });
+      xhr.addEventListener("error", () => resolve({ ok: false, data: {} }));
+      xhr.send(formData);
+    });
+  }
+
+  async function describeGcode(sha256) {
+    if (!sha256) {
+      return "";
+    }
+    try {
+      const res = await fetch(`/api/gcode-files/${sha256}/metadata`, { cache: "no-store" });
+      if (res.status !== 200) {
+        return "";
       }
-      return { ok: true };
+      const metadata = await res.json();
+      const parts = [];
+      if (Number.isFinite(metadata.estimated_time_s)) {
+        parts.push(`est. ${formatDuration(metadata.estimated_time_s)}`);
+      }
+      if (Number.isFinite(metadata.filament_weight_g)) {
+        parts.push(`${metadata.filament_weight_g.toFixed(1)} g`);
+      } else if (Number.isFinite(metadata.filament_length_mm)) {
+        parts.push(`${(metadata.filament_length_mm / 1000).toFixed(2)} m filament`);
+      }
+      if (metadata.layer_count) {
+        parts.push(`${metadata.layer_count} layers`);
+      }
+      if (metadata.slicer) {
+        parts.push(metadata.slicer);
+      }
+      return parts.join(", ");
     } catch (error) {
-      return { ok: false, error: "Upload failed." };
+      return "";
+    }
+  }
+
+  function formatFinishTime(timestamp) {
+    if (!Number.isFinite(timestamp)) {
+      return "";
+    }
+    return new Date(timestamp * 1000).toLocaleTimeString([], { hour: "2-digit", minute: "2-digit" });
+  }
+
+  function watchUploadBatch(batchId, onUpdate) {
+    return new Promise((resolve) => {
+      let done = false;
+      const finish = (batch) => {
+        if (!done) {
+          done = true;
+          resolve(batch);
+        }
+      };
+      const poll = async () => {
+        while (!done) {
+          const res = await fetch(`/api/upload-batches/${batchId}`, { credentials: "same-origin" });
+          const batch = await res.json().catch(() => null);
+          if (!res.ok || !batch) {
+            finish(null);
+            return;
+          }
+          onUpdate(batch);
+          if (batch.finished) {
+            finish(batch);
+            return;
+          }
+          await new Promise((wait) => setTimeout(wait, 1000));
+        }
+      };
+      if (!window.EventSource) {
+        poll();
+        return;
+      }
+      const source = new EventSource(`/api/upload-batches/${batchId}/events`);
+      source.addEventListener("batch", (event) => {
+        let batch = null;
+        try {
+          batch = JSON.parse(event.data);
+        } catch (error) {
+          return;
+        }
+        onUpdate(batch);
+        if (batch.finished) {
+          source.close();
+          finish(batch);
+        }
+      });
+      source.onerror = () => {
+        source.close();
+        poll();
+      };
+    });
+  }
+
+  async function uploadToGroupPrinters(entry, printers, file, button) {
+    const { ok, data } = await sendGroupUpload(entry, printers, file, (loaded, total) => {
+      const percent = total ? Math.floor((loaded * 100) / total) : 0;
+      button.textContent = `Sending ${percent}%`;
+    });
+    if (!ok) {
+      const skipped = Array.isArray(data.skipped) ? data.skipped : [];
+      return {
+        results: skipped.map((item) => ({ ok: false, error: item.error })),
+        error: data.error || "Upload failed.",
+      };
+    }
+    const results = (data.skipped || []).map((item) => ({ ok: false, error: item.error }));
+    const summary = describeGcode(data.items && data.items.length ? data.items[0].sha256 : null);
+    const batch = await watchUploadBatch(data.batch_id, (update) => {
+      const done = update.counts.completed + update.counts.failed;
+      const percent = Number.isFinite(update.progress) ? Math.floor(update.progress) : 0;
+      button.textContent = `${done}/${update.total} | ${percent}%`;
+      setNotice(
+        `Uploading ${file.name} to ${entry.name}: ${done}/${update.total} printer(s) done, ${percent}% sent.`,
+        "success"
+      );
+    });
+    if (!batch) {
+      return { results, error: "Upload failed." };
     }
+    batch.items.forEach((item) => {
+      results.push({ ok: item.state === "completed", error: item.error });
+    });
+    return { results, error: null, details: await summary, finishTime: formatFinishTime(batch.estimated_end_at) };
   }
 
   async function confirmAndClearGroupCheck(entry) {
@@ -843,7 +1042,14 @@ document.addEventListener("DOMContentLoaded", () => {
     }
 
     setNotice(`Uploading ${file.name} to ${entry.name}...`, "success");
-    const results = await Promise.all(readyPrinters.map((printer) => uploadToPrinter(printer, file)));
+    const { results, error, details, finishTime } = await uploadToGroupPrinters(entry, readyPrinters, file, button);
+    if (error && !results.length) {
+      setNotice(error, "error");
+      await refreshDashboard();
+      button.disabled = false;
+      button.textContent = previousLabel;
+      return;
+    }
     let successCount = 0;
     let failureCount = 0;
     const errorMessages = [];
@@ -874,7 +1080,12 @@ document.addEventListener("DOMContentLoaded", () => {
         );
       }
     } else {
-      setNotice(`Upload started for ${entry.name}: ${successCount} printer(s).`, "success");
+      setNotice(
+        `Upload started for ${entry.name}: ${successCount} printer(s).` +
+          `${details ? ` ${file.name}: ${details}.` : ""}` +
+          `${finishTime ? ` Expected to finish around ${finishTime}.` : ""}`,
+        "success"
+      );
     }
 
     await refreshDashboard();
@@ -1023,6 +1234,9 @@ document.addEventListener("DOMContentLoaded", () => {
       ]);
     updatePollInterval(settingsData);
     updateFilenameDisplayLength(settingsData);
+    lastPrintersData = printersData;
+    lastStatusData = statusData;
+    lastEnergyData = energyData;
     updateSnapshot(printersData, statusData, energyData);
     cachedPrinters = (printersData && printersData.items) || [];
     cachedStatuses = (statusData && statusData.items) || [];
@@ -1050,6 +1264,7 @@ document.addEventListener("DOMContentLoaded", () => {
     updateSortButtons();
     await refreshDashboard();
     scheduleRefresh();
+    connectEvents();
   }
 
   initDashboard();
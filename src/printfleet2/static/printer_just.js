@@ -9,6 +9,13 @@ document.addEventListener("DOMContentLoaded", () => {
   let sortState = { key: null, direction: "asc" };
   let pollIntervalId = null;
   let pollIntervalMs = 5000;
+  const eventsUrl = "/api/live-wall/events";
+  const eventsResyncMs = 60000;
+  let eventsConnected = false;
+  let renderQueued = false;
+  let lastPrintersData = null;
+  let lastStatusData = null;
+  let lastEnergyData = null;
   const DEFAULT_FILENAME_DISPLAY_LENGTH = 32;
   const MIN_FILENAME_DISPLAY_LENGTH = 10;
   const MAX_FILENAME_DISPLAY_LENGTH = 120;
@@ -95,7 +102,74 @@ document.addEventListener("DOMContentLoaded", () => {
     if (pollIntervalId) {
       clearInterval(pollIntervalId);
     }
-    pollIntervalId = setInterval(refreshDashboard, pollIntervalMs);
+    pollIntervalId = setInterval(refreshDashboard, eventsConnected ? eventsResyncMs : pollIntervalMs);
+  }
+
+  function mergeEventItems(data, items, removed) {
+    const current = data && Array.isArray(data.items) ? data.items : [];
+    const itemMap = new Map(current.map((item) => [Number(item.id), item]));
+    items.forEach((item) => {
+      const id = Number(item.id);
+      itemMap.set(id, { ...(itemMap.get(id) || {}), ...item });
+    });
+    (removed || []).forEach((id) => itemMap.delete(Number(id)));
+    return { ...(data || {}), items: Array.from(itemMap.values()) };
+  }
+
+  function parseEventData(event) {
+    try {
+      return JSON.parse(event.data);
+    } catch (error) {
+      return null;
+    }
+  }
+
+  function queueRender() {
+    if (renderQueued) {
+      return;
+    }
+    renderQueued = true;
+    window.requestAnimationFrame(() => {
+      renderQueued = false;
+      updateSnapshot(lastPrintersData, lastStatusData, lastEnergyData);
+      renderTable(cachedPrinters, cachedStatuses, cachedGroups, cachedTypes);
+    });
+  }
+
+  function connectEvents() {
+    if (!window.EventSource) {
+      return;
+    }
+    const source = new EventSource(eventsUrl);
+    source.addEventListener("open", () => {
+      eventsConnected = true;
+      scheduleRefresh();
+    });
+    source.addEventListener("status", (event) => {
+      const data = parseEventData(event);
+      if (!data || !lastStatusData) {
+        return;
+      }
+      lastStatusData = mergeEventItems(lastStatusData, data.items || [], data.removed);
+      cachedStatuses = lastStatusData.items;
+      queueRender();
+    });
+    source.addEventListener("energy", (event) => {
+      const data = parseEventData(event);
+      if (!data) {
+        return;
+      }
+      lastEnergyData = mergeEventItems(lastEnergyData, data.items || []);
+      queueRender();
+    });
+    source.addEventListener("error", () => {
+      if (!eventsConnected) {
+        return;
+      }
+      eventsConnected = false;
+      scheduleRefresh();
+      refreshDashboard();
+    });
   }
 
   function formatMetricValue(value, options = {}) {
@@ -418,6 +492,149 @@ document.addEventListener("DOMContentLoaded", () => {
     return true;
   }
 
+  function formatBytes(value) {
+    const bytes = Number(value);
+    if (!Number.isFinite(bytes) || bytes < 0) {
+      return "-";
+    }
+    const units = ["B", "KB", "MB", "GB"];
+    let size = bytes;
+    let unit = 0;
+    while (size >= 1024 && unit < units.length - 1) {
+      size /= 1024;
+      unit += 1;
+    }
+    return `${size.toFixed(unit === 0 ? 0 : 1)} ${units[unit]}`;
+  }
+
+  function formatUploadProgress(job) {
+    const parts = [];
+    if (Number.isFinite(job.progress)) {
+      parts.push(`${Math.floor(job.progress)}%`);
+    }
+    parts.push(`${formatBytes(job.bytes_sent)} / ${formatBytes(job.size_bytes)}`);
+    if (Number.isFinite(job.throughput_bps) && job.throughput_bps > 0) {
+      parts.push(`${formatBytes(job.throughput_bps)}/s`);
+    }
+    if (Number.isFinite(job.eta_s)) {
+      parts.push(`ETA ${Math.ceil(job.eta_s)} s`);
+    }
+    return parts.join(" | ");
+  }
+
+  async function describeGcode(sha256) {
+    if (!sha256) {
+      return "";
+    }
+    try {
+      const res = await fetch(`/api/gcode-files/${sha256}/metadata`, { cache: "no-store" });
+      if (res.status !== 200) {
+        return "";
+      }
+      const metadata = await res.json();
+      const parts = [];
+      if (Number.isFinite(metadata.estimated_time_s)) {
+        parts.push(`est. ${formatDuration(metadata.estimated_time_s)}`);
+      }
+      if (Number.isFinite(metadata.filament_weight_g)) {
+        parts.push(`${metadata.filament_weight_g.toFixed(1)} g`);
+      } else if (Number.isFinite(metadata.filament_length_mm)) {
+        parts.push(`${(metadata.filament_length_mm / 1000).toFixed(2)} m filament`);
+      }
+      if (metadata.layer_count) {
+        parts.push(`${metadata.layer_count} layers`);
+      }
+      if (metadata.slicer) {
+        parts.push(metadata.slicer);
+      }
+      return parts.join(", ");
+    } catch (error) {
+      return "";
+    }
+  }
+
+  function formatFinishTime(timestamp) {
+    if (!Number.isFinite(timestamp)) {
+      return "";
+    }
+    return new Date(timestamp * 1000).toLocaleTimeString([], { hour: "2-digit", minute: "2-digit" });
+  }
+
+  function sendUploadForm(url, formData, onProgress) {
+    return new Promise((resolve) => {
+      const xhr = new XMLHttpRequest();
+      xhr.open("POST", url);
+      xhr.withCredentials = true;
+      xhr.upload.addEventListener("progress", (event) => {
+        if (event.lengthComputable) {
+          onProgress(event.loaded, event.total);
+        }
+      });
+      xhr.addEventListener("load", () => {
+        let data = {};
+        try {
+          data = JSON.parse(xhr.responseText || "{}");
+        } catch (error) {
+          data = {};
+        }
+        resolve({ ok: xhr.status >= 200 && xhr.status < 300, data });
+      });
+      xhr.addEventListener("error", () => resolve({ ok: false, data: {} }));
+      xhr.send(formData);
+    });
+  }
+
+  function watchUpload(jobId, onUpdate) {
+    const finished = new Set(["completed", "failed"]);
+    return new Promise((resolve) => {
+      let done = false;
+      const finish = (job) => {
+        if (done) {
+          return;
+        }
+        done = true;
+        resolve(job);
+      };
+      const poll = async () => {
+        while (!done) {
+          const job = await fetchJson(`/api/uploads/${jobId}`);
+          if (!job) {
+            finish(null);
+            return;
+          }
+          onUpdate(job);
+          if (finished.has(job.state)) {
+            finish(job);
+            return;
+          }
+          await new Promise((wait) => setTimeout(wait, 1000));
+        }
+      };
+      if (!window.EventSource) {
+        poll();
+        return;
+      }
+      const source = new EventSource(`/api/uploads/${jobId}/events`);
+      source.addEventListener("upload", (event) => {
+        let job = null;
+        try {
+          job = JSON.parse(event.data);
+        } catch (error) {
+          return;
+        }
+        onUpdate(job);
+        if (finished.has(job.state)) {
+          source.close();
+          finish(job);
+        }
+      });
+      source.onerror = () => {
+        source.close();
+        poll();
+      };
+    });
+  }
+
   async function uploadAndPrint(printer, file, button) {
     if (!printer || !file) {
       return;
@@ -426,17 +643,23 @@ document.addEventListener("DOMContentLoaded", () => {
     const previousLabel = button.textContent;
     button.disabled = true;
     button.textContent = "Uploading...";
-    setNotice(`Uploading ${file.name} to ${printerName}...`, "success");
+    setNotice(`Sending ${file.name} to the server...`, "success");
     const formData = new FormData();
     formData.append("file", file, file.name);
     try {
-      const res = await fetch(`/api/printers/${printer.id}/upload-print`, {
-        method: "POST",
-        credentials: "same-origin",
-        body: formData,
-      });
-      const data = await res.json().catch(() => ({}));
-      if (!res.ok) {
+      const { ok, data } = await sendUploadForm(
+        `/api/printers/${printer.id}/upload-print`,
+        formData,
+        (loaded, total) => {
+          const percent = total ? Math.floor((loaded * 100) / total) : 0;
+          button.textContent = `Sending ${percent}%`;
+          setNotice(
+            `Sending ${file.name} to the server: ${percent}% (${formatBytes(loaded)} / ${formatBytes(total)})`,
+            "success"
+          );
+        }
+      );
+      if (!ok) {
         if (data.code === "printer_busy") {
           alertPrinterBusy(printer, data.job_name);
         }
@@ -444,9 +667,32 @@ document.addEventListener("DOMContentLoaded", () => {
           window.alert(data.error || "Printer check required before upload.");
         }
         setNotice(data.error || "Upload failed.", "error");
-      } else {
-        setNotice(`Upload started for ${printerName}.`, "success");
+        return;
+      }
+      const summary = describeGcode(data.upload && data.upload.sha256);
+      const job = await watchUpload(data.job_id, (update) => {
+        if (update.state === "queued") {
+          button.textContent = "Queued";
+          setNotice(`${file.name} is queued for ${printerName}.`, "success");
+        } else if (update.state === "uploading") {
+          button.textContent = Number.isFinite(update.progress) ? `${Math.floor(update.progress)}%` : "Uploading...";
+          setNotice(`Uploading ${file.name} to ${printerName}: ${formatUploadProgress(update)}`, "success");
+        } else if (update.state === "confirming") {
+          button.textContent = "Checking...";
+          setNotice(`Checking whether ${printerName} started ${file.name}...`, "success");
+        }
+      });
+      if (job && job.state === "completed") {
+        const details = await summary;
+        const finishTime = formatFinishTime(job.estimated_end_at);
+        setNotice(
+          `Upload started for ${printerName}.${details ? ` ${file.name}: ${details}.` : ""}` +
+            `${finishTime ? ` Expected to finish around ${finishTime}.` : ""}`,
+          "success"
+        );
         await refreshDashboard();
+      } else {
+        setNotice((job && job.error) || "Upload failed.", "error");
       }
     } catch (error) {
       setNotice("Upload failed.", "error");
@@ -940,6 +1186,9 @@ document.addEventListener("DOMContentLoaded", () => {
     ]);
     updatePollInterval(settingsData);
     updateFilenameDisplayLength(settingsData);
+    lastPrintersData = printersData;
+    lastStatusData = statusData;
+    lastEnergyData = energyData;
     updateSnapshot(printersData, statusData, energyData);
     cachedPrinters = (printersData && printersData.items) || [];
     cachedStatuses = (statusData && statusData.items) || [];
@@ -967,6 +1216,7 @@ document.addEventListener("DOMContentLoaded", () => {
     updateSortButtons();
     await refreshDashboard();
     scheduleRefresh();
+    connectEvents();
   }
 
   initDashboard();
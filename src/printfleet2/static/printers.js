@@ -179,6 +179,7 @@ document.addEventListener("DOMContentLoaded", () => {
       enabled: raw.enabled !== undefined ? !!raw.enabled : true,
       scanning:
         raw.scanning !== undefined ? !!raw.scanning : raw.no_scanning !== undefined ? !raw.no_scanning : true,
+      status_push: !!raw.status_push,
       print_check_status: normalizePrintCheckStatus(raw.print_check_status),
     };
   }
@@ -817,6 +818,7 @@ document.addEventListener("DOMContentLoaded", () => {
       https: document.getElementById("printerHttps").checked,
       enabled: document.getElementById("printerEnabled").checked,
       scanning: document.getElementById("printerScanning").checked,
+      status_push: document.getElementById("printerStatusPush").checked,
       group_id: Number.isFinite(parsedGroup) ? parsedGroup : null,
     };
   }
@@ -850,6 +852,7 @@ document.addEventListener("DOMContentLoaded", () => {
     document.getElementById("printerEnabled").checked = !!printer.enabled;
     document.getElementById("printerScanning").checked =
       printer.scanning !== undefined ? !!printer.scanning : !printer.no_scanning;
+    document.getElementById("printerStatusPush").checked = !!printer.status_push;
     if (groupSelect) {
       renderGroupOptions(printer.group_id);
     }
@@ -882,6 +885,7 @@ document.addEventListener("DOMContentLoaded", () => {
     document.getElementById("printerHttps").checked = false;
     document.getElementById("printerEnabled").checked = true;
     document.getElementById("printerScanning").checked = true;
+    document.getElementById("printerStatusPush").checked = false;
     if (groupSelect) {
       renderGroupOptions("");
     }
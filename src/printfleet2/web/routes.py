@@ -1,16 +1,19 @@
 import csv
+import hashlib
 import io
+import json
+import logging
 import os
 import shutil
 import subprocess
 import time
-from datetime import datetime, date, timezone
+from datetime import datetime, date, timedelta, timezone
+from typing import Iterable
 
-from flask import Blueprint, request, session as flask_session, Response, render_template, redirect, stream_with_context, url_for
+from flask import Blueprint, request, session as flask_session, Response, make_response, render_template, redirect, stream_with_context, url_for
 
 from printfleet2.db.session import session_scope
 from printfleet2.models.printer import Printer
-from printfleet2.models.printer_group import PrinterGroup
 from printfleet2.services.printer_service import (
     create_printer,
     delete_printer,
@@ -20,7 +23,6 @@ from printfleet2.services.printer_service import (
     printer_to_dict,
     printers_to_dict,
     update_printer,
-    update_print_time_totals,
 )
 from printfleet2.services.printer_group_service import (
     create_printer_group,
@@ -39,11 +41,74 @@ from printfleet2.services.printer_type_service import (
     normalize_type_name,
     printer_type_to_dict,
 )
+from printfleet2.services.anomaly_service import get_anomaly_detector
+from printfleet2.services.async_http_service import get_circuit_breaker_stats, reset_circuit_breakers
+from printfleet2.services.gcode_analysis_service import (
+    MAX_BATCH_SIZE,
+    gcode_metadata_summary,
+    get_cached_gcode_metadata,
+    get_gcode_analyzer,
+    get_gcode_metadata,
+)
+from printfleet2.services.gcode_library_service import (
+    delete_gcode_file,
+    gcode_file_path,
+    gcode_file_to_dict,
+    gcode_library_usage,
+    get_gcode_file,
+    list_gcode_files,
+    normalize_sha256,
+    store_gcode_file,
+    touch_gcode_file,
+)
+from printfleet2.services.mqtt_service import get_mqtt_status
+from printfleet2.services.power_history_service import ENERGY_RESOLUTIONS, energy_series
 from printfleet2.services.printer_status_service import (
     build_printer_snapshots,
-    collect_plug_energy,
-    collect_plug_statuses,
     collect_printer_statuses,
+    get_cached_statuses,
+    get_cached_statuses_by_id,
+    get_plug_readings,
+    get_plug_snapshot,
+    get_poll_schedule,
+    get_single_flight_stats,
+    get_status_poller,
+    get_status_snapshot,
+    refresh_status_poller,
+    status_change_sequence,
+    wait_for_status_change,
+)
+from printfleet2.services.status_event_service import (
+    EVENT_TYPES,
+    flush_status_events,
+    list_printer_events,
+    printer_event_to_dict,
+)
+from printfleet2.services.status_history_service import (
+    DEFAULT_HISTORY_POINTS,
+    DOWNSAMPLE_METHODS,
+    HISTORY_SECONDS,
+    MAX_HISTORY_POINTS,
+    get_status_history,
+)
+from printfleet2.services.telegram_service import get_telegram_notifier
+from printfleet2.services.upload_queue_service import FINISHED_STATES, get_upload_queue
+from printfleet2.services.webhook_service import (
+    DELIVERY_STATUSES,
+    count_webhook_deliveries,
+    create_webhook,
+    delete_webhook,
+    get_webhook,
+    get_webhook_delivery,
+    get_webhook_dispatcher,
+    invalidate_webhooks,
+    list_webhook_deliveries,
+    list_webhooks,
+    normalize_event_types,
+    normalize_webhook_url,
+    requeue_webhook_delivery,
+    webhook_delivery_to_dict,
+    webhook_to_dict,
 )
 from printfleet2.services.settings_service import (
     ensure_settings_row,
@@ -54,11 +119,11 @@ from printfleet2.services.settings_service import (
     settings_to_dict,
     update_settings,
 )
-from printfleet2.services.printer_upload_service import upload_and_print
+from printfleet2.services.printer_upload_service import discard_spooled_upload, spool_existing_file, spool_upload
+from printfleet2.services.print_accounting_service import apply_status_samples, get_fleet_summary
 from printfleet2.services.print_job_service import (
     count_print_jobs,
     count_print_jobs_today,
-    create_print_job,
     list_print_jobs,
     normalize_print_via,
     print_job_to_dict,
@@ -77,10 +142,11 @@ from printfleet2.services.auth_service import hash_password, verify_password
 from printfleet2.version import VERSION
 
 
+logger = logging.getLogger(__name__)
 bp = Blueprint("web", __name__)
 
-_PENDING_UPLOADS: dict[int, list[dict]] = {}
-_PENDING_UPLOAD_TTL_SECONDS = 30 * 60
+EVENT_STREAM_RETRY_MS = 5000
+EVENT_STREAM_KEEPALIVE = 15.0
 
 
 def format_uptime_display(start_ts: float | None) -> str | None:
@@ -290,7 +356,7 @@ def build_live_wall_config(settings: dict) -> dict:
 
 
 def build_live_wall_printers(printers) -> list[dict]:
-    status_map = collect_printer_statuses([printer for printer in printers if printer.enabled], include_plug=True)
+    status_map = get_cached_statuses([printer for printer in printers if printer.enabled])
     active_printers = []
     for printer in printers:
         if not printer.enabled:
@@ -335,6 +401,8 @@ def build_live_wall_printers(printers) -> list[dict]:
                 "error_message": status.get("error_message"),
                 "plug_label": status.get("plug_label"),
                 "plug_state": status.get("plug_state"),
+                "stale": bool(status.get("stale")),
+                "age_ms": status.get("age_ms"),
             }
         )
     return active_printers
@@ -423,6 +491,15 @@ def clean_optional(value: object | None) -> str | None:
     return value or None
 
 
+def _is_admin() -> bool:
+    user_id = flask_session.get("user_id")
+    if not user_id:
+        return False
+    with session_scope() as db_session:
+        user = get_user(db_session, int(user_id))
+        return user is not None and user.role in {"admin", "superadmin"}
+
+
 def parse_iso_date(value: str | None) -> date | None:
     if not value:
         return None
@@ -432,142 +509,6 @@ def parse_iso_date(value: str | None) -> date | None:
         return None
 
 
-def _normalize_job_filename(value: object | None) -> str | None:
-    if value is None:
-        return None
-    if isinstance(value, str):
-        cleaned = value.strip()
-    else:
-        cleaned = str(value).strip()
-    if not cleaned:
-        return None
-    for sep in ("/", "\\"):
-        if sep in cleaned:
-            cleaned = cleaned.rsplit(sep, 1)[-1]
-    return cleaned or None
-
-
-def _job_name_matches(filename: str, job_name: str | None) -> bool:
-    normalized_job = _normalize_job_filename(job_name)
-    normalized_file = _normalize_job_filename(filename)
-    if not normalized_job or not normalized_file:
-        return False
-    job_lower = normalized_job.lower()
-    file_lower = normalized_file.lower()
-    job_stem = job_lower.rsplit(".", 1)[0]
-    file_stem = file_lower.rsplit(".", 1)[0]
-    if job_lower == file_lower:
-        return True
-    if job_stem and file_stem and job_stem == file_stem:
-        return True
-    safe_name = filename.replace("\\", "_").replace("/", "_").lower()
-    if job_lower == safe_name:
-        return True
-    return job_lower.endswith(file_lower)
-
-
-def _is_active_job_label(label: str | None) -> bool:
-    if not label:
-        return False
-    lowered = str(label).lower()
-    return any(token in lowered for token in ("printing", "paused", "pausing", "resuming"))
-
-
-def _confirm_print_started(printer: Printer, filename: str, attempts: int = 5, delay: float = 1.0) -> bool:
-    for idx in range(max(1, attempts)):
-        status_map = collect_printer_statuses([printer], include_plug=False)
-        status = status_map.get(printer.id, {})
-        label = status.get("label")
-        job_name = clean_optional(status.get("job_name"))
-        if job_name:
-            if _job_name_matches(filename, job_name):
-                return True
-        elif _is_active_job_label(label):
-            return True
-        if idx < attempts - 1:
-            time.sleep(delay)
-    return False
-
-
-def _record_pending_upload(
-    printer_id: int,
-    filename: str,
-    printer_name: str,
-    username: str,
-    print_via: str,
-) -> None:
-    now = time.time()
-    _cleanup_pending_uploads(now)
-    attempts = _PENDING_UPLOADS.setdefault(printer_id, [])
-    attempts = [entry for entry in attempts if not _job_name_matches(entry["filename"], filename)]
-    attempts.append(
-        {
-            "ts": now,
-            "filename": filename,
-            "printer_name": printer_name,
-            "username": username,
-            "print_via": print_via,
-        }
-    )
-    _PENDING_UPLOADS[printer_id] = attempts
-
-
-def _cleanup_pending_uploads(now: float) -> None:
-    cutoff = now - _PENDING_UPLOAD_TTL_SECONDS
-    for printer_id in list(_PENDING_UPLOADS.keys()):
-        attempts = [entry for entry in _PENDING_UPLOADS[printer_id] if entry["ts"] >= cutoff]
-        if attempts:
-            _PENDING_UPLOADS[printer_id] = attempts
-        else:
-            _PENDING_UPLOADS.pop(printer_id, None)
-
-
-def _pop_pending_upload(printer_id: int, job_name: str | None) -> dict | None:
-    if not job_name:
-        return None
-    attempts = _PENDING_UPLOADS.get(printer_id)
-    if not attempts:
-        return None
-    for idx, attempt in enumerate(attempts):
-        if _job_name_matches(attempt["filename"], job_name):
-            return attempts.pop(idx)
-    return None
-
-
-def _discard_pending_upload(printer_id: int, filename: str) -> None:
-    attempts = _PENDING_UPLOADS.get(printer_id)
-    if not attempts:
-        return
-    attempts = [entry for entry in attempts if not _job_name_matches(entry["filename"], filename)]
-    if attempts:
-        _PENDING_UPLOADS[printer_id] = attempts
-    else:
-        _PENDING_UPLOADS.pop(printer_id, None)
-
-
-def _flush_pending_uploads(session, status_map: dict[int, dict], name_map: dict[int, str]) -> None:
-    now = time.time()
-    _cleanup_pending_uploads(now)
-    for printer_id, status in status_map.items():
-        label = status.get("label")
-        job_name = clean_optional(status.get("job_name"))
-        if not job_name and not _is_active_job_label(label):
-            continue
-        attempt = _pop_pending_upload(printer_id, job_name)
-        if not attempt:
-            continue
-        printer_name = name_map.get(printer_id) or attempt.get("printer_name") or "Unknown printer"
-        username = attempt.get("username") or "unknown"
-        print_via = attempt.get("print_via") or "unknown"
-        create_print_job(
-            session,
-            gcode_filename=attempt.get("filename") or job_name or "unknown",
-            printer_name=printer_name,
-            username=username,
-            print_via=print_via,
-        )
-
-
 def normalize_group_id(payload: dict, session) -> tuple[bool, int | None, dict | None]:
     if "group_id" not in payload:
         return False, None, None
@@ -597,7 +538,7 @@ def index():
         total_print_jobs_today = count_print_jobs_today(session)
         total_print_jobs_total = count_print_jobs(session)
         uptime_display = format_uptime_display(settings.uptime_start_ts) or "--"
-    status_map = collect_printer_statuses(snapshots, include_plug=False)
+    status_map = get_cached_statuses(snapshots)
     active_prints = 0
     active_errors = 0
     for printer in snapshots:
@@ -640,7 +581,7 @@ def printer_dashboard_page():
         total_print_jobs_today = count_print_jobs_today(session)
         total_print_jobs_total = count_print_jobs(session)
         uptime_display = format_uptime_display(settings.uptime_start_ts) or "--"
-    status_map = collect_printer_statuses(snapshots, include_plug=False)
+    status_map = get_cached_statuses(snapshots)
     active_prints = 0
     active_errors = 0
     for printer in snapshots:
@@ -682,7 +623,7 @@ def printer_just_page():
         total_print_jobs_today = count_print_jobs_today(session)
         total_print_jobs_total = count_print_jobs(session)
         uptime_display = format_uptime_display(settings.uptime_start_ts) or "--"
-    status_map = collect_printer_statuses(snapshots, include_plug=False)
+    status_map = get_cached_statuses(snapshots)
     active_prints = 0
     active_errors = 0
     for printer in snapshots:
@@ -725,7 +666,7 @@ def printer_group_just_page():
         total_print_jobs_today = count_print_jobs_today(session)
         total_print_jobs_total = count_print_jobs(session)
         uptime_display = format_uptime_display(settings.uptime_start_ts) or "--"
-    status_map = collect_printer_statuses(snapshots, include_plug=False)
+    status_map = get_cached_statuses(snapshots)
     active_prints = 0
     active_errors = 0
     for printer in snapshots:
@@ -774,7 +715,9 @@ def put_settings():
     with session_scope() as session:
         settings = ensure_settings_row(session)
         update_settings(settings, payload)
-        return settings_to_dict(settings)
+        result = settings_to_dict(settings)
+    refresh_status_poller()
+    return result
 
 
 @bp.get("/api/printers")
@@ -1094,97 +1037,208 @@ def delete_printer_type(type_id: int):
         return {"status": "deleted"}
 
 
-@bp.get("/api/live-wall/status")
-def live_wall_status():
-    with session_scope() as session:
-        settings = ensure_settings_row(session)
-        printers = list_printers(session)
-        enabled_printers = [printer for printer in printers if printer.enabled]
-        snapshots = build_printer_snapshots(enabled_printers)
-        total_printers = len(printers)
-        name_map = {printer.id: printer.name for printer in enabled_printers}
-        uptime_display = format_uptime_display(settings.uptime_start_ts) or "--"
-    status_map = collect_printer_statuses(snapshots, include_plug=False)
-    items = []
-    total_print_time_today_seconds = 0.0
-    total_print_time_total_seconds = 0.0
-    total_print_jobs_today = 0
-    total_print_jobs_total = 0
-    for printer in snapshots:
-        status = status_map.get(
-            printer.id,
-            {
-                "label": "Unknown",
-                "state": "muted",
-                "temp_hotend": None,
-                "temp_bed": None,
-                "target_hotend": None,
-                "target_bed": None,
-                "job_name": None,
-                "progress": None,
-                "elapsed": None,
-                "remaining": None,
-                "error_message": None,
-            },
-        )
-        items.append(
-            {
-                "id": printer.id,
-                "name": name_map.get(printer.id),
-                "status": status["label"],
-                "status_state": status["state"],
-                "temp_hotend": status.get("temp_hotend"),
-                "temp_bed": status.get("temp_bed"),
-                "target_hotend": status.get("target_hotend"),
-                "target_bed": status.get("target_bed"),
-                "job_name": status.get("job_name"),
-                "progress": status.get("progress"),
-                "elapsed": status.get("elapsed"),
-                "remaining": status.get("remaining"),
-                "error_message": status.get("error_message"),
-            }
-        )
-    if snapshots:
+def _live_wall_status_item(printer_id: int, name: str | None, status: dict | None) -> dict:
+    status = status or {"label": "Unknown", "state": "muted"}
+    return {
+        "id": printer_id,
+        "name": name,
+        "status": status["label"],
+        "status_state": status["state"],
+        "temp_hotend": status.get("temp_hotend"),
+        "temp_bed": status.get("temp_bed"),
+        "target_hotend": status.get("target_hotend"),
+        "target_bed": status.get("target_bed"),
+        "job_name": status.get("job_name"),
+        "progress": status.get("progress"),
+        "elapsed": status.get("elapsed"),
+        "remaining": status.get("remaining"),
+        "error_message": status.get("error_message"),
+        "stale": bool(status.get("stale")),
+        "age_ms": status.get("age_ms"),
+    }
+
+
+def _sse_event(event: str, payload: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(payload, separators=(',', ':'))}\n\n"
+
+
+def _changed_items(items: dict[int, dict], sent: dict[int, dict], ignore: set[str]) -> list[dict]:
+    changed = []
+    for item_id, item in items.items():
+        compare = {key: value for key, value in item.items() if key not in ignore}
+        if sent.get(item_id) != compare:
+            sent[item_id] = compare
+            changed.append(item)
+    return changed
+
+
+def _statuses_by_id(printer_ids: Iterable[int]) -> dict[int, dict]:
+    printer_ids = set(printer_ids)
+    status_map = get_cached_statuses_by_id(printer_ids) if get_status_poller().running else {}
+    if printer_ids - set(status_map):
         with session_scope() as session:
-            printer_ids = [printer.id for printer in snapshots]
-            printers = session.query(Printer).filter(Printer.id.in_(printer_ids)).all()
-            total_print_time_today_seconds, total_print_time_total_seconds = update_print_time_totals(
-                printers,
-                status_map,
+            missing = build_printer_snapshots(
+                printer
+                for printer in list_printers(session)
+                if printer.id in printer_ids and printer.id not in status_map
             )
-            total_print_jobs_today = count_print_jobs_today(session)
-            total_print_jobs_total = count_print_jobs(session)
-            group_ids_to_check: set[int] = set()
-            for printer in printers:
-                status = status_map.get(printer.id, {})
-                label = status.get("label")
-                if isinstance(label, str) and "printing" in label.lower():
-                    if (printer.print_check_status or "").strip().lower() != "check":
-                        printer.print_check_status = "check"
-                    if printer.group_id:
-                        group_ids_to_check.add(int(printer.group_id))
-            if group_ids_to_check:
-                groups = (
-                    session.query(PrinterGroup)
-                    .filter(PrinterGroup.id.in_(group_ids_to_check))
-                    .all()
-                )
-                for group in groups:
-                    if (group.print_check_status or "").strip().lower() != "check":
-                        group.print_check_status = "check"
-            _flush_pending_uploads(session, status_map, name_map)
-    else:
+        status_map.update(get_cached_statuses(missing))
+    return status_map
+
+
+@bp.get("/api/live-wall/events")
+def live_wall_events():
+    def load_names() -> dict[int, str]:
         with session_scope() as session:
-            total_print_jobs_today = count_print_jobs_today(session)
-            total_print_jobs_total = count_print_jobs(session)
+            return {printer.id: printer.name for printer in list_printers(session) if printer.enabled}
+
+    def stream():
+        names = load_names()
+        sent_status: dict[int, dict] = {}
+        sent_plugs: dict[int, dict] = {}
+        sent_energy: dict[int, dict] = {}
+        sent_anomalies: list[dict] | None = None
+        sequence = status_change_sequence()
+        yield f"retry: {EVENT_STREAM_RETRY_MS}\n\n"
+        while True:
+            statuses = get_cached_statuses_by_id()
+            if set(statuses) - set(names):
+                names = load_names()
+            if set(names) - set(statuses):
+                statuses = _statuses_by_id(names)
+            status_items = {
+                printer_id: _live_wall_status_item(printer_id, names.get(printer_id), status)
+                for printer_id, status in statuses.items()
+                if printer_id in names
+            }
+            removed = [printer_id for printer_id in sent_status if printer_id not in status_items]
+            for printer_id in removed:
+                sent_status.pop(printer_id, None)
+            changed = _changed_items(status_items, sent_status, {"age_ms"})
+            if changed or removed:
+                yield _sse_event("status", {"items": changed, "removed": removed})
+            anomalies = [anomaly for anomaly in get_anomaly_detector().active() if anomaly["printer_id"] in names]
+            if anomalies != sent_anomalies:
+                sent_anomalies = anomalies
+                yield _sse_event("anomaly", {"items": anomalies})
+            plug_snapshot = get_plug_snapshot()
+            plug_items = {
+                printer_id: {
+                    "id": printer_id,
+                    "plug_label": plug.get("plug_label"),
+                    "plug_state": plug.get("plug_state"),
+                    "stale": bool(plug.get("stale")),
+                }
+                for printer_id, plug in plug_snapshot.plugs.items()
+                if printer_id in names
+            }
+            changed = _changed_items(plug_items, sent_plugs, set())
+            if changed:
+                yield _sse_event("plug", {"items": changed})
+            energy_items = {
+                printer_id: {
+                    "id": printer_id,
+                    "power_w": energy.get("power_w"),
+                    "today_wh": energy.get("today_wh"),
+                    "error": energy.get("error"),
+                    "stale": bool(energy.get("stale")),
+                }
+                for printer_id, energy in plug_snapshot.energy.items()
+                if printer_id in names
+            }
+            changed = _changed_items(energy_items, sent_energy, set())
+            if changed:
+                yield _sse_event("energy", {"items": changed})
+            next_sequence = wait_for_status_change(sequence, EVENT_STREAM_KEEPALIVE)
+            if next_sequence == sequence:
+                yield ": keep-alive\n\n"
+            sequence = next_sequence
+
+    return Response(
+        stream_with_context(stream()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@bp.get("/api/live-wall/status")
+def live_wall_status():
+    since_value = request.args.get("since")
+    since = None
+    if since_value not in {None, ""}:
+        try:
+            since = int(since_value)
+        except (TypeError, ValueError):
+            return {"error": "invalid_since"}, 400
+        if since < 0:
+            return {"error": "invalid_since"}, 400
+    snapshot = get_status_snapshot()
+    summary = get_fleet_summary()
+    name_map = dict(summary.printers)
+    status_map = _statuses_by_id(name_map)
+    if not get_status_poller().running:
+        summary = apply_status_samples(
+            {printer_id: status for printer_id, status in status_map.items() if not status.get("stale")}
+        )
+        name_map = dict(summary.printers)
+    changed_ids, removed_ids = snapshot.changes_since(since) if since is not None else (None, set())
+    all_items = [
+        _live_wall_status_item(printer_id, name, status_map.get(printer_id)) for printer_id, name in summary.printers
+    ]
+    items = [item for item in all_items if changed_ids is None or item["id"] in changed_ids]
+    payload = {
+        "version": snapshot.version,
+        "total_printers": summary.total_printers,
+        "total_print_time_today_seconds": summary.print_time_today_seconds,
+        "total_print_time_total_seconds": summary.print_time_total_seconds,
+        "total_print_jobs_today": summary.print_jobs_today,
+        "total_print_jobs_total": summary.print_jobs_total,
+        "uptime_printfleet2": format_uptime_display(summary.uptime_start_ts) or "--",
+        "anomalies": [anomaly for anomaly in get_anomaly_detector().active() if anomaly["printer_id"] in name_map],
+    }
+    etag = _live_wall_status_etag(payload, all_items)
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+        response.set_etag(etag, weak=True)
+        return response
+    payload["items"] = items
+    if since is not None:
+        payload["full"] = changed_ids is None
+        payload["removed"] = sorted(removed_ids - set(name_map))
+    response = make_response(payload)
+    response.set_etag(etag, weak=True)
+    return response
+
+
+def _live_wall_status_etag(payload: dict, items: list[dict]) -> str:
+    statuses = [{key: value for key, value in item.items() if key != "age_ms"} for item in items]
+    digest = hashlib.sha1(json.dumps([payload, statuses], sort_keys=True, default=str).encode("utf-8")).hexdigest()
+    return f"{payload['version']}-{digest[:16]}"
+
+
+@bp.get("/api/anomalies")
+def anomalies():
+    since_value = request.args.get("since")
+    since = 0
+    if since_value not in {None, ""}:
+        try:
+            since = int(since_value)
+        except (TypeError, ValueError):
+            return {"error": "invalid_since"}, 400
+        if since < 0:
+            return {"error": "invalid_since"}, 400
+    with session_scope() as session:
+        names = {printer.id: printer.name for printer in list_printers(session)}
+    detector = get_anomaly_detector()
+    events, last_id = detector.events(since)
     return {
-        "items": items,
-        "total_printers": total_printers,
-        "total_print_time_today_seconds": total_print_time_today_seconds,
-        "total_print_time_total_seconds": total_print_time_total_seconds,
-        "total_print_jobs_today": total_print_jobs_today,
-        "total_print_jobs_total": total_print_jobs_total,
-        "uptime_printfleet2": uptime_display,
+        "last_id": last_id,
+        "active": [
+            {**anomaly, "name": names[anomaly["printer_id"]]}
+            for anomaly in detector.active()
+            if anomaly["printer_id"] in names
+        ],
+        "events": [{**event, "name": names.get(event["printer_id"])} for event in events],
     }
 
 
@@ -1193,7 +1247,7 @@ def live_wall_plug_status():
     with session_scope() as session:
         printers = [printer for printer in list_printers(session) if printer.enabled]
         snapshots = build_printer_snapshots(printers)
-    status_map = collect_plug_statuses(snapshots)
+    status_map, _ = get_plug_readings(snapshots)
     items = []
     for printer in snapshots:
         status = status_map.get(printer.id)
@@ -1204,20 +1258,233 @@ def live_wall_plug_status():
                 "id": printer.id,
                 "plug_label": status.get("plug_label"),
                 "plug_state": status.get("plug_state"),
+                "stale": bool(status.get("stale")),
             }
         )
     return {"items": items}
 
 
+@bp.get("/api/live-wall/poll-schedule")
+def live_wall_poll_schedule():
+    with session_scope() as session:
+        names = {printer.id: printer.name for printer in list_printers(session)}
+    items = []
+    for entry in get_poll_schedule():
+        if entry["printer_id"] not in names:
+            continue
+        item = {"id": entry["printer_id"], "name": names[entry["printer_id"]]}
+        item.update({key: value for key, value in entry.items() if key != "printer_id"})
+        for key in ("next_due_at", "last_polled_at"):
+            if item[key] is not None:
+                item[key] = datetime.fromtimestamp(item[key], timezone.utc).isoformat()
+        items.append(item)
+    return {"items": items}
+
+
+@bp.get("/api/admin/circuit-breakers")
+def admin_circuit_breakers():
+    if not _is_admin():
+        return {"error": "forbidden"}, 403
+    return {"items": get_circuit_breaker_stats()}
+
+
+@bp.post("/api/admin/circuit-breakers/reset")
+def admin_reset_circuit_breakers():
+    if not _is_admin():
+        return {"error": "forbidden"}, 403
+    payload = request.get_json(silent=True) or {}
+    host = clean_optional(payload.get("host"))
+    port = None
+    if payload.get("port") not in (None, ""):
+        try:
+            port = int(payload.get("port"))
+        except (TypeError, ValueError):
+            return {"error": "invalid_port"}, 400
+    return {"reset": reset_circuit_breakers(host, port)}
+
+
+@bp.get("/api/admin/single-flight")
+def admin_single_flight():
+    if not _is_admin():
+        return {"error": "forbidden"}, 403
+    return {"items": get_single_flight_stats()}
+
+
+@bp.get("/api/admin/telegram")
+def admin_telegram():
+    if not _is_admin():
+        return {"error": "forbidden"}, 403
+    notifier = get_telegram_notifier()
+    if notifier is None:
+        return {"enabled": False}
+    return {"enabled": True, **notifier.to_dict()}
+
+
+@bp.post("/api/admin/telegram/test")
+def admin_telegram_test():
+    if not _is_admin():
+        return {"error": "forbidden"}, 403
+    notifier = get_telegram_notifier()
+    if notifier is None:
+        return {"error": "telegram_disabled"}, 400
+    payload = request.get_json(silent=True) or {}
+    message = clean_optional(payload.get("message")) or "PrintFleet2 test message"
+    notifier.enqueue([{"type": "test", "message": message}])
+    return {"queued": True}, 202
+
+
+@bp.get("/api/admin/webhooks")
+def admin_webhooks():
+    if not _is_admin():
+        return {"error": "forbidden"}, 403
+    with session_scope() as session:
+        counts = count_webhook_deliveries(session)
+    dispatcher = get_webhook_dispatcher()
+    return {"deliveries": counts, "dispatcher": dispatcher.to_dict() if dispatcher is not None else None}
+
+
+@bp.get("/api/webhooks")
+def get_webhooks():
+    if not _is_admin():
+        return {"error": "forbidden"}, 403
+    with session_scope() as session:
+        return {"items": [webhook_to_dict(webhook) for webhook in list_webhooks(session)]}
+
+
+def _apply_webhook_payload(webhook, payload: dict) -> str | None:
+    if "name" in payload:
+        name = clean_optional(payload.get("name"))
+        if not name:
+            return "missing_name"
+        webhook.name = name
+    if "url" in payload:
+        url = normalize_webhook_url(payload.get("url"))
+        if url is None:
+            return "invalid_url"
+        webhook.url = url
+    if "secret" in payload:
+        webhook.secret = clean_optional(payload.get("secret"))
+    if "events" in payload:
+        event_types = normalize_event_types(payload.get("events"))
+        if event_types is None:
+            return "invalid_events"
+        webhook.event_types = event_types
+    if "enabled" in payload:
+        if not isinstance(payload.get("enabled"), bool):
+            return "invalid_enabled"
+        webhook.enabled = payload["enabled"]
+    return None
+
+
+@bp.post("/api/webhooks")
+def post_webhook():
+    if not _is_admin():
+        return {"error": "forbidden"}, 403
+    payload = request.get_json(silent=True) or {}
+    if not isinstance(payload, dict):
+        return {"error": "invalid_json"}, 400
+    name = clean_optional(payload.get("name"))
+    if not name:
+        return {"error": "missing_name"}, 400
+    url = normalize_webhook_url(payload.get("url"))
+    if url is None:
+        return {"error": "invalid_url"}, 400
+    with session_scope() as session:
+        webhook = create_webhook(session, name, url)
+        error = _apply_webhook_payload(webhook, payload)
+        if error:
+            session.rollback()
+            return {"error": error}, 400
+        result = webhook_to_dict(webhook)
+    invalidate_webhooks()
+    return result, 201
+
+
+@bp.put("/api/webhooks/<int:webhook_id>")
+@bp.patch("/api/webhooks/<int:webhook_id>")
+def put_webhook(webhook_id: int):
+    if not _is_admin():
+        return {"error": "forbidden"}, 403
+    payload = request.get_json(silent=True) or {}
+    if not isinstance(payload, dict):
+        return {"error": "invalid_json"}, 400
+    with session_scope() as session:
+        webhook = get_webhook(session, webhook_id)
+        if webhook is None:
+            return {"error": "not_found"}, 404
+        error = _apply_webhook_payload(webhook, payload)
+        if error:
+            session.rollback()
+            return {"error": error}, 400
+        result = webhook_to_dict(webhook)
+    invalidate_webhooks()
+    return result
+
+
+@bp.delete("/api/webhooks/<int:webhook_id>")
+def remove_webhook(webhook_id: int):
+    if not _is_admin():
+        return {"error": "forbidden"}, 403
+    with session_scope() as session:
+        webhook = get_webhook(session, webhook_id)
+        if webhook is None:
+            return {"error": "not_found"}, 404
+        removed = delete_webhook(session, webhook)
+    invalidate_webhooks()
+    return {"status": "deleted", "removed_deliveries": removed}
+
+
+@bp.get("/api/webhooks/<int:webhook_id>/deliveries")
+def get_webhook_deliveries(webhook_id: int):
+    if not _is_admin():
+        return {"error": "forbidden"}, 403
+    status = clean_optional(request.args.get("status"))
+    if status is not None and status not in DELIVERY_STATUSES:
+        return {"error": "invalid_status"}, 400
+    with session_scope() as session:
+        if get_webhook(session, webhook_id) is None:
+            return {"error": "not_found"}, 404
+        deliveries = list_webhook_deliveries(session, webhook_id, status)
+        return {"items": [webhook_delivery_to_dict(delivery) for delivery in deliveries]}
+
+
+@bp.post("/api/webhooks/deliveries/<int:delivery_id>/retry")
+def retry_webhook_delivery(delivery_id: int):
+    if not _is_admin():
+        return {"error": "forbidden"}, 403
+    with session_scope() as session:
+        delivery = get_webhook_delivery(session, delivery_id)
+        if delivery is None:
+            return {"error": "not_found"}, 404
+        if delivery.status == "delivered":
+            return {"error": "already_delivered"}, 409
+        requeue_webhook_delivery(delivery)
+        result = webhook_delivery_to_dict(delivery)
+    dispatcher = get_webhook_dispatcher()
+    if dispatcher is not None:
+        dispatcher.wake()
+    return result
+
+
+@bp.get("/api/admin/mqtt")
+def admin_mqtt():
+    if not _is_admin():
+        return {"error": "forbidden"}, 403
+    status = get_mqtt_status()
+    if status is None:
+        return {"enabled": False}
+    return {"enabled": True, **status}
+
+
 @bp.get("/api/printers/plug-energy")
 def printers_plug_energy():
     with session_scope() as session:
         printers = list_printers(session)
         snapshots = build_printer_snapshots(printers)
-    energy_map = collect_plug_energy(snapshots)
+    _, energy_map = get_plug_readings(snapshots)
     items = []
     for printer in snapshots:
-        if not printer.tasmota_host:
+        if not printer.tasmota_host and not printer.tasmota_topic:
             continue
         energy = energy_map.get(printer.id, {})
         items.append(
@@ -1226,11 +1493,102 @@ def printers_plug_energy():
                 "power_w": energy.get("power_w"),
                 "today_wh": energy.get("today_wh"),
                 "error": energy.get("error"),
+                "stale": bool(energy.get("stale")),
             }
         )
     return {"items": items}
 
 
+def _energy_range_args() -> tuple[tuple[float, float, str] | None, dict | None]:
+    start_value = clean_optional(request.args.get("from"))
+    end_value = clean_optional(request.args.get("to"))
+    resolution = (clean_optional(request.args.get("resolution")) or "day").lower()
+    if resolution not in ENERGY_RESOLUTIONS:
+        return None, {"error": "invalid_resolution"}
+    end_date = parse_iso_date(end_value) if end_value else date.today()
+    start_date = parse_iso_date(start_value) if start_value else None
+    if (start_value and start_date is None) or end_date is None:
+        return None, {"error": "invalid_date"}
+    if start_date is None:
+        start_date = end_date - timedelta(days=6)
+    if start_date > end_date:
+        return None, {"error": "invalid_date_range"}
+    start_ts = datetime.combine(start_date, datetime.min.time()).timestamp()
+    end_ts = datetime.combine(end_date + timedelta(days=1), datetime.min.time()).timestamp()
+    return (start_ts, end_ts, resolution), None
+
+
+@bp.get("/api/printers/<int:printer_id>/energy")
+def printer_energy(printer_id: int):
+    args, error = _energy_range_args()
+    if error:
+        return error, 400
+    start_ts, end_ts, resolution = args
+    with session_scope() as session:
+        printer = get_printer(session, printer_id)
+        if printer is None:
+            return {"error": "not_found"}, 404
+        series = energy_series(session, start_ts, end_ts, resolution, printer_id=printer_id)
+    series.pop("printers", None)
+    return {"printer_id": printer_id, **series}
+
+
+@bp.get("/api/energy")
+def fleet_energy():
+    args, error = _energy_range_args()
+    if error:
+        return error, 400
+    start_ts, end_ts, resolution = args
+    with session_scope() as session:
+        names = {printer.id: printer.name for printer in list_printers(session)}
+        series = energy_series(session, start_ts, end_ts, resolution)
+    series["printers"] = [
+        {"id": printer_id, "name": names.get(printer_id), "energy_kwh": energy_kwh}
+        for printer_id, energy_kwh in sorted(series["printers"].items(), key=lambda item: -item[1])
+    ]
+    return series
+
+
+def _history_timestamp(value: str | None) -> float | None:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+@bp.get("/api/printers/<int:printer_id>/history")
+def printer_history(printer_id: int):
+    start_value = clean_optional(request.args.get("from"))
+    end_value = clean_optional(request.args.get("to"))
+    end_ts = _history_timestamp(end_value) if end_value else time.time()
+    start_ts = _history_timestamp(start_value) if start_value else None
+    if (start_value and start_ts is None) or end_ts is None:
+        return {"error": "invalid_date"}, 400
+    if start_ts is None:
+        start_ts = end_ts - HISTORY_SECONDS
+    if start_ts > end_ts:
+        return {"error": "invalid_date_range"}, 400
+    try:
+        points = int(request.args.get("points", DEFAULT_HISTORY_POINTS))
+    except (TypeError, ValueError):
+        return {"error": "invalid_points"}, 400
+    if points < 2 or points > MAX_HISTORY_POINTS:
+        return {"error": "invalid_points"}, 400
+    method = (clean_optional(request.args.get("method")) or "lttb").lower()
+    if method not in DOWNSAMPLE_METHODS:
+        return {"error": "invalid_method"}, 400
+    with session_scope() as session:
+        if get_printer(session, printer_id) is None:
+            return {"error": "not_found"}, 404
+    return {"printer_id": printer_id, **get_status_history().query(printer_id, start_ts, end_ts, points, method)}
+
+
 @bp.post("/api/net-scan")
 def net_scan():
     return {"items": scan_local_network(), "scanned_at": datetime.now(timezone.utc).isoformat()}
@@ -1251,6 +1609,30 @@ def get_print_jobs():
         return {"items": [print_job_to_dict(job) for job in jobs]}
 
 
+@bp.get("/api/events")
+def get_printer_events():
+    try:
+        since = int(request.args.get("since", 0))
+        limit = int(request.args.get("limit", 200))
+        printer_id = int(request.args["printer_id"]) if request.args.get("printer_id") else None
+    except (TypeError, ValueError):
+        return {"error": "invalid_query"}, 400
+    if since < 0 or limit < 1 or limit > 1000:
+        return {"error": "invalid_query"}, 400
+    event_type = clean_optional(request.args.get("type"))
+    if event_type is not None and event_type not in EVENT_TYPES:
+        return {"error": "invalid_type"}, 400
+    try:
+        flush_status_events(force=True)
+    except Exception:
+        logger.exception("Flushing buffered printer events failed")
+    with session_scope() as session:
+        names = {printer.id: printer.name for printer in list_printers(session)}
+        events = list_printer_events(session, since, printer_id=printer_id, event_type=event_type, limit=limit)
+        items = [{**printer_event_to_dict(event), "name": names.get(event.printer_id)} for event in events]
+    return {"items": items, "last_id": items[-1]["id"] if items else since}
+
+
 @bp.get("/api/print-jobs/export")
 def export_print_jobs():
     start_value = clean_optional(request.args.get("start_date"))
@@ -1267,7 +1649,7 @@ def export_print_jobs():
 
     output = io.StringIO(newline="")
     writer = csv.writer(output, lineterminator="\n")
-    writer.writerow(["Date", "G-Code file", "Printer", "User", "Print via"])
+    writer.writerow(["Date", "G-Code file", "Printer", "User", "Print via", "Energy (kWh)"])
     for job in job_items:
         writer.writerow(
             [
@@ -1276,6 +1658,7 @@ def export_print_jobs():
                 job.get("printer_name") or "",
                 job.get("username") or "",
                 job.get("print_via") or "",
+                "" if job.get("energy_kwh") is None else job.get("energy_kwh"),
             ]
         )
 
@@ -1316,7 +1699,10 @@ def post_printer():
         if has_group:
             payload["group_id"] = group_id
         printer = create_printer(session, payload)
-        return printer_to_dict(printer), 201
+        session.flush()
+        result = printer_to_dict(printer)
+    refresh_status_poller()
+    return result, 201
 
 
 @bp.put("/api/printers/<int:printer_id>")
@@ -1354,7 +1740,9 @@ def put_printer(printer_id: int):
         if has_group:
             payload["group_id"] = group_id
         update_printer(session, printer, payload)
-        return printer_to_dict(printer)
+        result = printer_to_dict(printer)
+    refresh_status_poller()
+    return result
 
 
 @bp.delete("/api/printers/<int:printer_id>")
@@ -1364,106 +1752,365 @@ def delete_printer_by_id(printer_id: int):
         if printer is None:
             return {"error": "not_found"}, 404
         delete_printer(session, printer)
-        return {"status": "deleted"}
+    refresh_status_poller()
+    return {"status": "deleted"}
+
+
+def _session_username(session) -> str:
+    user_id = flask_session.get("user_id")
+    if user_id:
+        session_user = get_user(session, int(user_id))
+        if session_user is not None:
+            username = clean_optional(session_user.username)
+            if username:
+                return username
+    return "unknown"
+
+
+def _upload_precheck(
+    session,
+    printer: Printer,
+    filename: str,
+    status: dict | None = None,
+) -> tuple[dict, int] | None:
+    type_name = clean_optional(printer.printer_type)
+    if not type_name:
+        return {"error": "Upload not allowed for this printer type."}, 400
+    printer_type = get_printer_type_by_name(session, type_name)
+    if printer_type is None or not printer_type.upload_gcode_active:
+        return {"error": "Upload not allowed for this printer type."}, 400
+    check_status = clean_optional(getattr(printer, "print_check_status", None)) or "clear"
+    if check_status.lower() != "clear":
+        return {
+            "error": "Printer check required before upload.",
+            "code": "printer_check_required",
+        }, 409
+    if status is None:
+        status = collect_printer_statuses([printer], include_plug=False).get(printer.id, {})
+    label = status.get("label")
+    if isinstance(label, str) and "printing" in label.lower():
+        job_name = clean_optional(status.get("job_name")) or "unknown"
+        return {
+            "error": f'Printer is currently printing job "{job_name}". Upload aborted.',
+            "code": "printer_busy",
+            "job_name": job_name,
+        }, 409
+    prefix = clean_optional(getattr(printer_type, "gcode_prefix", None))
+    if prefix:
+        safe_name = os.path.basename(filename)
+        filename_lower = safe_name.lower()
+        prefix_lower = prefix.lower()
+        if not filename_lower.startswith(prefix_lower):
+            return {
+                "error": (
+                    "WARNING: Filename does not start with the required g-Code prefix "
+                    f"\"{prefix}\". Upload aborted."
+                )
+            }, 400
+    return None
+
+
+def _upload_param(name: str) -> str | None:
+    payload = request.get_json(silent=True) if request.is_json else None
+    value = request.form.get(name)
+    if value is None and isinstance(payload, dict):
+        value = payload.get(name)
+    if value is None:
+        value = request.args.get(name)
+    return clean_optional(value)
+
+
+def _spool_upload_source() -> tuple[dict | None, tuple[dict, int] | None]:
+    file = request.files.get("file")
+    if file and file.filename:
+        path, size, sha256 = spool_upload(file.stream)
+        if not size:
+            discard_spooled_upload(path)
+            return None, ({"error": "Empty file."}, 400)
+        return {"path": path, "size": size, "sha256": sha256, "filename": file.filename, "stored": False}, None
+    raw_sha256 = _upload_param("sha256")
+    if raw_sha256 is None:
+        return None, ({"error": "Missing file."}, 400)
+    sha256 = normalize_sha256(raw_sha256)
+    if sha256 is None:
+        return None, ({"error": "invalid_sha256"}, 400)
+    with session_scope() as session:
+        gcode_file = get_gcode_file(session, sha256)
+        if gcode_file is None:
+            return None, ({"error": "Stored file not found."}, 404)
+        filename = _upload_param("filename") or gcode_file.filename
+        size = gcode_file.size_bytes
+    try:
+        path = spool_existing_file(gcode_file_path(sha256))
+    except OSError:
+        return None, ({"error": "Stored file not found."}, 404)
+    return {"path": path, "size": size, "sha256": sha256, "filename": filename, "stored": True}, None
+
+
+def _library_sha256(session, source: dict, username: str, uses: int) -> str | None:
+    if source["stored"]:
+        gcode_file = get_gcode_file(session, source["sha256"])
+    else:
+        gcode_file = store_gcode_file(
+            session,
+            source["path"],
+            source["sha256"],
+            source["filename"],
+            source["size"],
+            username,
+        )
+    if gcode_file is None:
+        return None
+    touch_gcode_file(gcode_file, uses)
+    get_gcode_analyzer().submit(gcode_file.sha256)
+    return gcode_file.sha256
 
 
 @bp.post("/api/printers/<int:printer_id>/upload-print")
 def upload_print(printer_id: int):
-    file = request.files.get("file")
-    if not file or not file.filename:
-        return {"error": "Missing file."}, 400
-    content = file.read()
-    if not content:
-        return {"error": "Empty file."}, 400
-    filename = file.filename
-    print_via = normalize_print_via(
-        request.form.get("print_via") or request.args.get("print_via") or "JustPrinting"
-    )
+    source, error = _spool_upload_source()
+    if error is not None:
+        return error
+    filename = source["filename"]
+    print_via = normalize_print_via(_upload_param("print_via") or "JustPrinting")
+    job = None
+    try:
+        with session_scope() as session:
+            printer = get_printer(session, printer_id)
+            if printer is None:
+                return {"error": "Printer not found."}, 404
+            error = _upload_precheck(session, printer, filename)
+            if error is not None:
+                return error
+            printer_name = printer.name
+            username = _session_username(session)
+            library_sha256 = _library_sha256(session, source, username, 1)
+        job = get_upload_queue().submit(
+            printer_id,
+            printer_name,
+            filename,
+            source["path"],
+            source["size"],
+            print_via,
+            username,
+            library_sha256,
+        )
+    finally:
+        if job is None:
+            discard_spooled_upload(source["path"])
+    return {"status": "queued", "job_id": job["id"], "upload": job}, 202
+
+
+@bp.get("/api/gcode-files")
+def get_gcode_files():
     with session_scope() as session:
-        printer = get_printer(session, printer_id)
-        if printer is None:
-            return {"error": "Printer not found."}, 404
-        username = None
-        user_id = flask_session.get("user_id")
-        if user_id:
-            session_user = get_user(session, int(user_id))
-            if session_user is not None:
-                username = clean_optional(session_user.username)
-        username = username or "unknown"
-        type_name = clean_optional(printer.printer_type)
-        if not type_name:
-            return {"error": "Upload not allowed for this printer type."}, 400
-        printer_type = get_printer_type_by_name(session, type_name)
-        if printer_type is None or not printer_type.upload_gcode_active:
-            return {"error": "Upload not allowed for this printer type."}, 400
-        check_status = clean_optional(getattr(printer, "print_check_status", None)) or "clear"
-        if check_status.lower() != "clear":
-            return {
-                "error": "Printer check required before upload.",
-                "code": "printer_check_required",
-            }, 409
-        status_map = collect_printer_statuses([printer], include_plug=False)
-        status = status_map.get(printer.id, {})
-        label = status.get("label")
-        if isinstance(label, str) and "printing" in label.lower():
-            job_name = clean_optional(status.get("job_name")) or "unknown"
-            return {
-                "error": f'Printer is currently printing job "{job_name}". Upload aborted.',
-                "code": "printer_busy",
-                "job_name": job_name,
-            }, 409
-        prefix = clean_optional(getattr(printer_type, "gcode_prefix", None))
-        if prefix:
-            safe_name = os.path.basename(filename)
-            filename_lower = safe_name.lower()
-            prefix_lower = prefix.lower()
-            if not filename_lower.startswith(prefix_lower):
-                return {
-                    "error": (
-                        "WARNING: Filename does not start with the required g-Code prefix "
-                        f"\"{prefix}\". Upload aborted."
-                    )
-                }, 400
-        settings = ensure_settings_row(session)
-        ok, message = upload_and_print(printer, filename, content, settings.upload_timeout)
-        if not ok:
-            if _confirm_print_started(printer, filename):
-                ok = True
-                message = "ok"
-        if ok:
-            printer.print_check_status = "check"
-            if printer.group_id:
-                group = get_printer_group(session, int(printer.group_id))
-                if group is not None:
-                    group.print_check_status = "check"
-            create_print_job(
-                session,
-                gcode_filename=filename,
-                printer_name=printer.name,
-                username=username,
-                print_via=print_via,
-            )
-            _discard_pending_upload(printer.id, filename)
-        else:
-            _record_pending_upload(
-                printer.id,
-                filename,
-                printer.name,
-                username,
-                print_via,
-            )
-    if ok:
-        return {"status": "ok"}
-    error_map = {
-        "api_key_missing": "API key missing for this printer.",
-        "api_key_invalid": "API key invalid for this printer.",
-        "auth_required": "Printer authentication required.",
-        "unsupported_backend": "Unsupported backend for upload.",
-        "upload_failed": "Upload failed.",
+        gcode_files = list_gcode_files(session)
+        metadata = get_cached_gcode_metadata(session, [gcode_file.sha256 for gcode_file in gcode_files])
+        return {
+            "items": [
+                {**gcode_file_to_dict(gcode_file), "metadata": gcode_metadata_summary(metadata.get(gcode_file.sha256))}
+                for gcode_file in gcode_files
+            ],
+            "usage": gcode_library_usage(session),
+        }
+
+
+@bp.get("/api/gcode-files/<sha256>")
+def get_gcode_file_entry(sha256: str):
+    sha256 = normalize_sha256(sha256)
+    if sha256 is None:
+        return {"error": "invalid_sha256"}, 400
+    with session_scope() as session:
+        gcode_file = get_gcode_file(session, sha256)
+        if gcode_file is None:
+            return {"error": "not_found"}, 404
+        return gcode_file_to_dict(gcode_file)
+
+
+@bp.get("/api/gcode-files/<sha256>/metadata")
+def get_gcode_file_metadata(sha256: str):
+    sha256 = normalize_sha256(sha256)
+    if sha256 is None:
+        return {"error": "invalid_sha256"}, 400
+    with session_scope() as session:
+        metadata = get_cached_gcode_metadata(session, [sha256]).get(sha256)
+        if metadata is None and get_gcode_file(session, sha256) is None:
+            return {"error": "not_found"}, 404
+    if metadata is None:
+        try:
+            metadata = get_gcode_analyzer().analyze(sha256)
+        except TimeoutError:
+            return {"status": "analyzing"}, 202
+    if metadata is None:
+        return {"error": "analysis_failed"}, 422
+    return {"sha256": sha256, **metadata}
+
+
+@bp.get("/api/gcode-metadata")
+def get_gcode_metadata_batch():
+    values = [value for value in (request.args.get("sha256") or "").split(",") if value.strip()]
+    sha256s = list(dict.fromkeys(normalize_sha256(value) for value in values))
+    if None in sha256s:
+        return {"error": "invalid_sha256"}, 400
+    if len(sha256s) > MAX_BATCH_SIZE:
+        return {"error": "too_many_files", "max": MAX_BATCH_SIZE}, 400
+    with session_scope() as session:
+        metadata, pending = get_gcode_metadata(session, sha256s)
+    get_gcode_analyzer().submit_many(pending)
+    return {
+        "items": {sha256: gcode_metadata_summary(item) for sha256, item in metadata.items()},
+        "pending": pending,
     }
-    error_message = error_map.get(message, message or "Upload failed.")
-    status_code = 400 if message in {"api_key_missing", "api_key_invalid", "auth_required", "unsupported_backend"} else 502
-    return {"error": error_message}, status_code
+
+
+@bp.delete("/api/gcode-files/<sha256>")
+def remove_gcode_file(sha256: str):
+    if not _is_admin():
+        return {"error": "forbidden"}, 403
+    sha256 = normalize_sha256(sha256)
+    if sha256 is None:
+        return {"error": "invalid_sha256"}, 400
+    with session_scope() as session:
+        gcode_file = get_gcode_file(session, sha256)
+        if gcode_file is None:
+            return {"error": "not_found"}, 404
+        delete_gcode_file(session, gcode_file)
+    return {"status": "deleted"}
+
+
+@bp.get("/api/uploads")
+def get_uploads():
+    printer_id = None
+    if request.args.get("printer_id") not in {None, ""}:
+        try:
+            printer_id = int(request.args["printer_id"])
+        except (TypeError, ValueError):
+            return {"error": "invalid_printer_id"}, 400
+    return {"items": get_upload_queue().list(printer_id)}
+
+
+@bp.get("/api/uploads/<job_id>")
+def get_upload(job_id: str):
+    job = get_upload_queue().get(job_id)
+    if job is None:
+        return {"error": "not_found"}, 404
+    return job
+
+
+def _upload_event_stream(load, event: str, finished) -> Response:
+    queue = get_upload_queue()
+
+    def stream():
+        sequence = queue.sequence()
+        yield f"retry: {EVENT_STREAM_RETRY_MS}\n\n"
+        sent = None
+        while True:
+            payload = load()
+            if payload is None:
+                return
+            if sent is None or sequence != sent:
+                sent = sequence
+                yield _sse_event(event, payload)
+            if finished(payload):
+                return
+            next_sequence = queue.wait(sequence, EVENT_STREAM_KEEPALIVE)
+            if next_sequence == sequence:
+                yield ": keep-alive\n\n"
+            sequence = next_sequence
+
+    return Response(
+        stream_with_context(stream()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@bp.get("/api/uploads/<job_id>/events")
+def upload_events(job_id: str):
+    queue = get_upload_queue()
+    if queue.get(job_id) is None:
+        return {"error": "not_found"}, 404
+    return _upload_event_stream(lambda: queue.get(job_id), "upload", lambda job: job["state"] in FINISHED_STATES)
+
+
+@bp.post("/api/printer-groups/<int:group_id>/upload-print")
+def group_upload_print(group_id: int):
+    printer_ids = None
+    raw_ids = _upload_param("printer_ids")
+    if raw_ids:
+        try:
+            printer_ids = {int(value) for value in raw_ids.split(",") if value.strip()}
+        except ValueError:
+            return {"error": "invalid_printer_ids"}, 400
+    source, error = _spool_upload_source()
+    if error is not None:
+        return error
+    filename = source["filename"]
+    print_via = normalize_print_via(_upload_param("print_via") or "JustGroupPrinting")
+    jobs = []
+    try:
+        with session_scope() as session:
+            group = get_printer_group(session, group_id)
+            if group is None:
+                return {"error": "Group not found."}, 404
+            group_status = clean_optional(getattr(group, "print_check_status", None)) or "clear"
+            if group_status.lower() != "clear":
+                return {"error": "Group check required before upload.", "code": "group_check_required"}, 409
+            printers = [
+                printer
+                for printer in list_printers(session)
+                if printer.group_id == group_id
+                and printer.enabled
+                and (printer_ids is None or printer.id in printer_ids)
+            ]
+            if not printers:
+                return {"error": "No printers available for this group."}, 400
+            status_map = collect_printer_statuses(printers, include_plug=False)
+            eligible = []
+            skipped = []
+            for printer in printers:
+                error = _upload_precheck(session, printer, filename, status_map.get(printer.id, {}))
+                if error is None:
+                    eligible.append((printer.id, printer.name))
+                else:
+                    skipped.append({"printer_id": printer.id, "printer_name": printer.name, **error[0]})
+            if not eligible:
+                return {
+                    "error": "No eligible printers in this group.",
+                    "code": "no_eligible_printers",
+                    "skipped": skipped,
+                }, 409
+            username = _session_username(session)
+            library_sha256 = _library_sha256(session, source, username, len(eligible))
+        jobs = get_upload_queue().submit_batch(
+            eligible,
+            filename,
+            source["path"],
+            source["size"],
+            print_via,
+            username,
+            library_sha256,
+        )
+    finally:
+        if not jobs:
+            discard_spooled_upload(source["path"])
+    return {"status": "queued", "batch_id": jobs[0]["batch_id"], "items": jobs, "skipped": skipped}, 202
+
+
+@bp.get("/api/upload-batches/<batch_id>")
+def get_upload_batch(batch_id: str):
+    batch = get_upload_queue().batch(batch_id)
+    if batch is None:
+        return {"error": "not_found"}, 404
+    return batch
+
+
+@bp.get("/api/upload-batches/<batch_id>/events")
+def upload_batch_events(batch_id: str):
+    queue = get_upload_queue()
+    if queue.batch(batch_id) is None:
+        return {"error": "not_found"}, 404
+    return _upload_event_stream(lambda: queue.batch(batch_id), "batch", lambda batch: batch["finished"])
 
 
 @bp.get("/api/users")
@@ -1686,15 +2333,50 @@ def api_docs():
             {"method": "PUT", "path": "/api/settings"},
             {"method": "PATCH", "path": "/api/settings"},
             {"method": "GET", "path": "/api/live-wall/status"},
+            {"method": "GET", "path": "/api/live-wall/events"},
             {"method": "GET", "path": "/api/live-wall/plug-status"},
+            {"method": "GET", "path": "/api/live-wall/poll-schedule"},
+            {"method": "GET", "path": "/api/anomalies"},
+            {"method": "GET", "path": "/api/admin/circuit-breakers"},
+            {"method": "POST", "path": "/api/admin/circuit-breakers/reset"},
+            {"method": "GET", "path": "/api/admin/single-flight"},
+            {"method": "GET", "path": "/api/admin/mqtt"},
+            {"method": "GET", "path": "/api/admin/webhooks"},
+            {"method": "GET", "path": "/api/webhooks"},
+            {"method": "POST", "path": "/api/webhooks"},
+            {"method": "PUT", "path": "/api/webhooks/{id}"},
+            {"method": "PATCH", "path": "/api/webhooks/{id}"},
+            {"method": "DELETE", "path": "/api/webhooks/{id}"},
+            {"method": "GET", "path": "/api/webhooks/{id}/deliveries"},
+            {"method": "POST", "path": "/api/webhooks/deliveries/{id}/retry"},
+            {"method": "GET", "path": "/api/admin/telegram"},
+            {"method": "POST", "path": "/api/admin/telegram/test"},
             {"method": "GET", "path": "/api/printers/plug-energy"},
+            {"method": "GET", "path": "/api/printers/{id}/energy"},
+            {"method": "GET", "path": "/api/printers/{id}/history"},
+            {"method": "GET", "path": "/api/energy"},
             {"method": "GET", "path": "/api/print-jobs"},
+            {"method": "GET", "path": "/api/events"},
             {"method": "GET", "path": "/api/printers"},
             {"method": "POST", "path": "/api/printers"},
             {"method": "GET", "path": "/api/printers/{id}"},
             {"method": "PUT", "path": "/api/printers/{id}"},
             {"method": "PATCH", "path": "/api/printers/{id}"},
             {"method": "DELETE", "path": "/api/printers/{id}"},
+            {"method": "GET", "path": "/api/gcode-files"},
+            {"method": "GET", "path": "/api/gcode-files/{sha256}"},
+            {"method": "GET", "path": "/api/gcode-files/{sha256}/metadata"},
+            {"method": "GET", "path": "/api/gcode-metadata"},
+            {"method": "DELETE", "path": "/api/gcode-files/{sha256}"},
+            {
+                "method": "POST",
+                "path": "/api/printers/{id}/upload-print",
+                "status": 202,
+                "fields": ["file", "sha256", "filename", "print_via"],
+            },
+            {"method": "GET", "path": "/api/uploads"},
+            {"method": "GET", "path": "/api/uploads/{id}"},
+            {"method": "GET", "path": "/api/uploads/{id}/events"},
             {"method": "GET", "path": "/api/printer-groups"},
             {"method": "GET", "path": "/api/printer-groups/export"},
             {"method": "POST", "path": "/api/printer-groups/import"},
@@ -1702,6 +2384,14 @@ def api_docs():
             {"method": "PUT", "path": "/api/printer-groups/{id}"},
             {"method": "PATCH", "path": "/api/printer-groups/{id}"},
             {"method": "DELETE", "path": "/api/printer-groups/{id}"},
+            {
+                "method": "POST",
+                "path": "/api/printer-groups/{id}/upload-print",
+                "status": 202,
+                "fields": ["file", "sha256", "filename", "print_via", "printer_ids"],
+            },
+            {"method": "GET", "path": "/api/upload-batches/{id}"},
+            {"method": "GET", "path": "/api/upload-batches/{id}/events"},
             {"method": "GET", "path": "/api/printer-types"},
             {"method": "GET", "path": "/api/printer-types/export"},
             {"method": "POST", "path": "/api/printer-types/import"},
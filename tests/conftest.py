@@ -0,0 +1,25 @@
+import time
+
+import pytest
+
+from printfleet2.services.async_http_service import run_coroutine
+
+
+@pytest.fixture
+def run():
+    def run_on_engine(coro, timeout: float = 5.0):
+        return run_coroutine(coro, timeout)
+
+    return run_on_engine
+
+
+@pytest.fixture
+def wait_until():
+    def wait(predicate, timeout: float = 5.0) -> None:
+        deadline = time.monotonic() + timeout
+        while not predicate():
+            if time.monotonic() > deadline:
+                raise AssertionError("condition not met in time")
+            time.sleep(0.01)
+
+    return wait
@@ -0,0 +1,81 @@
+from printfleet2.services.anomaly_service import (
+    HEATUP_TIMEOUT_SECONDS,
+    STALL_SECONDS,
+    AnomalyDetector,
+)
+
+
+def status(label: str = "Printing", **values) -> dict:
+    sample = {
+        "label": label,
+        "temp_hotend": 210.0,
+        "target_hotend": 210.0,
+        "temp_bed": 60.0,
+        "target_bed": 60.0,
+        "progress": 10.0,
+        "elapsed": 100,
+    }
+    sample.update(values)
+    return sample
+
+
+def active_types(detector: AnomalyDetector) -> dict[int, list[str]]:
+    result: dict[int, list[str]] = {}
+    for anomaly in detector.active():
+        result.setdefault(anomaly["printer_id"], []).append(anomaly["type"])
+    return result
+
+
+def test_heater_not_reaching_target_after_timeout():
+    detector = AnomalyDetector()
+    timeout_at = 1000.0 + HEATUP_TIMEOUT_SECONDS
+    detector.record({1: status("Operational", temp_hotend=25.0, progress=None)}, now=1000.0)
+    detector.record({1: status("Operational", temp_hotend=120.0, progress=None)}, now=timeout_at - 1)
+    assert detector.active() == []
+    detector.record({1: status("Operational", temp_hotend=150.0, progress=None)}, now=timeout_at)
+    assert active_types(detector) == {1: ["heater_not_reaching_target"]}
+    detector.record({1: status("Operational", temp_hotend=205.0, progress=None)}, now=timeout_at + 1000.0)
+    assert detector.active() == []
+    events, last_id = detector.events()
+    assert [(event["state"], event["type"]) for event in events] == [
+        ("raised", "heater_not_reaching_target"),
+        ("cleared", "heater_not_reaching_target"),
+    ]
+    assert last_id == 2
+
+
+def test_new_target_restarts_heatup_timer():
+    detector = AnomalyDetector()
+    detector.record({1: status("Operational", temp_hotend=25.0, target_hotend=200.0)}, now=0.0)
+    detector.record({1: status("Operational", temp_hotend=25.0, target_hotend=240.0)}, now=HEATUP_TIMEOUT_SECONDS)
+    assert detector.active() == []
+
+
+def test_drift_and_bed_drop_only_after_target_reached_while_printing():
+    detector = AnomalyDetector()
+    detector.record({1: status(), 2: status(temp_bed=30.0)}, now=0.0)
+    detector.record({1: status(temp_hotend=190.0, temp_bed=45.0), 2: status(temp_bed=40.0)}, now=10.0)
+    assert active_types(detector) == {1: ["bed_temperature_drop", "temperature_drift"]}
+    detector.record({1: status("Paused", temp_hotend=190.0, temp_bed=45.0)}, now=20.0)
+    assert detector.active() == []
+
+
+def test_progress_stalled_while_print_time_grows():
+    detector = AnomalyDetector()
+    detector.record({1: status(progress=50.0, elapsed=1000)}, now=0.0)
+    detector.record({1: status(progress=50.0, elapsed=1000 + STALL_SECONDS - 1)}, now=1.0)
+    assert detector.active() == []
+    detector.record({1: status(progress=50.0, elapsed=1000 + STALL_SECONDS)}, now=2.0)
+    assert active_types(detector) == {1: ["progress_stalled"]}
+    detector.record({1: status(progress=51.0, elapsed=1001 + STALL_SECONDS)}, now=3.0)
+    assert detector.active() == []
+
+
+def test_stale_samples_are_ignored_and_prune_drops_state():
+    detector = AnomalyDetector()
+    detector.record({1: status(), 2: status()}, now=0.0)
+    detector.record({1: status(temp_hotend=150.0, stale=True), 2: status(temp_hotend=150.0)}, now=1.0)
+    assert active_types(detector) == {2: ["temperature_drift"]}
+    detector.prune({1})
+    assert detector.active() == []
+    assert set(detector._state) == {1}
@@ -0,0 +1,112 @@
+import asyncio
+import time
+
+import pytest
+
+from printfleet2.services.async_http_service import (
+    FileBody,
+    get_circuit_breaker_stats,
+    http_request,
+    reset_circuit_breakers,
+)
+
+
+class SlowReceiver:
+    def __init__(self, read_delay: float, slow_bytes: int = 0, respond: bool = True) -> None:
+        self.read_delay = read_delay
+        self.slow_bytes = slow_bytes
+        self.respond = respond
+        self.received = 0
+        self.port = 0
+        self._server = None
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        self._server.close()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in head.decode("iso-8859-1").split("\r\n"):
+                if line.lower().startswith("content-length:"):
+                    length = int(line.split(":", 1)[1])
+            while self.received < length:
+                data = await reader.read(256 * 1024)
+                if not data:
+                    return
+                self.received += len(data)
+                if self.received < self.slow_bytes:
+                    await asyncio.sleep(self.read_delay)
+            if not self.respond:
+                await asyncio.sleep(10)
+            writer.write(b"HTTP/1.1 201 Created\r\nContent-Length: 2\r\n\r\n{}")
+            await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+@pytest.fixture
+def receiver(run):
+    servers = []
+
+    def start(read_delay: float = 0, slow_bytes: int = 0, respond: bool = True) -> SlowReceiver:
+        server = SlowReceiver(read_delay, slow_bytes, respond)
+        run(server.start())
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        run(server.stop())
+        reset_circuit_breakers("127.0.0.1", server.port)
+
+
+def breaker_for(port: int) -> dict | None:
+    return next((item for item in get_circuit_breaker_stats() if item["port"] == port), None)
+
+
+def test_file_upload_timeout_applies_per_chunk(run, receiver, tmp_path):
+    server = receiver(read_delay=0.02, slow_bytes=8 * 1024 * 1024)
+    path = tmp_path / "part.gcode"
+    path.write_bytes(b"G1 X1\n" * (16 * 1024 * 1024 // 6))
+    body = FileBody(str(path), b"--prefix\r\n", b"\r\n--suffix\r\n", chunk_size=64 * 1024)
+    url = f"http://127.0.0.1:{server.port}/api/files/local"
+
+    started = time.monotonic()
+    status, payload = run(http_request("POST", url, {}, body=body, timeout=0.25), timeout=30)
+
+    assert time.monotonic() - started > 0.25
+    assert status == 201
+    assert payload == b"{}"
+    assert server.received == body.length
+
+
+def test_file_upload_timeout_does_not_trip_breaker(run, receiver, tmp_path):
+    server = receiver(respond=False)
+    path = tmp_path / "part.gcode"
+    path.write_bytes(b"G1 X1\n" * 1024)
+    url = f"http://127.0.0.1:{server.port}/api/files/local"
+
+    for _ in range(4):
+        with pytest.raises(asyncio.TimeoutError):
+            run(http_request("POST", url, {}, body=FileBody(str(path)), timeout=0.1))
+
+    breaker = breaker_for(server.port)
+    assert breaker is None or (breaker["state"] == "closed" and breaker["failures"] == 0)
+
+
+def test_request_timeout_still_trips_breaker(run, receiver):
+    server = receiver(respond=False)
+    url = f"http://127.0.0.1:{server.port}/api/printer"
+
+    for _ in range(3):
+        with pytest.raises(asyncio.TimeoutError):
+            run(http_request("POST", url, {}, body=b"{}", timeout=0.1))
+
+    assert breaker_for(server.port)["state"] == "open"
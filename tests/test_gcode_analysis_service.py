@@ -0,0 +1,61 @@
+import hashlib
+
+import pytest
+
+from printfleet2.db.session import init_engine, session_scope
+from printfleet2.services.gcode_analysis_service import (
+    GcodeAnalyzer,
+    analyze_gcode,
+    get_cached_gcode_metadata,
+    store_gcode_metadata,
+)
+from printfleet2.services.gcode_library_service import configure_gcode_library, gcode_file_path
+
+
+@pytest.fixture
+def library(tmp_path):
+    init_engine(f"sqlite:///{tmp_path / 'db.sqlite3'}")
+    configure_gcode_library(tmp_path / "gcode")
+    yield tmp_path
+    configure_gcode_library(None)
+
+
+def add_file(content: str) -> str:
+    data = content.encode("utf-8")
+    sha256 = hashlib.sha256(data).hexdigest()
+    path = gcode_file_path(sha256)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return sha256
+
+
+def test_layer_marker_on_first_line_is_counted(tmp_path):
+    path = tmp_path / "part.gcode"
+    path.write_text(";LAYER_CHANGE\nG1 X1\n;LAYER_CHANGE\nG1 X2\n")
+    assert analyze_gcode(str(path))["layer_count"] == 2
+    path.write_text("G28\n;LAYER:0\nG1 X1\n;LAYER:1\n")
+    assert analyze_gcode(str(path))["layer_count"] == 2
+
+
+def test_store_gcode_metadata_upserts(library):
+    for value in (1, 2):
+        with session_scope() as session:
+            store_gcode_metadata(session, "a" * 64, {"value": value})
+    with session_scope() as session:
+        assert get_cached_gcode_metadata(session, ["a" * 64]) == {"a" * 64: {"value": 2}}
+
+
+def test_submit_many_analyzes_batch_in_process_pool(library):
+    sha256s = [add_file(";LAYER_CHANGE\nG1\n" * (index + 1) + f"; slicer build {index}\n") for index in range(5)]
+    analyzer = GcodeAnalyzer(2)
+    try:
+        futures = analyzer.submit_many(sha256s + ["f" * 64])
+        assert analyzer.submit_many(sha256s[:1])[sha256s[0]] is futures[sha256s[0]]
+        results = {sha256: futures[sha256].result(timeout=60) for sha256 in sha256s}
+        assert analyzer._pool is not None
+    finally:
+        analyzer.shutdown()
+    assert [results[sha256]["layer_count"] for sha256 in sha256s] == [1, 2, 3, 4, 5]
+    assert futures["f" * 64].result(timeout=5) is None
+    with session_scope() as session:
+        assert set(get_cached_gcode_metadata(session, sha256s)) == set(sha256s)
@@ -0,0 +1,63 @@
+import pytest
+
+import printfleet2.models  # noqa: F401
+from printfleet2.db.base import Base
+from printfleet2.db.session import init_engine, session_scope
+from printfleet2.models.power import PowerChunk, PowerRollup
+from printfleet2.services import power_history_service
+from printfleet2.services.power_history_service import PowerRecorder, decode_chunk
+
+
+@pytest.fixture
+def database(tmp_path):
+    Base.metadata.create_all(init_engine(f"sqlite:///{tmp_path / 'db.sqlite3'}"))
+
+
+def failing_session():
+    raise RuntimeError("database is locked")
+
+
+def test_flush_writes_chunks_and_rollups(database):
+    recorder = PowerRecorder()
+    for second in range(4):
+        recorder.record({1: {"power_w": 100.0}, 2: {"power_w": 50.0, "stale": second == 0}}, now=7200.0 + second * 60)
+
+    assert recorder.flush(force=True) == 7
+    assert recorder.pending(1) == []
+    with session_scope() as session:
+        chunks = {chunk.printer_id: decode_chunk(chunk) for chunk in session.query(PowerChunk)}
+        rollup = session.query(PowerRollup).filter(PowerRollup.printer_id == 1).one()
+        assert chunks[1] == [(7200.0 + second * 60, 100.0) for second in range(4)]
+        assert len(chunks[2]) == 3
+        assert rollup.bucket_start == 7200
+        assert rollup.energy_wh == pytest.approx(5.0)
+
+
+def test_failed_flush_keeps_samples_in_order(monkeypatch):
+    recorder = PowerRecorder()
+    recorder.record({1: {"power_w": 10.0}}, now=1.0)
+    recorder.record({1: {"power_w": 11.0}}, now=2.0)
+    monkeypatch.setattr(power_history_service, "session_scope", failing_session)
+
+    with pytest.raises(RuntimeError):
+        recorder.flush(force=True)
+    recorder.record({1: {"power_w": 12.0}}, now=3.0)
+
+    assert recorder.pending(1) == [(1.0, 10.0), (2.0, 11.0), (3.0, 12.0)]
+    assert recorder.dropped == 0
+
+
+def test_failed_flush_trims_oldest_samples(monkeypatch):
+    monkeypatch.setattr(power_history_service, "MAX_BUFFERED_SAMPLES", 3)
+    recorder = PowerRecorder()
+    for second in range(3):
+        recorder.record({1: {"power_w": float(second)}}, now=float(second))
+    monkeypatch.setattr(power_history_service, "session_scope", failing_session)
+    with pytest.raises(RuntimeError):
+        recorder.flush(force=True)
+
+    recorder.record({1: {"power_w": 3.0}}, now=3.0)
+    recorder.record({1: {"power_w": 4.0}}, now=4.0)
+
+    assert recorder.pending(1) == [(2.0, 2.0), (3.0, 3.0), (4.0, 4.0)]
+    assert recorder.dropped == 2
@@ -0,0 +1,292 @@
+import asyncio
+import base64
+import hashlib
+import json
+import struct
+
+import pytest
+
+from printfleet2.services import printer_push_service
+from printfleet2.services.async_http_service import WEBSOCKET_GUID
+from printfleet2.services.printer_push_service import (
+    MoonrakerPushSession,
+    OctoPrintPushSession,
+    PushSession,
+)
+from printfleet2.services.printer_status_service import PrinterSnapshot
+
+
+class ServerSocket:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.reader = reader
+        self.writer = writer
+
+    async def send_json(self, payload) -> None:
+        data = json.dumps(payload).encode("utf-8")
+        if len(data) < 126:
+            header = struct.pack("!BB", 0x81, len(data))
+        else:
+            header = struct.pack("!BBH", 0x81, 126, len(data))
+        self.writer.write(header + data)
+        await self.writer.drain()
+
+    async def receive_json(self):
+        first, second = await self.reader.readexactly(2)
+        length = second & 0x7F
+        if length == 126:
+            (length,) = struct.unpack("!H", await self.reader.readexactly(2))
+        mask = await self.reader.readexactly(4)
+        payload = bytes(byte ^ mask[index % 4] for index, byte in enumerate(await self.reader.readexactly(length)))
+        if first & 0x0F == 0x8:
+            raise ConnectionError("client closed")
+        return json.loads(payload)
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class FakePrinterServer:
+    def __init__(self, on_websocket, ws_path: str, login_status: int = 200, upgrade_status: int = 101) -> None:
+        self.on_websocket = on_websocket
+        self.ws_path = ws_path
+        self.login_status = login_status
+        self.upgrade_status = upgrade_status
+        self.logins = 0
+        self.connections = 0
+        self.port = 0
+        self._server = None
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        self._server.close()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            head = (await reader.readuntil(b"\r\n\r\n")).decode("iso-8859-1")
+            request_line, *lines = head.split("\r\n")
+            method, path, _ = request_line.split(" ", 2)
+            headers = {}
+            for line in lines:
+                if ":" in line:
+                    name, value = line.split(":", 1)
+                    headers[name.strip().lower()] = value.strip()
+            if method == "POST" and path == "/api/login":
+                await reader.readexactly(int(headers.get("content-length", 0)))
+                await self._login(writer)
+                return
+            if path != self.ws_path or self.upgrade_status != 101:
+                writer.write(f"HTTP/1.1 {self.upgrade_status} Nope\r\nContent-Length: 0\r\n\r\n".encode())
+                await writer.drain()
+                return
+            accept = base64.b64encode(
+                hashlib.sha1((headers["sec-websocket-key"] + WEBSOCKET_GUID).encode("ascii")).digest()
+            ).decode("ascii")
+            writer.write(
+                (
+                    "HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                    f"Sec-WebSocket-Accept: {accept}\r\n\r\n"
+                ).encode()
+            )
+            await writer.drain()
+            self.connections += 1
+            await self.on_websocket(ServerSocket(reader, writer), self.connections)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _login(self, writer: asyncio.StreamWriter) -> None:
+        self.logins += 1
+        body = json.dumps({"name": "fleet", "session": f"s{self.logins}"}).encode() if self.login_status == 200 else b""
+        writer.write(
+            f"HTTP/1.1 {self.login_status} X\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode()
+            + body
+        )
+        await writer.drain()
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.statuses: list[dict] = []
+        self.disconnects: list[int] = []
+
+    def publish(self, printer_id: int, status: dict) -> bool:
+        self.statuses.append(status)
+        return True
+
+    def disconnect(self, printer_id: int) -> None:
+        self.disconnects.append(printer_id)
+
+
+def snapshot(port: int, backend: str, api_key: str | None = None) -> PrinterSnapshot:
+    return PrinterSnapshot(
+        id=7,
+        backend=backend,
+        host="127.0.0.1",
+        port=port,
+        https=False,
+        scanning=True,
+        token=None,
+        api_key=api_key,
+        tasmota_host=None,
+        status_push=True,
+    )
+
+
+@pytest.fixture(autouse=True)
+def fast_reconnect(monkeypatch):
+    monkeypatch.setattr(printer_push_service, "RECONNECT_MIN_DELAY", 0.05)
+
+
+@pytest.fixture
+def start_session(run):
+    sessions = []
+    servers = []
+
+    def start(session_type, server: FakePrinterServer, api_key: str | None = None):
+        run(server.start())
+        servers.append(server)
+        recorder = Recorder()
+        session = session_type(snapshot(server.port, session_type.backend, api_key), recorder.publish, recorder.disconnect)
+
+        async def begin() -> None:
+            session.start()
+
+        run(begin())
+        sessions.append(session)
+        return session, recorder
+
+    yield start
+
+    async def cleanup() -> None:
+        for session in sessions:
+            session.cancel()
+        for server in servers:
+            await server.stop()
+
+    run(cleanup())
+
+
+def test_push_session_is_abstract():
+    with pytest.raises(TypeError):
+        PushSession(snapshot(1, "moonraker"), lambda printer_id, status: True, lambda printer_id: None)
+
+
+async def moonraker_printer(ws: ServerSocket, connection: int) -> None:
+    while True:
+        request = await ws.receive_json()
+        if request["method"] == "printer.info":
+            await ws.send_json({"jsonrpc": "2.0", "id": request["id"], "result": {"state": "ready"}})
+        elif request["method"] == "printer.objects.subscribe":
+            assert set(request["params"]["objects"]) >= {"print_stats", "extruder"}
+            status = {
+                "print_stats": {"state": "printing", "filename": f"part-{connection}.gcode"},
+                "extruder": {"temperature": 201.5, "target": 210.0},
+                "heater_bed": {"temperature": 60.0, "target": 60.0},
+                "virtual_sdcard": {"progress": 0.25},
+            }
+            await ws.send_json({"jsonrpc": "2.0", "id": request["id"], "result": {"status": status}})
+            await ws.send_json(
+                {"jsonrpc": "2.0", "method": "notify_status_update", "params": [{"virtual_sdcard": {"progress": 0.5}}]}
+            )
+            if connection == 1:
+                await asyncio.sleep(0.05)
+                ws.close()
+                return
+
+
+def test_moonraker_session_subscribes_and_applies_updates(start_session, wait_until):
+    server = FakePrinterServer(moonraker_printer, "/websocket")
+    session, recorder = start_session(MoonrakerPushSession, server)
+
+    wait_until(lambda: any(status.get("progress") == 50.0 for status in recorder.statuses))
+    first = recorder.statuses[0]
+    assert first["job_name"] == "part-1.gcode"
+    assert first["temp_hotend"] == 201.5
+    assert first["progress"] == 25.0
+
+
+def test_moonraker_session_reconnects_after_drop(start_session, wait_until):
+    server = FakePrinterServer(moonraker_printer, "/websocket")
+    session, recorder = start_session(MoonrakerPushSession, server)
+
+    wait_until(lambda: session.connects == 2 and session.connected)
+    assert recorder.disconnects == [7]
+    assert server.connections == 2
+    assert recorder.statuses[-1]["job_name"] == "part-2.gcode"
+
+
+def test_moonraker_session_reports_failed_upgrade(start_session, wait_until):
+    server = FakePrinterServer(moonraker_printer, "/websocket", upgrade_status=404)
+    session, recorder = start_session(MoonrakerPushSession, server)
+
+    wait_until(lambda: session.last_error is not None)
+    assert "upgrade failed" in session.last_error
+    assert not session.connected
+    assert recorder.statuses == []
+
+
+def octoprint_printer(messages_by_connection: dict[int, list[dict]], received: list[dict]):
+    async def handle(ws: ServerSocket, connection: int) -> None:
+        received.append(await ws.receive_json())
+        received.append(await ws.receive_json())
+        for message in messages_by_connection.get(connection, []):
+            await ws.send_json(message)
+        await asyncio.sleep(10)
+
+    return handle
+
+
+CURRENT = {
+    "current": {
+        "state": {"text": "Printing", "flags": {"printing": True, "operational": True}},
+        "job": {"file": {"name": "bracket.gcode"}},
+        "progress": {"completion": 42.0, "printTime": 60, "printTimeLeft": 120},
+        "temps": [{"tool0": {"actual": 215.0, "target": 215.0}, "bed": {"actual": 60.0, "target": 60.0}}],
+    }
+}
+
+
+def test_octoprint_session_authenticates_and_streams(start_session, wait_until):
+    received: list[dict] = []
+    server = FakePrinterServer(octoprint_printer({1: [{"connected": {}}, CURRENT]}, received), "/sockjs/websocket")
+    session, recorder = start_session(OctoPrintPushSession, server, api_key="secret")
+
+    wait_until(lambda: recorder.statuses)
+    assert received == [{"auth": "fleet:s1"}, {"throttle": printer_push_service.OCTOPRINT_THROTTLE}]
+    assert session.connected
+    status = recorder.statuses[-1]
+    assert status["job_name"] == "bracket.gcode"
+    assert status["temp_hotend"] == 215.0
+    assert status["progress"] == 42.0
+
+
+def test_octoprint_session_logs_in_again_on_reauth(start_session, wait_until):
+    received: list[dict] = []
+    messages = {1: [CURRENT, {"reauthRequired": {"reason": "logout"}}], 2: [CURRENT]}
+    server = FakePrinterServer(octoprint_printer(messages, received), "/sockjs/websocket")
+    session, recorder = start_session(OctoPrintPushSession, server, api_key="secret")
+
+    wait_until(lambda: session.connects == 2 and session.connected)
+    assert server.logins == 2
+    assert {"auth": "fleet:s2"} in received
+    assert recorder.disconnects == [7]
+
+
+def test_octoprint_session_rejects_invalid_api_key(start_session, wait_until):
+    server = FakePrinterServer(octoprint_printer({}, []), "/sockjs/websocket", login_status=403)
+    session, recorder = start_session(OctoPrintPushSession, server, api_key="wrong")
+
+    wait_until(lambda: session.last_error is not None)
+    assert session.last_error == "API key invalid"
+    assert server.connections == 0
+    assert not session.connected
+
+
+def test_octoprint_session_requires_api_key():
+    assert not OctoPrintPushSession.supports(snapshot(1, "octoprint"))
+    assert OctoPrintPushSession.supports(snapshot(1, "octoprint", api_key="k"))
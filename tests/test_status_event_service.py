@@ -0,0 +1,171 @@
+import pytest
+
+import printfleet2.models  # noqa: F401
+from printfleet2.db.base import Base
+from printfleet2.db.session import init_engine, session_scope
+from printfleet2.models.printer_event import PrinterEvent
+from printfleet2.services import status_event_service
+from printfleet2.services.status_event_service import (
+    COMPLETE_PROGRESS,
+    StatusEventBus,
+    derive_events,
+)
+
+
+def status(label: str, job_name: str | None = None, progress: float | None = None, **extra) -> dict:
+    return {"label": label, "job_name": job_name, "progress": progress, **extra}
+
+
+def replay(*statuses: dict) -> list[tuple]:
+    state = None
+    events = []
+    for item in statuses:
+        state, derived = derive_events(state, item)
+        events.extend(derived)
+    return events
+
+
+@pytest.fixture
+def database(tmp_path):
+    Base.metadata.create_all(init_engine(f"sqlite:///{tmp_path / 'db.sqlite3'}"))
+
+
+def test_first_sample_only_seeds_state():
+    state, events = derive_events(None, status("Printing", "part.gcode", 40.0))
+    assert events == []
+    assert (state.online, state.job, state.progress) == (True, "part.gcode", 40.0)
+    state, events = derive_events(None, status("Offline"))
+    assert events == []
+    assert not state.online
+
+
+def test_unknown_labels_keep_state():
+    state, _ = derive_events(None, status("Printing", "part.gcode", 10.0))
+    for label in ("", "Unknown", "Status error", "API key invalid", "Scanning off"):
+        same, events = derive_events(state, status(label))
+        assert same is state
+        assert events == []
+    assert derive_events(None, status("Auth required")) == (None, [])
+
+
+def test_offline_and_online_transitions():
+    events = replay(
+        status("Printing", "part.gcode", 30.0),
+        status("Offline"),
+        status("Offline"),
+        status("Idle"),
+    )
+    assert events == [
+        ("went_offline", "part.gcode", 30.0, None),
+        ("came_online", None, None, None),
+        ("job_cancelled", "part.gcode", 30.0, None),
+    ]
+
+
+def test_job_start_and_complete_at_threshold():
+    events = replay(
+        status("Idle"),
+        status("Printing", "part.gcode", 0.0),
+        status("Paused", "part.gcode", 50.0),
+        status("Printing", "part.gcode", COMPLETE_PROGRESS),
+        status("Idle"),
+    )
+    assert events == [
+        ("job_started", "part.gcode", 0.0, None),
+        ("job_completed", "part.gcode", COMPLETE_PROGRESS, None),
+    ]
+
+
+def test_job_end_below_threshold_is_cancelled_unless_reported_complete():
+    below = COMPLETE_PROGRESS - 0.5
+    assert replay(status("Idle"), status("Printing", "a.gcode", below), status("Idle"))[-1] == (
+        "job_cancelled",
+        "a.gcode",
+        below,
+        None,
+    )
+    assert replay(status("Idle"), status("Printing", "a.gcode", 80.0), status("Complete"))[-1][0] == "job_completed"
+    assert replay(status("Idle"), status("Printing", "a.gcode", 100.0), status("Cancelled"))[-1][0] == "job_cancelled"
+
+
+def test_job_switch_ends_previous_job():
+    events = replay(
+        status("Idle"),
+        status("Printing", "a.gcode", 100.0),
+        status("Printing", "b.gcode", 1.0),
+        status("Printing", "", 2.0),
+    )
+    assert events == [
+        ("job_started", "a.gcode", 100.0, None),
+        ("job_completed", "a.gcode", 100.0, None),
+        ("job_started", "b.gcode", 1.0, None),
+    ]
+
+
+def test_error_ends_job_once_and_recovers():
+    events = replay(
+        status("Printing", "part.gcode", 12.0),
+        status("Error", error_message="thermal runaway"),
+        status("Error", error_message="thermal runaway"),
+        status("Idle"),
+        status("Printing", "next.gcode", 0.0),
+    )
+    assert events == [
+        ("error", "part.gcode", 12.0, "thermal runaway"),
+        ("job_started", "next.gcode", 0.0, None),
+    ]
+
+
+def test_bus_skips_stale_samples_and_notifies_subscribers(monkeypatch):
+    monkeypatch.setattr(status_event_service, "EVENT_FLUSH_INTERVAL", 3600.0)
+    bus = StatusEventBus()
+    received = []
+    bus.subscribe(received.extend)
+    bus.subscribe(lambda events: 1 / 0)
+    bus.process({1: status("Idle"), 2: status("Idle")}, now=1.0)
+    events = bus.process({1: status("Printing", "a.gcode", 5.0), 2: status("Offline", stale=True)}, now=2.0)
+    assert events == received
+    assert [(event["printer_id"], event["type"], event["ts"]) for event in events] == [(1, "job_started", 2.0)]
+    assert bus.emitted == 1
+    assert bus.persisted == 0
+
+
+def test_flush_writes_due_batches(database, monkeypatch):
+    monkeypatch.setattr(status_event_service, "EVENT_BATCH_SIZE", 2)
+    monkeypatch.setattr(status_event_service, "EVENT_FLUSH_INTERVAL", 3600.0)
+    bus = StatusEventBus()
+    bus.process({1: status("Idle"), 2: status("Idle")})
+    bus.process({1: status("Printing", "a.gcode", 1.0)})
+    assert bus.persisted == 0
+    bus.process({2: status("Printing", "b.gcode", 1.0)})
+    assert bus.persisted == 2
+    bus.process({1: status("Offline")})
+    assert bus.flush() == 0
+    assert bus.flush(force=True) == 1
+    with session_scope() as session:
+        rows = session.query(PrinterEvent).order_by(PrinterEvent.id).all()
+        assert [(row.printer_id, row.event_type, row.job_name) for row in rows] == [
+            (1, "job_started", "a.gcode"),
+            (2, "job_started", "b.gcode"),
+            (1, "went_offline", "a.gcode"),
+        ]
+
+
+def test_failed_flush_requeues_bounded_rows(monkeypatch):
+    monkeypatch.setattr(status_event_service, "MAX_BUFFERED_EVENTS", 3)
+
+    def failing_session():
+        raise RuntimeError("database is locked")
+
+    monkeypatch.setattr(status_event_service, "session_scope", failing_session)
+    bus = StatusEventBus()
+    bus._pending = [{"printer_id": index} for index in range(2)]
+    with pytest.raises(RuntimeError):
+        bus.flush(force=True)
+    assert bus._pending == [{"printer_id": 0}, {"printer_id": 1}]
+    bus._pending.extend({"printer_id": index} for index in range(2, 4))
+    with pytest.raises(RuntimeError):
+        bus.flush(force=True)
+    assert [row["printer_id"] for row in bus._pending] == [1, 2, 3]
+    assert bus.dropped == 1
+    assert bus.persisted == 0
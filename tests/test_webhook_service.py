@@ -0,0 +1,171 @@
+import hashlib
+import hmac
+import json
+
+import pytest
+
+import printfleet2.models  # noqa: F401
+from printfleet2.db.base import Base
+from printfleet2.db.session import init_engine, session_scope
+from printfleet2.models.webhook import WebhookDelivery
+from printfleet2.services import webhook_service
+from printfleet2.services.webhook_service import (
+    MAX_WEBHOOK_ATTEMPTS,
+    WebhookDispatcher,
+    create_webhook,
+    sign_payload,
+)
+
+
+@pytest.fixture
+def database(tmp_path):
+    Base.metadata.create_all(init_engine(f"sqlite:///{tmp_path / 'db.sqlite3'}"))
+
+
+def event(event_type: str, printer_id: int = 1) -> dict:
+    return {"ts": 1700000000.0, "printer_id": printer_id, "type": event_type, "job_name": "part.gcode"}
+
+
+def delivery(attempts: int = 0, secret: str | None = "s3cret") -> dict:
+    return {
+        "id": 42,
+        "event_type": "job_completed",
+        "payload": json.dumps({"type": "job_completed"}),
+        "attempts": attempts,
+        "created_at": 1700000000.0,
+        "url": "http://127.0.0.1:9/hook",
+        "secret": secret,
+    }
+
+
+def fake_http(monkeypatch, status: int | None = None, error: Exception | None = None) -> list[dict]:
+    requests = []
+
+    async def http_request(method, url, headers, body=None, timeout=None, max_bytes=None):
+        requests.append({"method": method, "url": url, "headers": headers, "body": body})
+        if error is not None:
+            raise error
+        return status, b""
+
+    monkeypatch.setattr(webhook_service, "http_request", http_request)
+    return requests
+
+
+def test_sign_payload_is_hmac_sha256_of_timestamp_and_body():
+    body = b'{"type":"error"}'
+    expected = hmac.new(b"key", b"1700000000." + body, hashlib.sha256).hexdigest()
+    assert sign_payload("key", "1700000000", body) == f"sha256={expected}"
+    assert sign_payload("key", "1700000001", body) != sign_payload("key", "1700000000", body)
+
+
+def test_deliver_signs_request_and_marks_success(run, monkeypatch):
+    requests = fake_http(monkeypatch, status=204)
+    dispatcher = WebhookDispatcher(1)
+
+    result = run(dispatcher._deliver(delivery()))
+
+    assert result["status"] == "delivered"
+    assert result["attempts"] == 1
+    assert result["last_status"] == 204
+    headers = requests[0]["headers"]
+    assert headers["X-PrintFleet2-Delivery"] == "42"
+    assert headers["X-PrintFleet2-Signature"] == sign_payload(
+        "s3cret", headers["X-PrintFleet2-Timestamp"], requests[0]["body"]
+    )
+    assert dispatcher.delivered == 1
+
+
+def test_deliver_omits_signature_without_secret(run, monkeypatch):
+    requests = fake_http(monkeypatch, status=200)
+    run(WebhookDispatcher(1)._deliver(delivery(secret=None)))
+    assert "X-PrintFleet2-Signature" not in requests[0]["headers"]
+
+
+@pytest.mark.parametrize(
+    ("status", "error", "attempts", "expected"),
+    [
+        (500, None, 0, "pending"),
+        (503, None, 0, "pending"),
+        (408, None, 0, "pending"),
+        (429, None, 0, "pending"),
+        (None, ConnectionError("refused"), 0, "pending"),
+        (400, None, 0, "dead"),
+        (404, None, 0, "dead"),
+        (410, None, 0, "dead"),
+        (500, None, MAX_WEBHOOK_ATTEMPTS - 1, "dead"),
+        (None, TimeoutError(), MAX_WEBHOOK_ATTEMPTS - 1, "dead"),
+    ],
+)
+def test_deliver_classifies_failures(run, monkeypatch, status, error, attempts, expected):
+    fake_http(monkeypatch, status=status, error=error)
+    dispatcher = WebhookDispatcher(1)
+
+    result = run(dispatcher._deliver(delivery(attempts)))
+
+    assert result["status"] == expected
+    assert result["attempts"] == attempts + 1
+    assert result["last_error"]
+    assert dispatcher.failed == 1
+    assert dispatcher.dead == (1 if expected == "dead" else 0)
+    if expected == "pending":
+        assert result["next_attempt_at"] > 0
+    else:
+        assert "next_attempt_at" not in result
+
+
+def test_enqueue_only_buffers_events(monkeypatch):
+    monkeypatch.setattr(webhook_service, "MAX_QUEUED_EVENTS", 3)
+    monkeypatch.setattr(webhook_service, "session_scope", None)
+    dispatcher = WebhookDispatcher(1)
+
+    assert dispatcher.enqueue([event("job_started", index) for index in range(5)]) == 5
+
+    assert [item["printer_id"] for item in dispatcher._events] == [2, 3, 4]
+    assert dispatcher.dropped == 2
+    assert dispatcher.to_dict()["queued_events"] == 3
+
+
+def test_sync_writes_filtered_rows_and_claims_them_once(database):
+    with session_scope() as session:
+        completed_hook = create_webhook(session, "done", "http://127.0.0.1:9/done", event_types="job_completed")
+        create_webhook(session, "all", "http://127.0.0.1:9/all", secret="k")
+        create_webhook(session, "off", "http://127.0.0.1:9/off", enabled=False)
+        completed_id = completed_hook.id
+    dispatcher = WebhookDispatcher(1)
+
+    claimed = dispatcher._sync([], [event("job_completed"), event("error", 2)])
+
+    assert sorted((item["url"], item["event_type"]) for item in claimed) == [
+        ("http://127.0.0.1:9/all", "error"),
+        ("http://127.0.0.1:9/all", "job_completed"),
+        ("http://127.0.0.1:9/done", "job_completed"),
+    ]
+    payload = json.loads(claimed[0]["payload"])
+    assert payload["printer"]["id"] in {1, 2}
+    assert payload["job_name"] == "part.gcode"
+    assert dispatcher._sync([], []) == []
+
+    done = next(item for item in claimed if item["url"].endswith("/done"))
+    retry = next(item for item in claimed if item["url"].endswith("/all") and item["event_type"] == "error")
+    results = [
+        {"id": done["id"], "attempts": 1, "last_status": 204, "status": "delivered", "delivered_at": 1.0},
+        {"id": retry["id"], "attempts": 1, "last_status": 503, "status": "pending", "next_attempt_at": 0.0},
+    ]
+    reclaimed = dispatcher._sync(results, claim=True)
+
+    assert [item["id"] for item in reclaimed] == [retry["id"]]
+    assert reclaimed[0]["attempts"] == 1
+    with session_scope() as session:
+        rows = {row.id: row for row in session.query(WebhookDelivery).all()}
+        assert len(rows) == 3
+        assert rows[done["id"]].status == "delivered"
+        assert rows[done["id"]].webhook_id == completed_id
+        assert rows[retry["id"]].last_status == 503
+    assert dispatcher._inflight == {item["id"] for item in claimed} - {done["id"]}
+
+
+def test_sync_without_enabled_webhooks_drops_events(database):
+    dispatcher = WebhookDispatcher(1)
+    assert dispatcher._sync([], [event("job_completed")]) == []
+    with session_scope() as session:
+        assert session.query(WebhookDelivery).count() == 0